@@ -0,0 +1,2121 @@
+import importlib
+import os
+import threading
+from collections import deque
+from datetime import date
+
+from billing import startup
+
+with startup.phase("import tkinter"):
+    import tkinter as tk
+    from tkinter import ttk, messagebox, filedialog, simpledialog
+
+# billing.invoices / billing.batch_invoices (ReportLab) and tkcalendar are
+# the slowest imports; they are imported where first used, after startup
+with startup.phase("import billing"):
+    from billing import customers, db, diagnostics, entries, exporter, importer, reports, search
+    from billing.live_search import LiveSearch, ledger_pages, ranked_pages
+    from billing.money import Money, Qty
+    from billing.tasks import TaskRunner
+    from billing.viewmodel import RowView, SelectionTotals
+
+# ==========================================================
+#        MS TRADERS – CORPORATE SILVER BILLING SUITE
+# ==========================================================
+
+DB_NAME = db.DB_NAME
+
+# --------- UI COLORS (Silver Corporate) ----------
+BG = "#ECEFF1"        # App background
+CARD = "#FFFFFF"      # Panels
+BORDER = "#CFD8DC"    # Borders
+TEXT = "#263238"      # Main text
+MUTED = "#607D8B"     # Sub text
+ACCENT = "#1565C0"    # Primary blue
+ACCENT_SOFT = "#90CAF9"
+GOLD = "#FFC107"
+GREEN = "#2E7D32"
+RED = "#C62828"
+
+# ==========================================================
+#               DIAGNOSTICS
+# ==========================================================
+
+diagnostics.enable()   # every query, task and Tk callback is timed (Help → Diagnostics…)
+
+
+class TimedCallWrapper(tk.CallWrapper):
+    """Tk's wrapper for Python callbacks - buttons, menus, bindings, after() - timed."""
+
+    def __init__(self, func, subst, widget):
+        super().__init__(diagnostics.wrap(func), subst, widget)
+
+
+tk.CallWrapper = TimedCallWrapper   # Misc._register looks it up on every call
+
+# ==========================================================
+#               DATABASE SETUP
+# ==========================================================
+
+with startup.phase("open database"):
+    conn = db.connect(DB_NAME)   # creates / migrates the schema; quick reads on the UI thread
+    tasks = TaskRunner(DB_NAME)  # slow reads, PDFs, and every write (one writer connection)
+with startup.phase("customer index"):
+    customer_index = customers.CustomerCache(conn)   # id / mobile / name lookups in memory
+
+# ==========================================================
+#                 TK ROOT + STYLE
+# ==========================================================
+
+with startup.phase("create window"):
+    root = tk.Tk()
+root.title("MS TRADERS – Saad Usamni")
+root.geometry("1350x780")
+root.configure(bg=BG)
+
+style = ttk.Style()
+style.theme_use("clam")
+
+style.configure(
+    "Treeview",
+    background="white",
+    fieldbackground="white",
+    foreground=TEXT,
+    rowheight=26,
+    bordercolor=BORDER,
+    borderwidth=1,
+)
+style.configure(
+    "Treeview.Heading",
+    background=ACCENT,
+    foreground="white",
+    font=("Segoe UI", 10, "bold")
+)
+style.map(
+    "Treeview",
+    background=[("selected", ACCENT)],
+    foreground=[("selected", "white")]
+)
+
+style.configure(
+    "Primary.TButton",
+    font=("Segoe UI", 9, "bold"),
+    padding=6
+)
+style.configure(
+    "Secondary.TButton",
+    font=("Segoe UI", 9),
+    padding=5
+)
+
+# ==========================================================
+#            HELPERS & UTILITIES
+# ==========================================================
+
+def entry(parent, var=None, width=20):
+    return tk.Entry(
+        parent,
+        textvariable=var,
+        bg="white",
+        fg=TEXT,
+        insertbackground=TEXT,
+        relief="flat",
+        bd=1,
+        width=width,
+        highlightthickness=1,
+        highlightcolor=ACCENT,
+        highlightbackground=BORDER
+    )
+
+
+def safe_amount(value, kind=Money):
+    """Typed rupees (kg for kind=Qty) as a Money / Qty; 0 if not a number."""
+    try:
+        return kind.parse(value)
+    except ValueError:
+        return kind()
+
+
+# ==========================================================
+#        BACKGROUND WORK (TASKS + LIVE SEARCH)
+# ==========================================================
+
+POLL_MS = 30   # how often finished background work is collected
+
+busy_text = tk.StringVar()
+
+
+def task_failed(title, parent=None):
+    """on_error callback that reports a failed background task."""
+    return lambda exc: messagebox.showerror(title, str(exc), parent=parent)
+
+
+def poll_background():
+    """Run callbacks for finished tasks and search pages on the UI thread."""
+    root.after(POLL_MS, poll_background)   # first, so a failing callback cannot stop polling
+    for msg in live_search.drain():
+        ledger.on_stream(*msg)
+    pending = tasks.poll()
+    busy_text.set(f"Working… {pending} task(s) running" if pending else "")
+    cursor = "watch" if pending else ""
+    if str(root.cget("cursor")) != cursor:
+        root.configure(cursor=cursor)
+
+
+# ==========================================================
+#                VARIABLES
+# ==========================================================
+
+# customer
+v_customer_id = tk.StringVar(value="-")
+v_customer_name = tk.StringVar()
+v_customer_mobile = tk.StringVar()
+v_customer_address = tk.StringVar()
+
+# header / bill info
+v_date = tk.StringVar(value=str(date.today()))
+v_vehicle = tk.StringVar()
+v_branch = tk.StringVar()
+v_type = tk.StringVar()
+
+# line item
+v_qty = tk.StringVar()
+v_rate = tk.StringVar()
+v_labour = tk.StringVar()
+v_advance = tk.StringVar(value="0")
+v_note = tk.StringVar()
+v_calc_mode = tk.StringVar(value=entries.CALC_MODES[0])
+v_draft_mode = tk.BooleanVar(value=False)
+draft_status = tk.StringVar()
+
+# totals / search / reports
+grand_total = tk.StringVar(value="0.00")    # of the selected rows
+selection_summary = tk.StringVar()
+
+search_date = tk.StringVar()
+search_vehicle = tk.StringVar()
+search_branch = tk.StringVar()
+search_text = tk.StringVar()
+
+report_date = tk.StringVar(value=str(date.today()))
+report_to_date = tk.StringVar()
+
+# customer panel globals
+customer_panel = None
+cust_tree = None
+cust_pager = None    # LedgerPager over the panel's history
+cust_total_qty = tk.StringVar(value="0.00")
+cust_total_amt = tk.StringVar(value="0.00")
+cust_bill_count = tk.StringVar(value="0")
+cust_selected_total = tk.StringVar(value="0.00")
+cust_selection = tk.StringVar()
+
+
+# ==========================================================
+#        CUSTOMER FUNCTIONS
+# ==========================================================
+
+def write_customer(wconn, name, mobile, address):
+    """Writer task: get-or-create, so a double click cannot add the customer twice."""
+    with wconn:
+        return customers.get_or_create_customer(wconn, name, mobile, address)
+
+
+def save_customer():
+    name = v_customer_name.get().strip()
+    mobile = v_customer_mobile.get().strip()
+    address = v_customer_address.get().strip()
+
+    if not name:
+        messagebox.showerror("Customer", "Customer name is required.")
+        return
+
+    def saved(result):
+        cid, created = result
+        if created:
+            customer_index.add(cid, name, mobile, address)
+        v_customer_id.set(str(cid))
+        messagebox.showinfo("Customer", f"Customer saved / selected.\nID: {cid}")
+        open_customer_panel()  # auto open / refresh panel
+
+    # find existing or create
+    cid = customer_index.find(name, mobile)
+    if cid is not None:
+        saved((cid, False))
+    else:
+        tasks.write(write_customer, name, mobile, address,
+                    on_done=saved, on_error=task_failed("Customer"))
+
+
+CUSTOMER_POPUP_LIMIT = 300   # rows shown in the picker while filtering
+
+
+def pick_customer(customer):
+    """Fill the customer fields from an index row (id, name, mobile, address)."""
+    cid, name, mobile, address = customer
+    CustomerAutocomplete.quiet = True
+    try:
+        v_customer_id.set(str(cid))
+        v_customer_name.set(name)
+        v_customer_mobile.set(mobile)
+        v_customer_address.set(address)
+    finally:
+        CustomerAutocomplete.quiet = False
+    open_customer_panel()  # auto open / refresh panel
+
+
+class CustomerAutocomplete:
+    """
+    Suggestion list under a customer Entry, fed from customer_index as
+    the user types. Down/Up move through it, Enter or double-click picks.
+    """
+
+    quiet = False   # set while pick_customer() fills the fields
+
+    def __init__(self, widget, var):
+        self.widget = widget
+        self.var = var
+        self.matches = []
+        self.popup = None
+        self.listbox = None
+        var.trace_add("write", self.update)
+        widget.bind("<Down>", self.focus_list)
+        widget.bind("<Escape>", lambda e: self.hide())
+        widget.bind("<FocusOut>", lambda e: widget.after(150, self._hide_if_idle))
+
+    def update(self, *_):
+        if self.quiet or root.focus_get() is not self.widget:
+            return
+        text = self.var.get()
+        self.matches = customer_index.search(text, customers.SUGGEST_LIMIT) if text.strip() else []
+        if not self.matches:
+            self.hide()
+            return
+        self._show()
+
+    def _show(self):
+        if self.popup is None:
+            self.popup = tk.Toplevel(self.widget)
+            self.popup.overrideredirect(True)
+            self.listbox = tk.Listbox(self.popup, height=customers.SUGGEST_LIMIT, width=42,
+                                      bg="white", fg=TEXT, relief="flat",
+                                      highlightthickness=1, highlightbackground=BORDER,
+                                      selectbackground=ACCENT, activestyle="none")
+            self.listbox.pack()
+            self.listbox.bind("<Double-1>", self.pick)
+            self.listbox.bind("<Return>", self.pick)
+            self.listbox.bind("<Escape>", lambda e: (self.hide(), self.widget.focus_set()))
+            self.listbox.bind("<FocusOut>", lambda e: self.widget.after(150, self._hide_if_idle))
+
+        self.listbox.delete(0, tk.END)
+        for _, name, mobile, _ in self.matches:
+            self.listbox.insert(tk.END, f"{name}   {mobile}" if mobile else name)
+        self.listbox.configure(height=len(self.matches))
+        x = self.widget.winfo_rootx()
+        y = self.widget.winfo_rooty() + self.widget.winfo_height()
+        self.popup.geometry(f"+{x}+{y}")
+        self.popup.deiconify()
+        self.popup.lift()
+
+    def hide(self):
+        if self.popup is not None:
+            self.popup.withdraw()
+
+    def _hide_if_idle(self):
+        if root.focus_get() not in (self.widget, self.listbox):
+            self.hide()
+
+    def focus_list(self, event=None):
+        if self.popup is not None and self.popup.winfo_viewable():
+            self.listbox.focus_set()
+            self.listbox.selection_clear(0, tk.END)
+            self.listbox.selection_set(0)
+            self.listbox.activate(0)
+        return "break"
+
+    def pick(self, event=None):
+        sel = self.listbox.curselection()
+        if not sel:
+            return
+        self.hide()
+        self.widget.focus_set()
+        pick_customer(self.matches[sel[0]])
+
+
+def choose_customer_popup():
+    win = tk.Toplevel(root)
+    win.title("Select Customer")
+    win.geometry("600x400")
+    win.configure(bg=BG)
+
+    v_filter = tk.StringVar()
+    bar = tk.Frame(win, bg=BG)
+    bar.pack(fill="x", padx=10, pady=(10, 0))
+    tk.Label(bar, text="Filter:", bg=BG, fg=MUTED,
+             font=("Segoe UI", 9, "bold")).pack(side="left")
+    filter_entry = entry(bar, v_filter, 30)
+    filter_entry.pack(side="left", padx=6)
+    count = tk.StringVar()
+    tk.Label(bar, textvariable=count, bg=BG, fg=MUTED).pack(side="right")
+
+    cols = ("ID", "Name", "Mobile", "Address")
+    tv = ttk.Treeview(win, columns=cols, show="headings")
+    for c in cols:
+        tv.heading(c, text=c)
+        tv.column(c, width=120)
+    tv.pack(fill="both", expand=True, padx=10, pady=10)
+
+    rows = RowView(tv, values=lambda c: c)
+
+    def refill(*_):
+        # filtering runs against the in-memory index, not the table
+        matches = customer_index.search(v_filter.get(), CUSTOMER_POPUP_LIMIT)
+        rows.sync(matches)
+        count.set(f"{len(matches)} of {len(customer_index.by_id)} customers")
+        if matches:
+            tv.selection_set(str(matches[0][0]))
+
+    def on_select(event=None):
+        sel = tv.selection()
+        if not sel:
+            return
+        customer = customer_index.get(int(sel[0]))
+        win.destroy()
+        pick_customer(customer)
+
+    v_filter.trace_add("write", refill)
+    refill()
+    filter_entry.focus_set()
+    filter_entry.bind("<Return>", on_select)
+    tv.bind("<Double-1>", on_select)
+
+    ttk.Button(
+        win, text="Select", style="Primary.TButton",
+        command=on_select
+    ).pack(pady=5)
+
+
+# ==========================================================
+#        ENTRY / BILLING FUNCTIONS
+# ==========================================================
+
+def write_line(wconn, cid, new_customer, line, drafting):
+    """
+    Writer task for Add Line. A new customer (name, mobile, address) is
+    created here and committed with the entry - or on its own when
+    drafting, because draft items are only written when the bill is
+    finalized. Returns (cid, created, row, entry id or None).
+    """
+    with wconn:
+        created = False
+        if new_customer is not None:
+            cid, created = customers.get_or_create_customer(wconn, *new_customer)
+        row = entries.make_entry(line[0], cid, *line[1:])
+        new_id = None if drafting else entries.insert_entry(wconn, row)
+    return cid, created, row, new_id
+
+
+def add_item():
+    # 1) Line-item validation first, so bad input writes nothing
+    qty = safe_amount(v_qty.get(), Qty)
+    rate = safe_amount(v_rate.get())
+    labour = safe_amount(v_labour.get())
+    advance = safe_amount(v_advance.get())
+
+    if qty <= 0 or rate <= 0:
+        messagebox.showerror("Input Error", "Quantity and Rate must be greater than 0.")
+        return
+
+    # 2) If no customer ID, either attach to existing (by name+mobile) or allow "no customer"
+    cid = None
+    drafting = v_draft_mode.get()
+
+    name = v_customer_name.get().strip()
+    mobile = v_customer_mobile.get().strip()
+    address = v_customer_address.get().strip()
+
+    # Case A: ID is already set (from Save/Select or Choose Existing)
+    if v_customer_id.get().isdigit():
+        cid = int(v_customer_id.get())
+
+    # Case B: No ID, but name/mobile present → look up, or create in write_line()
+    elif name:
+        cid = customer_index.find(name, mobile)
+
+    # Case C: no customer at all → ask user if they really want to continue
+    else:
+        if not messagebox.askyesno(
+            "No Customer",
+            "No customer selected.\nDo you want to continue without saving customer?"
+        ):
+            return
+        cid = None  # allow anonymous bill
+
+    line = (
+        v_date.get(), v_vehicle.get(), v_branch.get(), v_type.get(),
+        qty, rate, labour, advance, v_calc_mode.get(), v_note.get()
+    )
+    new_customer = (name, mobile, address) if cid is None and name else None
+
+    def saved(result):
+        cid, created, row, new_id = result
+        if created:
+            customer_index.add(cid, *new_customer)
+        if cid is not None:
+            v_customer_id.set(str(cid))  # sync UI label
+
+        # 3) Draft mode: keep the line in memory until Finalize Bill
+        if drafting:
+            draft.add(row)
+            update_draft_status()
+        else:
+            # Add just this row to the MAIN TABLE UI instead of reloading it
+            ledger.add([new_id])
+
+        # 4) Clear line fields
+        v_qty.set("")
+        v_rate.set("")
+        v_labour.set("")
+        v_advance.set("0")
+        v_note.set("")
+
+        # 5) Add the line to the customer panel if open
+        if cid is not None and not drafting:
+            refresh_customer_panel([new_id])
+
+    # one commit per line, made by the writer thread
+    tasks.write(write_line, cid, new_customer, line, drafting,
+                on_done=saved, on_error=task_failed("Add Line"))
+
+
+# ==========================================================
+#        DRAFT BILL (BATCHED WRITES)
+# ==========================================================
+
+draft = entries.DraftBill()
+
+
+def update_draft_status():
+    if draft:
+        draft_status.set(f"Draft: {len(draft)} item(s) · ₹ {draft.total:,.2f}")
+    else:
+        draft_status.set("")
+
+
+_finalizing = {}   # pending write future -> the draft rows it is saving
+
+
+def finalize_draft():
+    if not draft:
+        messagebox.showwarning("Draft Bill", "The draft bill has no items.")
+        return
+
+    # out of the draft as soon as the write is queued, so a second click,
+    # leaving draft mode or closing cannot write the same rows again
+    rows = draft.take()
+    update_draft_status()
+
+    def saved(ids):
+        _finalizing.pop(future, None)
+        ledger.add(ids)
+        refresh_customer_panel(ids)
+        messagebox.showinfo("Draft Bill", f"Saved {len(ids)} line item(s).")
+
+    def failed(exc):
+        if _finalizing.pop(future, None) is not None:
+            draft.restore(rows)
+            update_draft_status()
+        messagebox.showerror("Draft Bill", f"The draft was not saved and is kept:\n{exc}")
+
+    # one transaction for the whole bill
+    future = tasks.write(entries.insert_entries, rows, on_done=saved, on_error=failed)
+    _finalizing[future] = rows
+
+
+def discard_draft():
+    if not draft:
+        return
+    if not messagebox.askyesno("Draft Bill", f"Discard {len(draft)} unsaved draft item(s)?"):
+        return
+    draft.discard()
+    update_draft_status()
+
+
+def toggle_draft_mode():
+    # leaving draft mode with pending items: save them or stay in draft mode
+    if v_draft_mode.get() or not draft:
+        return
+    if messagebox.askyesno("Draft Bill", f"Save {len(draft)} draft item(s) now?"):
+        finalize_draft()
+    else:
+        v_draft_mode.set(True)
+
+
+def on_close():
+    # a Finalize still in the writer queue: wait for it, and offer to
+    # save its rows again only if it failed
+    for future, rows in list(_finalizing.items()):
+        try:
+            future.result()
+        except Exception:
+            draft.restore(rows)
+        del _finalizing[future]
+    if draft:
+        answer = messagebox.askyesnocancel(
+            "Draft Bill",
+            f"Save {len(draft)} draft item(s) before closing?"
+        )
+        if answer is None:
+            return
+        if answer:
+            try:
+                tasks.write(entries.insert_entries, list(draft.items)).result()
+            except Exception as exc:
+                messagebox.showerror("Draft Bill", f"The draft could not be saved:\n{exc}")
+                return
+    tasks.shutdown()   # let queued writes finish
+    root.destroy()
+
+
+# ==========================================================
+#        LEDGER (PAGED / VIRTUAL VIEW)
+# ==========================================================
+
+LEDGER_PAGE_SIZE = 200   # rows fetched per keyset page
+LEDGER_MAX_PAGES = 5     # pages held in the Treeview at once
+LEDGER_EDGE = 0.02       # scroll fraction that triggers the next page
+
+class LedgerPager:
+    """
+    Sliding window over the ledger ordered by (date DESC, id DESC).
+
+    Rows are fetched with keyset pagination on (date, id) as the user
+    scrolls towards either edge of the Treeview, and at most
+    `max_pages` pages are kept in the widget, so startup and refresh
+    cost do not grow with the size of the entries table.
+    A ranked search result is shown whole instead: it is not in keyset
+    order, so it is never paged or trimmed.
+    Treeview iids are the entries.id of each row; `values(row)` picks
+    the columns the widget shows from a ledger row. All widget changes
+    go through a RowView, so a refresh only touches rows that changed.
+    """
+
+    def __init__(self, tree_widget, scroll_set,
+                 page_size=LEDGER_PAGE_SIZE, max_pages=LEDGER_MAX_PAGES,
+                 values=lambda r: r[1:]):
+        self.tree = tree_widget
+        self.scroll_set = scroll_set
+        self.view = RowView(tree_widget, values, numbers=entries.ledger_numbers)
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.where = ""
+        self.params = []
+        self.pages = deque()      # each page: list of (date, id) keys
+        self.more_newer = False   # rows exist above the window
+        self.more_older = False   # rows exist below the window
+        self.pending = False
+        self.ranked = None        # pages(conn) of a ranked search (see ranked_pages)
+        self.stream = None        # live-search generation being streamed in
+        self.fresh = False        # next streamed page replaces the window
+
+    # ---- filter / reset ----
+    def set_filter(self, where="", params=()):
+        self.where = where
+        self.params = list(params)
+        self.ranked = None
+        self.reset()
+
+    def begin_stream(self, generation, where="", params=(), ranked=None):
+        """
+        Wait for a background search to deliver its pages through
+        on_stream(); the current rows stay up until the first page
+        replaces them. `ranked` (the ranked search's pages) is kept so a
+        later reset() (after an add, delete or import) re-runs the same
+        search on the live-search thread.
+        """
+        self.where = where
+        self.params = list(params)
+        self.ranked = ranked
+        self.stream = generation
+        self.fresh = True
+
+    def on_stream(self, kind, generation, rows, more):
+        if generation != self.stream:
+            return   # superseded by a newer search or a reset()
+        if kind == "page":
+            if self.fresh:
+                self._replace(rows, more)
+            else:
+                self._append_page(rows, more)
+            return
+        self.stream = None
+        if self.fresh:
+            self._replace([], False)   # nothing matched
+        if kind == "error":
+            messagebox.showerror("Search", str(rows))
+
+    def reset(self):
+        self.stream = None
+        if self.ranked is not None:
+            # re-ranked off the UI thread; the rows shown stay until then
+            self.begin_stream(live_search.submit(self.ranked), self.where, self.params,
+                              ranked=self.ranked)
+        else:
+            self._replace(*self._fetch(None, older=True))
+
+    def _replace(self, rows, more):
+        """Show `rows` as the whole window; the RowView diff keeps unchanged rows."""
+        self.fresh = False
+        self.view.sync(rows)
+        self.pages = deque([[(r[1], r[0]) for r in rows]] if rows else [])
+        self.more_newer = False
+        self.more_older = more
+        self.tree.yview_moveto(0)
+
+    # ---- keyset queries ----
+    def _fetch(self, key, older):
+        return entries.ledger_page(
+            conn, self.where, self.params, key, older, self.page_size
+        )
+
+    # ---- window movement ----
+    def _anchor(self):
+        order = self.view.order
+        if not order:
+            return None
+        first = float(self.tree.yview()[0])
+        return order[min(int(first * len(order)), len(order) - 1)]
+
+    def _restore(self, anchor):
+        if anchor is None or anchor not in self.view:
+            return
+        self.tree.yview_moveto(self.tree.index(anchor) / len(self.view))
+
+    def _drop_page(self, page):
+        self.view.delete(k[1] for k in page)
+
+    def load_older(self):
+        if not self.more_older or self.ranked is not None:
+            return
+        key = self.pages[-1][-1] if self.pages else None
+        rows, more = self._fetch(key, older=True)
+        self._append_page(rows, more)
+
+    def _append_page(self, rows, more):
+        self.more_older = more
+        if not rows:
+            return
+
+        anchor = self._anchor()
+        self.view.append(rows)
+        self.pages.append([(r[1], r[0]) for r in rows])
+
+        # ranked rows are not in (date, id) order, so a dropped page could
+        # not be fetched back: a ranked result is kept whole
+        if len(self.pages) > self.max_pages and self.ranked is None:
+            self._drop_page(self.pages.popleft())
+            self.more_newer = True
+        self._restore(anchor)
+
+    def load_newer(self):
+        if not self.more_newer or not self.pages or self.ranked is not None:
+            return
+        rows, more = self._fetch(self.pages[0][0], older=False)
+        self.more_newer = more
+        if not rows:
+            return
+
+        anchor = self._anchor()
+        self.view.insert(0, rows)
+        self.pages.appendleft([(r[1], r[0]) for r in rows])
+
+        if len(self.pages) > self.max_pages:
+            self._drop_page(self.pages.pop())
+            self.more_older = True
+        self._restore(anchor)
+
+    def add(self, ids):
+        """
+        Place newly written entries into the window without refetching
+        it. Rows outside the filter are ignored, and rows beyond an edge
+        that still has unloaded rows are left for scrolling to bring in.
+        """
+        if self.stream is not None:
+            return   # a live search is filling the window
+        if self.ranked is not None:
+            self.reset()   # rank order is the search's to decide
+            return
+
+        keys = [k for page in self.pages for k in page]   # (date, id), newest first
+        rows = entries.get_entries(conn, ids, self.where, self.params)
+        for r in rows:
+            key = (r[1], r[0])
+            i = next((n for n, k in enumerate(keys) if key > k), len(keys))
+            if (i == 0 and self.more_newer) or (i == len(keys) and self.more_older):
+                continue
+            self.view.insert(i, [r])
+            keys.insert(i, key)
+        self.pages = deque(keys[j:j + self.page_size]
+                           for j in range(0, len(keys), self.page_size))
+        if rows and rows[-1][0] in self.view:
+            self.tree.see(str(rows[-1][0]))
+
+    def remove(self, ids):
+        """Drop deleted entries from the window without refetching it."""
+        gone = {int(i) for i in ids}
+        pages = ([k for k in page if k[1] not in gone] for page in self.pages)
+        self.pages = deque(page for page in pages if page)
+        self.view.delete(gone)
+        if not self.pages:
+            self.reset()
+
+    # ---- scroll hook (Treeview yscrollcommand) ----
+    def on_scroll(self, first, last):
+        self.scroll_set(first, last)
+        if self.pending or self.stream is not None:
+            return
+        if float(last) >= 1.0 - LEDGER_EDGE and self.more_older:
+            self.pending = True
+            self.tree.after_idle(self._run, self.load_older)
+        elif float(first) <= LEDGER_EDGE and self.more_newer:
+            self.pending = True
+            self.tree.after_idle(self._run, self.load_newer)
+
+    def _run(self, step):
+        self.pending = False
+        step()
+
+
+def load_all_entries():
+    """Load the newest page of bills into the main dashboard Treeview."""
+    ledger.set_filter()
+
+
+def track_selection(pager, summary, total):
+    """
+    Keep `summary` (count, qty, pre-total, advance) and `total` showing
+    the pager's current selection, using the numbers the pager's RowView
+    keeps. A Ctrl-click toggles one row, so it is applied as that one
+    row without reading the selection back; any other change recounts
+    the new selection only.
+    """
+    tree = pager.tree
+    totals = SelectionTotals(pager.view, len(entries.LEDGER_NUMBERS))
+    toggled = deque()   # rows Ctrl-clicked whose <<TreeviewSelect>> is still queued
+
+    def toggling(event):
+        # runs before the Treeview class binding that does the toggle
+        iid = tree.identify_row(event.y)
+        if iid:
+            toggled.append(iid)
+            tree.after_idle(toggled.clear)   # the select event is handled before idle
+
+    tag = f"{tree}.selection"
+    tree.bind_class(tag, "<<ToggleSelection>>", toggling)
+    tree.bindtags((tag,) + tree.bindtags())
+
+    def changed(_event=None):
+        if toggled:
+            totals.toggle(toggled.popleft())
+        else:
+            totals.update(tree.selection())
+        qty, pre, advance, amount = totals.sums
+        summary.set(
+            f"{len(totals):,} selected · Qty {qty:,.2f} · PreTotal {pre:,.2f} · "
+            f"Advance {advance:,.2f}" if totals else ""
+        )
+        total.set(f"{amount:,.2f}")
+
+    tree.bind("<<TreeviewSelect>>", changed, add="+")
+    return totals
+
+
+# ==========================================================
+#           SEARCH & REPORT FUNCTIONS
+# ==========================================================
+
+SEARCH_RANKED_LIMIT = 500   # best matches shown for a "Find" search
+SEARCH_DELAY_MS = 300       # typing pause before a live search runs
+SEARCH_PAGE_SIZE = 100      # ranked rows inserted per poll
+
+live_search = LiveSearch(DB_NAME)
+_search_job = None
+
+
+def schedule_search(*_):
+    """Search-as-you-type: restart the debounce timer on every keystroke."""
+    global _search_job
+    if _search_job is not None:
+        root.after_cancel(_search_job)
+    _search_job = root.after(SEARCH_DELAY_MS, search_entries)
+
+
+def search_entries():
+    global _search_job
+    if _search_job is not None:
+        root.after_cancel(_search_job)
+        _search_job = None
+
+    day = search_date.get().strip()
+    if day:
+        try:
+            date.fromisoformat(day)
+        except ValueError:
+            return   # date still being typed
+    # vehicle / branch are substring matches served by the FTS index
+    where, params = search.ledger_filter(
+        conn,
+        date=day,
+        vehicle=search_vehicle.get().strip(),
+        branch=search_branch.get().strip(),
+    )
+    text = search_text.get().strip()
+    if not text:
+        pages = ledger_pages(where, params, ledger.page_size, ledger.max_pages)
+        ledger.begin_stream(live_search.submit(pages), where, params)
+        return
+
+    # free text: ranked across vehicle, branch, type, note and customer
+    pages = ranked_pages(text, where, params, SEARCH_RANKED_LIMIT, SEARCH_PAGE_SIZE)
+    ledger.begin_stream(live_search.submit(pages), where, params, ranked=pages)
+
+
+def show_all_entries():
+    search_date.set("")
+    search_vehicle.set("")
+    search_branch.set("")
+    search_text.set("")
+    search_entries()
+
+
+def show_period_report(kind, title, until=None):
+    def failed(exc):
+        if isinstance(exc, ValueError):
+            messagebox.showerror("Report", "Please enter a valid date (YYYY-MM-DD).")
+        else:
+            messagebox.showerror("Report", str(exc))
+
+    d = report_date.get().strip()
+    tasks.read(reports.period_report, kind, d, until,
+               on_done=lambda rep: show_report(rep, title), on_error=failed)
+
+
+def show_report(rep, title):
+    t = rep.totals
+    lines = [
+        rep.period.label,
+        f"Total Bills: {t.count}",
+        f"Total Qty: {t.qty:.2f} Kg",
+        f"Total Amount: ₹ {t.amount:,.2f}",
+    ]
+    for heading, groups in (("By Branch", rep.by_branch), ("By Type", rep.by_type)):
+        if not groups:
+            continue
+        lines += ["", f"{heading}:"]
+        for name, g in sorted(groups.items(), key=lambda kv: -kv[1].amount):
+            lines.append(
+                f"  {name or '-'}: {g.count} bills · {g.qty:.2f} Kg · ₹ {g.amount:,.2f}"
+            )
+
+    messagebox.showinfo(title, "\n".join(lines))
+
+
+def daily_report():
+    show_period_report("day", "Daily Report")
+
+
+def weekly_report():
+    show_period_report("week", "Weekly Report")
+
+
+def monthly_report():
+    show_period_report("month", "Monthly Report")
+
+
+def quarterly_report():
+    show_period_report("quarter", "Quarterly Report")
+
+
+def financial_year_report():
+    show_period_report("fy", "Financial Year Report")
+
+
+def date_range_report():
+    until = report_to_date.get().strip()
+    if not until:
+        messagebox.showerror("Report", "Enter a 'To' date (YYYY-MM-DD) for the range.")
+        return
+    show_period_report("range", "Date Range Report", until)
+
+
+# ==========================================================
+#                   DELETE ENTRY FEATURE
+# ==========================================================
+
+def delete_entries(tree_widget=None):
+    if tree_widget is None:
+        tree_widget = tree  # default main dashboard
+
+    selected = tree_widget.selection()
+    if not selected:
+        messagebox.showwarning("Delete", "⚠ Please select at least one row to delete.")
+        return
+
+    if not messagebox.askyesno("Confirm Delete",
+        "Are you sure you want to permanently delete selected records?"):
+        return
+
+    ids = [int(item) for item in selected]   # iids are entries.id
+
+    def deleted(deleted_count):
+        # drop just these rows from whichever views show them
+        ledger.remove(ids)
+        if customer_panel is not None and customer_panel.winfo_exists():
+            cust_pager.remove(ids)
+            refresh_customer_totals()
+
+        messagebox.showinfo("Deleted", f"🗑 Removed {deleted_count} record(s).")
+
+    # one transaction, batched DELETE ... WHERE id IN (...)
+    tasks.write(entries.delete_entries, ids,
+                on_done=deleted, on_error=task_failed("Delete"))
+
+
+# ==========================================================
+#           INVOICE (C2 – THIN GOLD HEADER)
+# ==========================================================
+
+def open_invoice_folder():
+    from billing import invoices
+
+    invoices.ensure_invoice_folder()
+    os.startfile(invoices.INVOICE_DIR)
+
+
+def generate_invoice(tree_widget=None):
+    if tree_widget is None:
+        tree_widget = tree
+
+    selected = tree_widget.selection()
+    if not selected:
+        messagebox.showwarning("Invoice", "⚠ Select at least one row.")
+        return
+
+    from billing import invoices
+
+    # iids are entries.id - read the numbers from the DB, not the display strings
+    rows = entries.get_entries(conn, selected)
+
+    cid = v_customer_id.get()
+    invoice = invoices.Invoice(
+        customer_id=int(cid) if cid.isdigit() else None,
+        customer_name=v_customer_name.get(),
+        customer_mobile=v_customer_mobile.get(),
+        customer_address=v_customer_address.get(),
+        date=v_date.get(),
+        vehicle=v_vehicle.get(),
+        branch=v_branch.get(),
+        type=v_type.get(),
+        lines=invoices.invoice_lines(rows),
+        entry_ids=[r[0] for r in rows],
+    )
+
+    def ready(filename):
+        os.startfile(filename)
+        messagebox.showinfo("Invoice Ready", f"Saved Invoice:\n{filename}")
+
+    def issued(_):
+        # ReportLab rendering runs off the UI thread, and off the writer
+        tasks.run(invoices.write_invoice, invoice,
+                  on_done=ready, on_error=task_failed("Invoice"))
+
+    # the register hands out the number, so concurrent invoices can't collide
+    tasks.write(invoices.issue_invoices, [invoice],
+                on_done=issued, on_error=task_failed("Invoice"))
+
+
+def reprint_invoice():
+    number = simpledialog.askstring("Reprint Invoice", "Invoice number:", parent=root)
+    if not number:
+        return
+
+    from billing import invoices
+
+    def found(path):
+        if path is None:
+            messagebox.showwarning("Reprint Invoice", f"No invoice {number} has been issued.")
+            return
+        os.startfile(path)
+
+    # renders again only if the PDF has been moved or deleted
+    tasks.read(invoices.reprint, number,
+               on_done=found, on_error=task_failed("Reprint Invoice"))
+
+
+# ==========================================================
+#           BULK IMPORT (CSV / XLSX)
+# ==========================================================
+
+def import_entries():
+    path = filedialog.askopenfilename(
+        title="Import Entries",
+        filetypes=[
+            ("Spreadsheets", "*.csv *.xlsx"),
+            ("CSV", "*.csv"),
+            ("Excel", "*.xlsx"),
+            ("All files", "*.*"),
+        ]
+    )
+    if not path:
+        return
+
+    win = tk.Toplevel(root)
+    win.title("Importing…")
+    win.configure(bg=BG)
+    win.transient(root)
+    win.grab_set()   # keep the operator out of the main window meanwhile
+
+    status = tk.StringVar(value=f"Reading {os.path.basename(path)}…")
+    tk.Label(win, textvariable=status, bg=BG, fg=TEXT,
+             font=("Segoe UI", 10), padx=24, pady=20).pack()
+
+    def progress(r):
+        status.set(f"{r.read:,} rows read · {r.imported:,} imported · {r.rejected:,} rejected")
+
+    def failed(exc):
+        win.destroy()
+        customer_index.reload()   # chunks before the failure are committed
+        messagebox.showerror("Import", str(exc))
+
+    def imported(result):
+        win.destroy()
+        customer_index.reload()   # the importer created customers through its own cache
+        ledger.reset()
+        refresh_customer_panel()
+
+        msg = (
+            f"Imported {result.imported:,} of {result.read:,} rows.\n"
+            f"New customers: {result.customers_created}"
+        )
+        if result.rejects_path:
+            msg += f"\n\n{result.rejected:,} rejected row(s) saved to:\n{result.rejects_path}"
+        messagebox.showinfo("Import", msg)
+
+    # the import holds the writer connection; each chunk commits on its own
+    tasks.write(importer.import_file, path, progress=tasks.in_ui(progress),
+                on_done=imported, on_error=failed)
+
+
+# ==========================================================
+#           EXPORT (CSV / PARQUET)
+# ==========================================================
+
+def export_dialog():
+    win = tk.Toplevel(root)
+    win.title("Export")
+    win.configure(bg=BG)
+    win.transient(root)
+
+    v_from = tk.StringVar(value=str(date.today().replace(day=1)))
+    v_to = tk.StringVar(value=str(date.today()))
+    v_exp_branch = tk.StringVar()
+    v_only_customer = tk.BooleanVar(value=False)
+    status = tk.StringVar(value="Leave a field blank to export everything.")
+
+    form = tk.Frame(win, bg=CARD, highlightbackground=BORDER, highlightthickness=1,
+                    padx=12, pady=10)
+    form.pack(fill="x", padx=10, pady=10)
+
+    for r, (txt, var) in enumerate((("From:", v_from), ("To:", v_to), ("Branch:", v_exp_branch))):
+        tk.Label(form, text=txt, bg=CARD, fg=MUTED,
+                 font=("Segoe UI", 9, "bold")).grid(row=r, column=0, sticky="w", pady=2)
+        entry(form, var, 14).grid(row=r, column=1, sticky="w", padx=4, pady=2)
+
+    cid = v_customer_id.get()
+    if cid.isdigit():
+        tk.Checkbutton(
+            form,
+            text=f"Only {v_customer_name.get() or 'current customer'} (ID {cid})",
+            variable=v_only_customer,
+            bg=CARD,
+            fg=TEXT,
+            activebackground=CARD
+        ).grid(row=3, column=0, columnspan=2, sticky="w", pady=(4, 0))
+
+    def run(kind):
+        path = filedialog.asksaveasfilename(
+            parent=win,
+            title="Export",
+            defaultextension=".csv",
+            filetypes=exporter.file_types()
+        )
+        if not path:
+            return
+
+        def progress(n):
+            status.set(f"{n:,} rows written…")
+
+        def done(n):
+            status.set(f"Wrote {n:,} rows to {os.path.basename(path)}")
+
+        start = v_from.get().strip() or None
+        end = v_to.get().strip() or None
+        branch = v_exp_branch.get().strip() or None
+        if kind == "entries":
+            customer_id = int(cid) if v_only_customer.get() else None
+            tasks.read(exporter.export_entries, path, start, end, branch, customer_id,
+                       progress=tasks.in_ui(progress),
+                       on_done=done, on_error=task_failed("Export", win))
+        else:
+            tasks.read(exporter.export_daily_summary, path, start, end, branch,
+                       progress=tasks.in_ui(progress),
+                       on_done=done, on_error=task_failed("Export", win))
+        status.set("Exporting…")
+
+    buttons = tk.Frame(win, bg=BG)
+    buttons.pack(fill="x", padx=10)
+    ttk.Button(buttons, text="Export Entries", style="Primary.TButton",
+               command=lambda: run("entries")).pack(side="left", padx=4)
+    ttk.Button(buttons, text="Export Daily Summary", style="Secondary.TButton",
+               command=lambda: run("summary")).pack(side="left", padx=4)
+
+    tk.Label(win, textvariable=status, bg=BG, fg=MUTED,
+             font=("Segoe UI", 9)).pack(anchor="w", padx=12, pady=8)
+
+
+# ==========================================================
+#           BATCH INVOICES (PROCESS POOL)
+# ==========================================================
+
+def batch_invoice_dialog():
+    from billing import batch_invoices
+
+    win = tk.Toplevel(root)
+    win.title("Batch Invoices")
+    win.geometry("560x460")
+    win.configure(bg=BG)
+    win.transient(root)
+
+    today = date.today()
+    v_from = tk.StringVar(value=str(today.replace(day=1)))
+    v_to = tk.StringVar(value=str(today))
+    v_scope = tk.StringVar(value="all")
+    v_workers = tk.StringVar(value=str(os.cpu_count() or 1))
+    status = tk.StringVar(value="One invoice per customer with entries in the period.")
+    folder = None
+
+    form = tk.Frame(win, bg=CARD, highlightbackground=BORDER, highlightthickness=1,
+                    padx=12, pady=10)
+    form.pack(fill="x", padx=10, pady=10)
+
+    for r, (txt, var) in enumerate((("From:", v_from), ("To:", v_to), ("Workers:", v_workers))):
+        tk.Label(form, text=txt, bg=CARD, fg=MUTED,
+                 font=("Segoe UI", 9, "bold")).grid(row=r, column=0, sticky="w", pady=2)
+        entry(form, var, 12).grid(row=r, column=1, sticky="w", padx=4, pady=2)
+
+    tk.Radiobutton(form, text="All customers", variable=v_scope, value="all",
+                   bg=CARD, fg=TEXT, activebackground=CARD).grid(row=0, column=2, sticky="w", padx=12)
+    cid = v_customer_id.get()
+    if cid.isdigit():
+        tk.Radiobutton(form, text=f"Only {v_customer_name.get() or 'current customer'} (ID {cid})",
+                       variable=v_scope, value="current",
+                       bg=CARD, fg=TEXT, activebackground=CARD).grid(row=1, column=2, sticky="w", padx=12)
+
+    bar = ttk.Progressbar(win, mode="determinate")
+    bar.pack(fill="x", padx=10)
+    tk.Label(win, textvariable=status, bg=BG, fg=MUTED,
+             font=("Segoe UI", 9)).pack(anchor="w", padx=12, pady=4)
+
+    list_frame = tk.Frame(win, bg=BG)
+    list_frame.pack(fill="both", expand=True, padx=10)
+    results = tk.Listbox(list_frame, bg="white", fg=TEXT, relief="flat",
+                         highlightthickness=1, highlightbackground=BORDER)
+    results.pack(side="left", fill="both", expand=True)
+    scroll = ttk.Scrollbar(list_frame, orient="vertical", command=results.yview)
+    results.configure(yscrollcommand=scroll.set)
+    scroll.pack(side="right", fill="y")
+
+    def generate():
+        nonlocal folder
+        start, end = v_from.get().strip(), v_to.get().strip()
+        try:
+            date.fromisoformat(start)
+            date.fromisoformat(end)
+        except ValueError:
+            messagebox.showerror("Batch Invoices", "Use dates in YYYY-MM-DD format.", parent=win)
+            return
+        workers = int(v_workers.get()) if v_workers.get().isdigit() else None
+
+        ids = [int(cid)] if v_scope.get() == "current" else None
+
+        def progress(done, total):
+            bar["value"] = done
+            status.set(f"Rendering {done} / {total}…")
+
+        def planned(batch):
+            if not batch:
+                gen_btn.state(["!disabled"])
+                messagebox.showinfo("Batch Invoices",
+                                    "No customer entries in this period that are not "
+                                    "already invoiced.", parent=win)
+                return
+            results.delete(0, tk.END)
+            bar["maximum"] = len(batch)
+            tasks.run(batch_invoices.render_batch, batch, folder, workers,
+                      tasks.in_ui(progress), on_done=rendered, on_error=failed)
+
+        def failed(exc):
+            gen_btn.state(["!disabled"])
+            messagebox.showerror("Batch Invoices", str(exc), parent=win)
+
+        folder = batch_invoices.batch_folder(start, end)   # a re-run gets a new one
+        gen_btn.state(["disabled"])
+        status.set("Collecting entries…")
+        # planned and numbered in one write transaction
+        tasks.write(batch_invoices.issue_batch, start, end, ids, folder,
+                    on_done=planned, on_error=failed)
+
+    def rendered(result):
+        gen_btn.state(["!disabled"])
+        for number, customer, path, amount in result.files:
+            results.insert(tk.END, f"{number}   {customer}   ₹ {amount:,.2f}")
+        for number, customer, error in result.failed:
+            results.insert(tk.END, f"FAILED {number}   {customer}: {error}")
+        status.set(
+            f"{len(result.files)} invoice(s) saved to {result.folder}"
+            + (f" · {len(result.failed)} failed" if result.failed else "")
+        )
+
+    def open_folder():
+        if folder and os.path.isdir(folder):
+            os.startfile(folder)
+        else:
+            open_invoice_folder()
+
+    buttons = tk.Frame(win, bg=BG, pady=8)
+    buttons.pack(fill="x", padx=10)
+    gen_btn = ttk.Button(buttons, text="Generate", style="Primary.TButton", command=generate)
+    gen_btn.pack(side="left", padx=4)
+    ttk.Button(buttons, text="Open Folder", style="Secondary.TButton",
+               command=open_folder).pack(side="left", padx=4)
+
+
+# ==========================================================
+#           TRENDS (NUMPY ANALYTICS)
+# ==========================================================
+
+def fill_table(tv, headings, rows, first_width=160):
+    """Replace a headings-only Treeview's columns and rows."""
+    tv.delete(*tv.get_children())
+    cols = [f"c{i}" for i in range(len(headings))]
+    tv.configure(columns=cols)
+    for i, (col, text) in enumerate(zip(cols, headings)):
+        tv.heading(col, text=text)
+        tv.column(col, width=first_width if i == 0 else 110,
+                  anchor="w" if i == 0 else "e", stretch=True)
+    for row in rows:
+        tv.insert("", "end", values=row)
+
+
+def trends_dialog():
+    from billing import analytics   # NumPy loads on first use
+
+    win = tk.Toplevel(root)
+    win.title("Trends")
+    win.geometry("980x560")
+    win.configure(bg=BG)
+    win.transient(root)
+
+    today = date.today()
+    v_from = tk.StringVar(value=str(date(today.year - 1, today.month, 1)))
+    v_to = tk.StringVar(value=str(today))
+    v_window = tk.StringVar(value="4")
+    v_by = tk.StringVar(value="branch")
+    status = tk.StringVar(value="")
+
+    form = tk.Frame(win, bg=CARD, highlightbackground=BORDER, highlightthickness=1,
+                    padx=12, pady=8)
+    form.pack(fill="x", padx=10, pady=10)
+    for c, (txt, var, width) in enumerate((("From:", v_from, 12), ("To:", v_to, 12),
+                                           ("Rolling weeks:", v_window, 4))):
+        tk.Label(form, text=txt, bg=CARD, fg=MUTED,
+                 font=("Segoe UI", 9, "bold")).grid(row=0, column=2 * c, sticky="w")
+        entry(form, var, width).grid(row=0, column=2 * c + 1, sticky="w", padx=(4, 12))
+    tk.Label(form, text="Advance by:", bg=CARD, fg=MUTED,
+             font=("Segoe UI", 9, "bold")).grid(row=0, column=6, sticky="w")
+    ttk.Combobox(form, textvariable=v_by, values=analytics.GROUP_BY, width=10,
+                 state="readonly").grid(row=0, column=7, sticky="w", padx=4)
+    show_btn = ttk.Button(form, text="Show", style="Primary.TButton")
+    show_btn.grid(row=0, column=8, padx=(12, 0))
+
+    notebook = ttk.Notebook(win)
+    notebook.pack(fill="both", expand=True, padx=10)
+    tables = {}
+    for name in ("Top Customers", "Qty by Branch / Week", "Rate by Type / Week", "Advance vs Total"):
+        frame = tk.Frame(notebook, bg=BG)
+        tv = ttk.Treeview(frame, show="headings")
+        scroll = ttk.Scrollbar(frame, orient="vertical", command=tv.yview)
+        tv.configure(yscrollcommand=scroll.set)
+        tv.pack(side="left", fill="both", expand=True)
+        scroll.pack(side="right", fill="y")
+        notebook.add(frame, text=name)
+        tables[name] = tv
+    unassigned = tk.StringVar()
+    tk.Label(tables["Top Customers"].master, textvariable=unassigned, bg=BG, fg=MUTED,
+             font=("Segoe UI", 9)).pack(side="bottom", anchor="w", before=tables["Top Customers"])
+
+    tk.Label(win, textvariable=status, bg=BG, fg=MUTED,
+             font=("Segoe UI", 9)).pack(anchor="w", padx=12, pady=6)
+
+    def rate_cell(week, rolling):
+        if week is None:
+            return "" if rolling is None else f"({rolling:.2f})"
+        return f"{week:.2f} ({rolling:.2f})"
+
+    def shown(t):
+        if not win.winfo_exists():
+            return
+        show_btn.state(["!disabled"])
+        fill_table(tables["Top Customers"],
+                   ("Customer", "Bills", "Qty (Kg)", "Amount (₹)", "Share"),
+                   [(c.name, c.bills, f"{c.qty:,.2f}", f"{c.amount:,.2f}", f"{c.share:.1%}")
+                    for c in t.customers])
+        n = t.no_customer
+        unassigned.set(f"Not ranked: {n.name} · {n.bills:,} bills · {n.qty:,.2f} Kg · "
+                       f"₹{n.amount:,.2f} ({n.share:.1%})" if n.bills else "")
+
+        q = t.branch_qty
+        fill_table(tables["Qty by Branch / Week"], ["Week of"] + q.columns,
+                   [[week] + [f"{v:,.0f}" if v else "" for v in row]
+                    for week, row in zip(q.rows, q.values)])
+
+        r = t.rates
+        fill_table(tables["Rate by Type / Week"], ["Week of"] + r.columns,
+                   [[week] + [rate_cell(v, avg) for v, avg in zip(row, rolling)]
+                    for week, row, rolling in zip(r.rows, r.values, r.extra["rolling"])])
+
+        fill_table(tables["Advance vs Total"],
+                   (v_by.get().title(), "Bills", "Advance (₹)", "Total (₹)", "Advance / Total"),
+                   [(a.key, a.bills, f"{a.advance:,.2f}", f"{a.total:,.2f}", f"{a.ratio:.1%}")
+                    for a in t.advances])
+        status.set(f"{t.start or 'start'} – {t.end or 'today'} · {t.rows:,} entries in the "
+                   f"snapshot · rate shows the week (rolling average)")
+
+    def failed(exc):
+        if win.winfo_exists():
+            show_btn.state(["!disabled"])
+            messagebox.showerror("Trends", str(exc), parent=win)
+
+    def show():
+        start, end = v_from.get().strip() or None, v_to.get().strip() or None
+        try:
+            for d in (start, end):
+                if d:
+                    date.fromisoformat(d)
+        except ValueError:
+            messagebox.showerror("Trends", "Use dates in YYYY-MM-DD format.", parent=win)
+            return
+        window = int(v_window.get()) if v_window.get().isdigit() else 4
+        show_btn.state(["disabled"])
+        status.set("Calculating…")
+        # the first call loads the columnar snapshot; later ones only read new rows
+        tasks.read(analytics.trends, start, end, window, v_by.get(),
+                   on_done=shown, on_error=failed)
+
+    show_btn.configure(command=show)
+    show()
+
+
+# ==========================================================
+#           DIAGNOSTICS WINDOW
+# ==========================================================
+
+DIAGNOSTICS_REFRESH_MS = 2000
+
+
+def diagnostics_dialog():
+    win = tk.Toplevel(root)
+    win.title("Diagnostics")
+    win.geometry("1000x520")
+    win.configure(bg=BG)
+    win.transient(root)
+
+    tk.Label(
+        win,
+        text=(f"Time per operation since launch (ms). Operations over {diagnostics.SLOW_MS} ms "
+              f"are written to {os.path.abspath(diagnostics.LOG_FILE)}, slow queries with "
+              f"their query plan."),
+        bg=BG, fg=MUTED, font=("Segoe UI", 9), wraplength=960, justify="left"
+    ).pack(anchor="w", padx=12, pady=(10, 4))
+
+    frame = tk.Frame(win, bg=BG)
+    frame.pack(fill="both", expand=True, padx=10)
+    cols = ("Kind", "Operation", "Count", "p50", "p95", "p99", "Max", "Rows")
+    tv = ttk.Treeview(frame, columns=cols, show="headings")
+    for col, width in zip(cols, (50, 520, 70, 70, 70, 70, 80, 70)):
+        tv.heading(col, text=col)
+        tv.column(col, width=width, anchor="w" if col in ("Kind", "Operation") else "e",
+                  stretch=col == "Operation")
+    scroll = ttk.Scrollbar(frame, orient="vertical", command=tv.yview)
+    tv.configure(yscrollcommand=scroll.set)
+    tv.pack(side="left", fill="both", expand=True)
+    scroll.pack(side="right", fill="y")
+    view = RowView(tv)   # keeps the selection and scroll position across refreshes
+
+    def refresh():
+        if not win.winfo_exists():
+            return
+        view.sync([
+            (f"{kind} {name}", kind, name, count,
+             f"{p50:.1f}", f"{p95:.1f}", f"{p99:.1f}", f"{top:.1f}", f"{rows:.0f}")
+            for kind, name, count, p50, p95, p99, top, rows in diagnostics.stats()
+        ])
+        win.after(DIAGNOSTICS_REFRESH_MS, refresh)
+
+    def reset():
+        diagnostics.reset()
+        view.sync([])
+
+    def open_log():
+        if os.path.exists(diagnostics.LOG_FILE):
+            os.startfile(os.path.abspath(diagnostics.LOG_FILE))
+        else:
+            messagebox.showinfo("Diagnostics", "Nothing slow has been logged yet.", parent=win)
+
+    buttons = tk.Frame(win, bg=BG, pady=8)
+    buttons.pack(fill="x", padx=10)
+    ttk.Button(buttons, text="Reset", style="Secondary.TButton",
+               command=reset).pack(side="left", padx=4)
+    ttk.Button(buttons, text="Open Slow Log", style="Secondary.TButton",
+               command=open_log).pack(side="left", padx=4)
+
+    refresh()
+
+
+# ==========================================================
+#           CUSTOMER PANEL (AUTO OPEN)
+# ==========================================================
+
+def load_customer_entries(cid):
+    """First page of the customer's history; more loads as the panel scrolls."""
+    cust_pager.set_filter(*entries.customer_filter(cid))
+    refresh_customer_totals(cid)
+
+
+def refresh_customer_totals(cid=None):
+    """Panel totals come from the maintained per-customer summary."""
+    if cid is None:
+        if not v_customer_id.get().isdigit():
+            return
+        cid = int(v_customer_id.get())
+    totals = reports.customer_totals(conn, cid)
+    cust_total_qty.set(f"{totals.qty:.2f}")
+    cust_total_amt.set(f"{totals.amount:,.2f}")
+    cust_bill_count.set(str(totals.count))
+
+
+def refresh_customer_panel(new_ids=None):
+    """
+    Reload the open panel, or - given the ids of entries just written
+    for the customer already shown - only add those rows and re-read
+    the totals.
+    """
+    if customer_panel is None or not customer_panel.winfo_exists():
+        return
+    if not v_customer_id.get().isdigit():
+        return
+    cid = int(v_customer_id.get())
+    if new_ids is not None and cust_pager.params == [cid]:
+        cust_pager.add(new_ids)
+        refresh_customer_totals(cid)
+    else:
+        load_customer_entries(cid)
+
+def open_customer_panel():
+    global customer_panel, cust_tree, cust_pager
+
+    if not v_customer_id.get().isdigit():
+        return
+
+    if customer_panel is not None and customer_panel.winfo_exists():
+        customer_panel.lift()
+    else:
+        customer_panel = tk.Toplevel(root)
+        customer_panel.title("Customer Overview")
+        customer_panel.geometry("900x500")
+        customer_panel.configure(bg=BG)
+
+        # Header
+        tk.Label(
+            customer_panel,
+            text="Customer Overview",
+            bg=BG,
+            fg=ACCENT,
+            font=("Segoe UI", 14, "bold")
+        ).pack(pady=8)
+
+        # --------- CUSTOMER INFO BLOCK ----------
+        info_frame = tk.Frame(
+            customer_panel,
+            bg=CARD,
+            highlightbackground=BORDER,
+            highlightthickness=1,
+            padx=10,
+            pady=8
+        )
+        info_frame.pack(fill="x", padx=10, pady=5)
+
+        tk.Label(info_frame, text="Name:", bg=CARD, fg=MUTED,
+                 font=("Segoe UI", 9, "bold")).grid(row=0, column=0, sticky="w")
+        tk.Label(info_frame, textvariable=v_customer_name, bg=CARD, fg=TEXT,
+                 font=("Segoe UI", 10, "bold")).grid(row=0, column=1, sticky="w", padx=4)
+
+        tk.Label(info_frame, text="Mobile:", bg=CARD, fg=MUTED,
+                 font=("Segoe UI", 9, "bold")).grid(row=0, column=2, sticky="w")
+        tk.Label(info_frame, textvariable=v_customer_mobile, bg=CARD, fg=TEXT,
+                 font=("Segoe UI", 10)).grid(row=0, column=3, sticky="w", padx=4)
+
+        tk.Label(info_frame, text="Address:", bg=CARD, fg=MUTED,
+                 font=("Segoe UI", 9, "bold")).grid(row=1, column=0, sticky="w", pady=(4, 0))
+        tk.Label(
+            info_frame,
+            textvariable=v_customer_address,
+            bg=CARD,
+            fg=TEXT,
+            font=("Segoe UI", 10),
+            wraplength=400,
+            justify="left"
+        ).grid(row=1, column=1, columnspan=3, sticky="w", padx=4, pady=(4, 0))
+
+        # --------- SUMMARY BLOCK ----------
+        summary_frame = tk.Frame(
+            customer_panel,
+            bg=CARD,
+            highlightbackground=BORDER,
+            highlightthickness=1,
+            padx=10,
+            pady=8
+        )
+        summary_frame.pack(fill="x", padx=10, pady=5)
+
+        tk.Label(summary_frame, text="Total Bills:", bg=CARD, fg=MUTED,
+                 font=("Segoe UI", 9, "bold")).grid(row=0, column=0, sticky="w")
+        tk.Label(summary_frame, textvariable=cust_bill_count, bg=CARD, fg=TEXT,
+                 font=("Segoe UI", 11, "bold")).grid(row=1, column=0, sticky="w")
+
+        tk.Label(summary_frame, text="Total Quantity (Kg):", bg=CARD, fg=MUTED,
+                 font=("Segoe UI", 9, "bold")).grid(row=0, column=1, sticky="w", padx=20)
+        tk.Label(summary_frame, textvariable=cust_total_qty, bg=CARD, fg=TEXT,
+                 font=("Segoe UI", 11, "bold")).grid(row=1, column=1, sticky="w", padx=20)
+
+        tk.Label(summary_frame, text="Total Amount (₹):", bg=CARD, fg=MUTED,
+                 font=("Segoe UI", 9, "bold")).grid(row=0, column=2, sticky="w", padx=20)
+        tk.Label(summary_frame, textvariable=cust_total_amt, bg=CARD, fg=GREEN,
+                 font=("Segoe UI", 11, "bold")).grid(row=1, column=2, sticky="w", padx=20)
+
+        tk.Label(summary_frame, textvariable=cust_selection, bg=CARD, fg=MUTED,
+                 font=("Segoe UI", 9)).grid(row=2, column=0, columnspan=3, sticky="w", pady=(4, 0))
+
+        # --------- CUSTOMER ENTRIES TABLE ----------
+        table_frame = tk.Frame(customer_panel, bg=BG)
+        table_frame.pack(fill="both", expand=True, padx=10, pady=5)
+
+        cust_cols = (
+            "Date", "Vehicle", "Branch", "Type",
+            "Qty", "Rate", "Labour", "Advance", "PreTotal", "Total", "Note"
+        )
+
+        cust_tree_local = ttk.Treeview(
+            table_frame,
+            columns=cust_cols,
+            show="headings",
+            selectmode="extended"   # allow multi-select with Ctrl/Shift
+        )
+
+        # Ensure focus so Ctrl / Shift multi-selection works properly
+        cust_tree_local.bind("<Button-1>", lambda e: cust_tree_local.focus_set())
+
+        for col in cust_cols:
+            cust_tree_local.heading(col, text=col)
+
+            width = 90
+            if col in ("Vehicle", "Branch", "Type", "Note"):
+                width = 120
+
+            cust_tree_local.column(col, width=width, anchor="center")
+
+        cust_tree_local.pack(side="left", fill="both", expand=True)
+
+        scroll = ttk.Scrollbar(table_frame, orient="vertical", command=cust_tree_local.yview)
+        scroll.pack(side="right", fill="y")
+
+        # history is paged like the main ledger, minus the customer column
+        cust_pager = LedgerPager(cust_tree_local, scroll.set,
+                                 values=lambda r: (r[1],) + tuple(r[3:]))
+        cust_tree_local.configure(yscrollcommand=cust_pager.on_scroll)
+        cust_selected_total.set("0.00")
+        cust_selection.set("")
+        track_selection(cust_pager, cust_selection, cust_selected_total)
+
+        # --------- BOTTOM BUTTONS ----------
+        cp_bottom = tk.Frame(customer_panel, bg=BG, pady=10)
+        cp_bottom.pack(fill="x")
+
+        tk.Label(cp_bottom, text="Selected: ₹", bg=BG, fg=TEXT,
+                 font=("Segoe UI", 10, "bold")).pack(side="left", padx=(5, 0))
+        tk.Label(cp_bottom, textvariable=cust_selected_total, bg=BG, fg=GREEN,
+                 font=("Segoe UI", 12, "bold")).pack(side="left", padx=(2, 10))
+
+        ttk.Button(
+            cp_bottom,
+            text="Generate Invoice",
+            style="Primary.TButton",
+            command=lambda: generate_invoice(cust_tree_local)
+        ).pack(side="left", padx=5)
+
+        ttk.Button(
+    cp_bottom,
+    text="Delete Selected",
+    style="Secondary.TButton",
+    command=lambda: delete_entries(cust_tree_local)
+).pack(side="left", padx=5)
+
+        ttk.Button(
+            cp_bottom,
+            text="Open Invoice Folder",
+            style="Secondary.TButton",
+            command=open_invoice_folder
+        ).pack(side="left", padx=5)
+
+        ttk.Button(
+            cp_bottom,
+            text="Refresh Panel",
+            style="Secondary.TButton",
+            command=refresh_customer_panel
+        ).pack(side="right", padx=5)
+
+        # store reference globally so refresh_customer_panel can use it
+        cust_tree = cust_tree_local
+
+    # finally, load data for this customer into the panel
+    load_customer_entries(int(v_customer_id.get()))
+
+
+
+# ==========================================================
+#                    UI LAYOUT
+# ==========================================================
+
+# ---- MENU ----
+menubar = tk.Menu(root)
+data_menu = tk.Menu(menubar, tearoff=0)
+data_menu.add_command(label="Import Entries…", command=import_entries)
+data_menu.add_command(label="Export…", command=export_dialog)
+menubar.add_cascade(label="Data", menu=data_menu)
+invoice_menu = tk.Menu(menubar, tearoff=0)
+invoice_menu.add_command(label="Batch Invoices…", command=batch_invoice_dialog)
+invoice_menu.add_command(label="Reprint Invoice…", command=reprint_invoice)
+invoice_menu.add_command(label="Open Invoices Folder", command=open_invoice_folder)
+menubar.add_cascade(label="Invoices", menu=invoice_menu)
+report_menu = tk.Menu(menubar, tearoff=0)
+report_menu.add_command(label="Trends…", command=trends_dialog)
+menubar.add_cascade(label="Reports", menu=report_menu)
+help_menu = tk.Menu(menubar, tearoff=0)
+help_menu.add_command(label="Diagnostics…", command=diagnostics_dialog)
+menubar.add_cascade(label="Help", menu=help_menu)
+root.config(menu=menubar)
+
+# ---- TITLE ----
+title = tk.Label(
+    root,
+    text="MS TRADERS – Corporate Silver Billing Suite",
+    bg=BG,
+    fg=ACCENT,
+    font=("Segoe UI", 18, "bold")
+)
+title.pack(pady=10)
+
+# ---- CUSTOMER + BILL INFO BAR (P2 Layout) ----
+top_frame = tk.Frame(root, bg=CARD, bd=0,
+                     highlightbackground=BORDER, highlightthickness=1,
+                     padx=12, pady=10)
+top_frame.pack(fill="x", padx=15)
+
+tk.Label(top_frame, text="Customer ID:", bg=CARD, fg=MUTED,
+         font=("Segoe UI", 9, "bold")).grid(row=0, column=0, sticky="w")
+lbl_id = tk.Label(top_frame, textvariable=v_customer_id, bg=CARD, fg=TEXT,
+                  width=6, anchor="w", font=("Segoe UI", 10, "bold"))
+lbl_id.grid(row=0, column=1, padx=(2, 12))
+
+tk.Label(top_frame, text="Name:", bg=CARD, fg=MUTED,
+         font=("Segoe UI", 9, "bold")).grid(row=0, column=2, sticky="w")
+name_entry = entry(top_frame, v_customer_name, 18)
+name_entry.grid(row=0, column=3, padx=4)
+CustomerAutocomplete(name_entry, v_customer_name)
+
+tk.Label(top_frame, text="Mobile:", bg=CARD, fg=MUTED,
+         font=("Segoe UI", 9, "bold")).grid(row=0, column=4, sticky="w")
+mobile_entry = entry(top_frame, v_customer_mobile, 14)
+mobile_entry.grid(row=0, column=5, padx=4)
+CustomerAutocomplete(mobile_entry, v_customer_mobile)
+
+tk.Label(top_frame, text="Address:", bg=CARD, fg=MUTED,
+         font=("Segoe UI", 9, "bold")).grid(row=0, column=6, sticky="w")
+entry(top_frame, v_customer_address, 25).grid(row=0, column=7, padx=4)
+
+tk.Label(top_frame, text="Date:", bg=CARD, fg=MUTED,
+         font=("Segoe UI", 9, "bold")).grid(row=0, column=8, sticky="w")
+# a plain entry until the window is up; attach_date_picker() then swaps in
+# the tkcalendar DateEntry, keeping tkcalendar (and Babel) off the startup path
+date_picker = entry(top_frame, v_date, 12)
+date_picker.grid(row=0, column=9, padx=4)
+
+# second row: vehicle, branch, type + customer buttons
+tk.Label(top_frame, text="Vehicle:", bg=CARD, fg=MUTED,
+         font=("Segoe UI", 9, "bold")).grid(row=1, column=0, sticky="w", pady=(6, 0))
+entry(top_frame, v_vehicle, 14).grid(row=1, column=1, padx=4, pady=(6, 0))
+
+tk.Label(top_frame, text="Branch:", bg=CARD, fg=MUTED,
+         font=("Segoe UI", 9, "bold")).grid(row=1, column=2, sticky="w", pady=(6, 0))
+entry(top_frame, v_branch, 18).grid(row=1, column=3, padx=4, pady=(6, 0))
+
+tk.Label(top_frame, text="Type:", bg=CARD, fg=MUTED,
+         font=("Segoe UI", 9, "bold")).grid(row=1, column=4, sticky="w", pady=(6, 0))
+entry(top_frame, v_type, 14).grid(row=1, column=5, padx=4, pady=(6, 0))
+
+ttk.Button(
+    top_frame,
+    text="Save/Select Customer",
+    style="Primary.TButton",
+    command=save_customer
+).grid(row=1, column=7, padx=6, pady=(6, 0), sticky="e")
+
+ttk.Button(
+    top_frame,
+    text="Choose Existing",
+    style="Secondary.TButton",
+    command=choose_customer_popup
+).grid(row=1, column=8, padx=4, pady=(6, 0), sticky="w")
+
+# ---- LINE ITEM FRAME ----
+item_frame = tk.Frame(root, bg=CARD, bd=0,
+                      highlightbackground=BORDER, highlightthickness=1,
+                      padx=12, pady=8)
+item_frame.pack(fill="x", padx=15, pady=8)
+
+
+def ilabel(txt, c):
+    tk.Label(item_frame, text=txt, bg=CARD, fg=MUTED,
+             font=("Segoe UI", 9, "bold")).grid(row=0, column=c, sticky="w")
+
+
+ilabel("Quantity (Kg)", 0)
+entry(item_frame, v_qty, 10).grid(row=1, column=0, padx=4)
+
+ilabel("Rate", 1)
+entry(item_frame, v_rate, 10).grid(row=1, column=1, padx=4)
+
+ilabel("Labour / Kg", 2)
+entry(item_frame, v_labour, 10).grid(row=1, column=2, padx=4)
+
+ilabel("Advance", 3)
+entry(item_frame, v_advance, 10).grid(row=1, column=3, padx=4)
+
+ilabel("Calc Mode", 4)
+calc_combo = ttk.Combobox(
+    item_frame,
+    textvariable=v_calc_mode,
+    values=list(entries.CALC_MODES),
+    state="readonly",
+    width=25
+)
+calc_combo.grid(row=1, column=4, padx=4)
+
+ilabel("Note", 5)
+entry(item_frame, v_note, 25).grid(row=1, column=5, padx=4)
+
+ttk.Button(
+    item_frame,
+    text="Add Line",
+    style="Primary.TButton",
+    command=add_item
+).grid(row=1, column=6, padx=10)
+
+tk.Checkbutton(
+    item_frame,
+    text="Draft Bill",
+    variable=v_draft_mode,
+    command=toggle_draft_mode,
+    bg=CARD,
+    fg=TEXT,
+    activebackground=CARD,
+    font=("Segoe UI", 9, "bold")
+).grid(row=1, column=7, padx=4)
+
+ttk.Button(
+    item_frame,
+    text="Finalize Bill",
+    style="Primary.TButton",
+    command=finalize_draft
+).grid(row=1, column=8, padx=4)
+
+ttk.Button(
+    item_frame,
+    text="Discard Draft",
+    style="Secondary.TButton",
+    command=discard_draft
+).grid(row=1, column=9, padx=4)
+
+tk.Label(item_frame, textvariable=draft_status, bg=CARD, fg=ACCENT,
+         font=("Segoe UI", 9, "bold")).grid(row=2, column=7, columnspan=3, sticky="w")
+
+# ---- SEARCH / FILTER FRAME ----
+search_frame = tk.Frame(root, bg=CARD, bd=0,
+                        highlightbackground=BORDER, highlightthickness=1,
+                        padx=12, pady=8)
+search_frame.pack(fill="x", padx=15, pady=4)
+
+tk.Label(search_frame, text="Filter Date:", bg=CARD, fg=MUTED,
+         font=("Segoe UI", 9, "bold")).grid(row=0, column=0, sticky="w")
+entry(search_frame, search_date, 12).grid(row=0, column=1, padx=4)
+
+tk.Label(search_frame, text="Vehicle:", bg=CARD, fg=MUTED,
+         font=("Segoe UI", 9, "bold")).grid(row=0, column=2, sticky="w")
+entry(search_frame, search_vehicle, 12).grid(row=0, column=3, padx=4)
+
+tk.Label(search_frame, text="Branch:", bg=CARD, fg=MUTED,
+         font=("Segoe UI", 9, "bold")).grid(row=0, column=4, sticky="w")
+entry(search_frame, search_branch, 12).grid(row=0, column=5, padx=4)
+
+tk.Label(search_frame, text="Find:", bg=CARD, fg=MUTED,
+         font=("Segoe UI", 9, "bold")).grid(row=0, column=6, sticky="w")
+entry(search_frame, search_text, 22).grid(row=0, column=7, padx=4)
+
+# results follow the filters as they are typed
+for var in (search_date, search_vehicle, search_branch, search_text):
+    var.trace_add("write", schedule_search)
+
+ttk.Button(
+    search_frame,
+    text="Search",
+    style="Secondary.TButton",
+    command=search_entries
+).grid(row=0, column=8, padx=6)
+
+ttk.Button(
+    search_frame,
+    text="Show All",
+    style="Secondary.TButton",
+    command=show_all_entries
+).grid(row=0, column=9, padx=4)
+
+# ---- STATUS BAR (background work, selection) ----
+status_bar = tk.Frame(root, bg=BG)
+status_bar.pack(side="bottom", fill="x", padx=15)
+tk.Label(status_bar, textvariable=busy_text, bg=BG, fg=MUTED, anchor="w",
+         font=("Segoe UI", 9)).pack(side="left")
+tk.Label(status_bar, textvariable=selection_summary, bg=BG, fg=MUTED, anchor="e",
+         font=("Segoe UI", 9)).pack(side="right")
+
+# ---- TREEVIEW (ITEM LIST) ----
+tree_frame = tk.Frame(root, bg=BG)
+tree_frame.pack(fill="both", expand=True, padx=15, pady=6)
+
+columns = (
+    "Date", "Customer", "Vehicle", "Branch", "Type",
+    "Qty", "Rate", "Labour", "Advance", "PreTotal", "Total", "Note"
+)
+
+tree = ttk.Treeview(tree_frame, columns=columns, show="headings", selectmode="extended")
+
+# 👇 IMPORTANT: give focus to tree so Ctrl/Shift selection works
+tree.bind("<Button-1>", lambda e: tree.focus_set())
+
+for col in columns:
+    tree.heading(col, text=col)
+    width = 100
+    if col in ("Date", "Qty", "Rate", "Labour", "Advance", "PreTotal", "Total"):
+        width = 90
+    if col in ("Customer", "Note", "Branch"):
+        width = 140
+    tree.column(col, width=width, anchor="center")
+tree.pack(side="left", fill="both", expand=True)
+
+scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=tree.yview)
+scrollbar.pack(side="right", fill="y")
+
+# paged ledger: fetches more rows as the scrollbar nears either edge
+ledger = LedgerPager(tree, scrollbar.set)
+tree.configure(yscrollcommand=ledger.on_scroll)
+track_selection(ledger, selection_summary, grand_total)
+
+# ---- BOTTOM BAR ----
+bottom = tk.Frame(root, bg=BG)
+bottom.pack(fill="x", padx=15, pady=10)
+
+tk.Label(
+    bottom,
+    text="Grand Total: ₹",
+    bg=BG,
+    fg=TEXT,
+    font=("Segoe UI", 10, "bold")
+).pack(side="left")
+
+tk.Label(
+    bottom,
+    textvariable=grand_total,
+    bg=BG,
+    fg=GREEN,
+    font=("Segoe UI", 13, "bold")
+).pack(side="left", padx=4)
+
+ttk.Button(
+    bottom,
+    text="Generate Invoice",
+    style="Primary.TButton",
+    command=lambda: generate_invoice(tree)
+).pack(side="left", padx=12)
+ttk.Button(
+    bottom,
+    text="Delete Selected",
+    style="Secondary.TButton",
+    command=lambda: delete_entries(tree)
+).pack(side="left", padx=6)
+
+
+ttk.Button(
+    bottom,
+    text="Open Invoices Folder",
+    style="Secondary.TButton",
+    command=open_invoice_folder
+).pack(side="left", padx=4)
+
+# reports block
+report_frame = tk.Frame(bottom, bg=BG)
+report_frame.pack(side="right", padx=4)
+
+tk.Label(
+    report_frame,
+    text="Report Date:",
+    bg=BG,
+    fg=MUTED,
+    font=("Segoe UI", 8, "bold")
+).grid(row=0, column=0, padx=4)
+
+entry(report_frame, report_date, 10).grid(row=0, column=1, padx=2)
+
+ttk.Button(
+    report_frame,
+    text="Daily",
+    style="Secondary.TButton",
+    command=daily_report
+).grid(row=0, column=2, padx=2)
+
+ttk.Button(
+    report_frame,
+    text="Weekly",
+    style="Secondary.TButton",
+    command=weekly_report
+).grid(row=0, column=3, padx=2)
+
+ttk.Button(
+    report_frame,
+    text="Monthly",
+    style="Secondary.TButton",
+    command=monthly_report
+).grid(row=0, column=4, padx=2)
+
+tk.Label(
+    report_frame,
+    text="To:",
+    bg=BG,
+    fg=MUTED,
+    font=("Segoe UI", 8, "bold")
+).grid(row=1, column=0, padx=4, sticky="e")
+
+entry(report_frame, report_to_date, 10).grid(row=1, column=1, padx=2)
+
+ttk.Button(
+    report_frame,
+    text="Quarterly",
+    style="Secondary.TButton",
+    command=quarterly_report
+).grid(row=1, column=2, padx=2, pady=(2, 0))
+
+ttk.Button(
+    report_frame,
+    text="FY",
+    style="Secondary.TButton",
+    command=financial_year_report
+).grid(row=1, column=3, padx=2, pady=(2, 0))
+
+ttk.Button(
+    report_frame,
+    text="Range",
+    style="Secondary.TButton",
+    command=date_range_report
+).grid(row=1, column=4, padx=2, pady=(2, 0))
+
+# ==========================================================
+#      INITIAL LOAD & MAINLOOP
+# ==========================================================
+
+PREWARM_MS = 3000   # idle time after startup before ReportLab is imported in the background
+
+
+def attach_date_picker():
+    global date_picker
+    from tkcalendar import DateEntry
+
+    try:
+        day = date.fromisoformat(v_date.get().strip())
+    except ValueError:
+        day = date.today()
+    picker = DateEntry(
+        top_frame,
+        textvariable=v_date,
+        date_pattern="yyyy-mm-dd",
+        year=day.year, month=day.month, day=day.day,   # keep what was typed meanwhile
+        background=ACCENT,
+        foreground="white",
+        borderwidth=0,
+        width=12
+    )
+    picker.grid(row=0, column=9, padx=4)
+    date_picker.destroy()
+    date_picker = picker
+
+
+def prewarm():
+    """Import the invoice renderer while idle so the first invoice doesn't wait for it."""
+    # a bare thread, not a task: it shouldn't show as work in the status bar
+    threading.Thread(target=importlib.import_module, args=("billing.invoices",),
+                     daemon=True).start()
+
+
+def first_load():
+    root.update_idletasks()   # finish drawing the empty window first
+    with startup.phase("first ledger page"):
+        load_all_entries()
+        root.update_idletasks()
+    with startup.phase("date picker (tkcalendar)"):
+        attach_date_picker()
+    startup.finish()
+    root.after(PREWARM_MS, prewarm)
+
+
+def window_shown(event):
+    """The main window's first <Map>: the ledger loads once it is visible."""
+    if event.widget is not root:
+        return   # a toplevel's bindings also see its children's events
+    root.unbind("<Map>")
+    startup.mark("window mapped")
+    root.after_idle(first_load)
+
+
+def run():
+    startup.mark("widgets built")
+    root.bind("<Map>", window_shown)
+    poll_background()
+    root.protocol("WM_DELETE_WINDOW", on_close)
+    root.mainloop()  
\ No newline at end of file
@@ -0,0 +1 @@
+"""Performance benchmarks for the billing core. Run from src/ with `python -m benchmarks.<name>`."""
@@ -0,0 +1,129 @@
+"""
+Query times before/after the v2 lookup indexes.
+
+    python -m benchmarks.bench_indexes --sizes 10000 100000 1000000
+
+For each size a throw-away database is filled at schema v1 (no
+secondary indexes), the app's hot queries are timed, then the database
+is migrated to the current schema and the same queries are timed again.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+
+from billing import db
+
+BRANCHES = ["Saki Naka", "Kurla", "Andheri", "Bhiwandi", "Thane", "Vashi"]
+TYPES = ["Bran", "Husk", "Cake", "Chuni", "Mixed"]
+
+QUERIES = {
+    "ledger first page": ("""
+        SELECT e.id, e.date, COALESCE(c.name, ''), e.vehicle, e.branch, e.type,
+               e.qty, e.rate, e.labour, e.advance, e.pre, e.total, e.note
+        FROM entries e LEFT JOIN customers c ON e.customer_id = c.id
+        ORDER BY e.date DESC, e.id DESC LIMIT 201
+    """, lambda p: ()),
+    "customer entries": ("""
+        SELECT date, vehicle, branch, type, qty, rate, labour, advance, pre, total, note
+        FROM entries WHERE customer_id = ? ORDER BY date DESC, id DESC
+    """, lambda p: (p["customer_id"],)),
+    "daily report": ("""
+        SELECT COUNT(*), COALESCE(SUM(qty),0), COALESCE(SUM(total),0)
+        FROM entries WHERE date = ?
+    """, lambda p: (p["day"],)),
+    "search by date": ("""
+        SELECT e.id FROM entries e WHERE e.date = ? ORDER BY e.date DESC, e.id DESC
+    """, lambda p: (p["day"],)),
+    "customer lookup": ("""
+        SELECT id FROM customers WHERE name = ? AND mobile = ?
+    """, lambda p: (p["name"], p["mobile"])),
+}
+
+
+def fill(conn, n_entries, n_customers, days=3 * 365, seed=7):
+    rnd = random.Random(seed)
+    start = date.today() - timedelta(days=days)
+    conn.executemany(
+        "INSERT INTO customers (name, mobile, address) VALUES (?,?,?)",
+        ((f"Customer {i}", f"9{i:09d}", f"Shop {i}, Mumbai") for i in range(n_customers)),
+    )
+
+    def rows():
+        for _ in range(n_entries):
+            qty = round(rnd.uniform(100, 5000), 2)
+            rate = round(rnd.uniform(10, 40), 2)
+            labour = rnd.choice((0.0, 0.5, 1.0))
+            pre = rate * qty + labour * qty
+            yield (
+                str(start + timedelta(days=rnd.randrange(days))),
+                rnd.randint(1, n_customers),
+                f"MH{rnd.randint(1, 48):02d}AB{rnd.randint(1000, 9999)}",
+                rnd.choice(BRANCHES), rnd.choice(TYPES),
+                qty, rate, labour, 0.0, pre, pre, "",
+            )
+
+    conn.executemany("""
+        INSERT INTO entries (date, customer_id, vehicle, branch, type,
+                             qty, rate, labour, advance, pre, total, note)
+        VALUES (?,?,?,?,?,?,?,?,?,?,?,?)
+    """, rows())
+    conn.commit()
+
+
+def time_query(conn, sql, params, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def run_size(n, repeat):
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(path)
+        db.migrate(conn, target=1)
+        n_customers = max(10, n // 100)
+        fill(conn, n, n_customers)
+
+        params = {
+            "customer_id": n_customers // 2,
+            "day": conn.execute("SELECT date FROM entries WHERE id = ?", (n // 2,)).fetchone()[0],
+            "name": f"Customer {n_customers - 1}",
+            "mobile": f"9{n_customers - 1:09d}",
+        }
+        before = {k: time_query(conn, q, f(params), repeat) for k, (q, f) in QUERIES.items()}
+
+        t0 = time.perf_counter()
+        db.migrate(conn)
+        migrate_s = time.perf_counter() - t0
+        after = {k: time_query(conn, q, f(params), repeat) for k, (q, f) in QUERIES.items()}
+        conn.close()
+    finally:
+        os.remove(path)
+    return before, after, migrate_s
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    for n in args.sizes:
+        before, after, migrate_s = run_size(n, args.repeat)
+        print(f"\n{n:,} entries  (migration to v{db.SCHEMA_VERSION}: {migrate_s:.2f}s)")
+        print(f"  {'query':<20}{'v1 ms':>12}{'indexed ms':>12}{'speedup':>10}")
+        for k in QUERIES:
+            b, a = before[k], after[k]
+            print(f"  {k:<20}{b:>12.2f}{a:>12.2f}{b / a if a else 0:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Invoice rendering throughput with and without the cached template.
+
+    python -m benchmarks.bench_invoices --invoices 200 --lines 20
+
+Renders the same invoices into a temporary folder three ways: the old
+path (ASCII85-encoded image streams and everything rebuilt per invoice),
+a fresh InvoiceTemplate per invoice with binary streams, and a single
+cached template. Without --logo a 600x340 JPEG is generated so the logo
+cost is included.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from reportlab import rl_config
+
+from billing.invoices import Invoice, InvoiceTemplate, render_invoice
+
+
+def make_invoices(n, lines):
+    return [
+        Invoice(
+            number=f"BENCH-{i:05d}", customer_name=f"Customer {i}",
+            customer_mobile="9000000000", customer_address="Shop 1, Mumbai",
+            date="2025-01-15", vehicle="MH04AB1234", branch="Kurla", type="Bran",
+            lines=[(100.0 + j, 22.5, 0.5, 0.0, 2300.0, 2350.0, f"slip {j}") for j in range(lines)],
+        )
+        for i in range(n)
+    ]
+
+
+def make_logo(folder):
+    from PIL import Image   # Pillow ships with ReportLab's image support
+
+    path = os.path.join(folder, "logo.jpeg")
+    img = Image.new("RGB", (600, 340), "white")
+    for x in range(0, 600, 4):
+        for y in range(0, 340, 4):
+            img.putpixel((x, y), (x % 256, y % 256, (x + y) % 256))
+    img.save(path, quality=90)
+    return path
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--invoices", type=int, default=200)
+    ap.add_argument("--lines", type=int, default=20)
+    ap.add_argument("--logo", help="logo to use instead of a generated one")
+    args = ap.parse_args()
+
+    folder = tempfile.mkdtemp(prefix="bench_invoices_")
+    try:
+        logo = args.logo or make_logo(folder)
+        batch = make_invoices(args.invoices, args.lines)
+        shared = InvoiceTemplate(logo)
+        modes = (
+            ("before (ASCII85, per invoice)", 1, lambda: InvoiceTemplate(logo)),
+            ("new template per invoice", 0, lambda: InvoiceTemplate(logo)),
+            ("cached template", 0, lambda: shared),
+        )
+        print(f"{args.invoices} invoices x {args.lines} lines")
+        for label, a85, template in modes:
+            rl_config.useA85 = a85
+            t0 = time.perf_counter()
+            for inv in batch:
+                render_invoice(inv, os.path.join(folder, f"{inv.number}.pdf"), template())
+            elapsed = time.perf_counter() - t0
+            print(f"  {label:<32}{elapsed * 1000:>9.0f} ms{args.invoices / elapsed:>9.1f} invoices/s")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
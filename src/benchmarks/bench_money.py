@@ -0,0 +1,107 @@
+"""
+Aggregate speed and accuracy: REAL rupees (v6) against integer paise (v7).
+
+    python -m benchmarks.bench_money --sizes 100000 1000000
+
+For each size a throw-away database is filled at schema v6, where qty
+and the amounts are REAL, and the report aggregates are timed. It is
+then migrated to integer grams / paise (migration 7) and the same
+queries are timed again. The drift columns show how far each REAL
+grand total was from the exact one: the sum of the same lines rounded
+to the paisa.
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+from benchmarks.bench_indexes import fill, time_query
+from billing import db, money
+
+QUERIES = {
+    "grand total": "SELECT COUNT(*), SUM(qty), SUM(total) FROM entries",
+    "by month": """
+        SELECT substr(date, 1, 7), COUNT(*), SUM(qty), SUM(total)
+        FROM entries GROUP BY 1
+    """,
+    "by customer": """
+        SELECT customer_id, COUNT(*), SUM(qty), SUM(total)
+        FROM entries GROUP BY customer_id
+    """,
+    "fy range": """
+        SELECT COUNT(*), SUM(qty), SUM(total) FROM entries
+        WHERE date BETWEEN date('now', '-1 year') AND date('now')
+    """,
+}
+SUMMARY_QUERY = "SELECT SUM(bills), SUM(qty), SUM(amount) FROM summary_monthly"
+
+
+def time_python_sum(conn, repeat):
+    """Fetching every total and adding them up in Python, as a report loop would."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        sum(r[0] for r in conn.execute("SELECT total FROM entries"))
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def run_size(n, repeat):
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(path)
+        db.migrate(conn, target=6)
+        fill(conn, n, max(10, n // 100))
+
+        def timings():
+            t = {k: time_query(conn, q, (), repeat) for k, q in QUERIES.items()}
+            t["python sum"] = time_python_sum(conn, repeat)
+            return t
+
+        before = timings()
+        conn.create_function("paise", 1, money.paise, deterministic=True)
+        conn.create_function("grams", 1, money.grams, deterministic=True)
+        real_qty, real_total, exact_qty, exact_total = conn.execute(
+            "SELECT SUM(qty), SUM(total), SUM(grams(qty)), SUM(paise(total)) FROM entries"
+        ).fetchone()
+
+        t0 = time.perf_counter()
+        db.migrate(conn)
+        migrate_s = time.perf_counter() - t0
+        after = timings()
+        qty, total = conn.execute("SELECT SUM(qty), SUM(total) FROM entries").fetchone()
+        summary = conn.execute(SUMMARY_QUERY).fetchone()
+        conn.close()
+    finally:
+        os.remove(path)
+
+    assert (qty, total) == (exact_qty, exact_total), "integer sums differ from the rounded lines"
+    assert summary[1:] == (qty, total), "summary_monthly differs from entries"
+    drift = {
+        "qty (g)": abs(round(real_qty * money.Qty.SCALE) - qty),
+        "total (paise)": abs(round(real_total * money.Money.SCALE) - total),
+    }
+    return before, after, migrate_s, drift
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    for n in args.sizes:
+        before, after, migrate_s, drift = run_size(n, args.repeat)
+        print(f"\n{n:,} entries  (migration 7: {migrate_s:.2f}s)")
+        print(f"  {'aggregate':<14}{'REAL ms':>10}{'INTEGER ms':>12}{'speedup':>10}")
+        for k, b in before.items():
+            a = after[k]
+            print(f"  {k:<14}{b:>10.2f}{a:>12.2f}{b / a if a else 0:>9.2f}x")
+        print("  REAL grand total drift from exact: "
+              + ", ".join(f"{k} {v:,}" for k, v in drift.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Treeview refresh cost: clear-and-reload vs the RowView diff.
+
+    python -m benchmarks.bench_tree --rows 50000
+    python -m benchmarks.bench_tree --rows 50000 --headless
+
+Fills a hidden ttk.Treeview with `rows` ledger-shaped rows, then times
+common refreshes two ways: deleting every row and inserting the new
+list, and RowView.sync() applying only the difference. Each timing
+includes update_idletasks() so Tk's redraw is counted. Needs a display.
+
+--headless runs the diff against a stand-in tree that only counts the
+widget calls, so it shows RowView's own cost and how many calls it
+makes without a display.
+"""
+import argparse
+import random
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from billing.viewmodel import RowView
+
+COLUMNS = ("Date", "Customer", "Vehicle", "Branch", "Type",
+           "Qty", "Rate", "Labour", "Advance", "PreTotal", "Total", "Note")
+
+
+def make_rows(n, start=0):
+    return [
+        (i, "2025-01-15", f"Customer {i % 500}", f"MH04AB{i % 10000:04d}", "Kurla", "Bran",
+         100.0, 22.5, 0.5, 0.0, 2300.0, 2300.0, "")
+        for i in range(start + n, start, -1)
+    ]
+
+
+def changes(rows):
+    """(label, new row list) pairs for the refreshes being compared."""
+    n = len(rows)
+    newest = rows[0][0]
+    edited = [r[:11] + (r[11] + 1,) + r[12:] if i % 100 == 0 else r
+              for i, r in enumerate(rows)]
+    doomed = set(random.sample(range(n), min(500, n)))
+    return (
+        ("unchanged", rows),
+        ("1 new row on top", [make_rows(1, newest)[0]] + rows[:-1]),
+        ("500 rows deleted", [r for i, r in enumerate(rows) if i not in doomed]),
+        ("1% of rows edited", edited),
+        ("first and last swapped", rows[-1:] + rows[1:-1] + rows[:1] if n > 1 else rows),
+        ("all rows reversed", rows[::-1]),
+        ("all rows shuffled", random.sample(rows, n)),
+        ("all rows replaced", make_rows(n, newest + n)),
+    )
+
+
+def reload(tree, rows):
+    tree.delete(*tree.get_children())
+    for r in rows:
+        tree.insert("", tk.END, iid=str(r[0]), values=r[1:])
+
+
+def timed(root, fn):
+    t0 = time.perf_counter()
+    fn()
+    root.update_idletasks()
+    return time.perf_counter() - t0
+
+
+class CountingTree:
+    """The Treeview calls RowView makes, counted and otherwise ignored."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_children(self):
+        return ()
+
+    def _call(self, *args, **kwargs):
+        self.calls += 1
+
+    insert = delete = item = move = _call
+
+
+def headless(rows):
+    random.seed(7)
+    base = make_rows(rows)
+    print(f"{rows:,} rows, stand-in tree{'diff':>17}{'calls':>9}")
+    for label, new in changes(base):
+        tree = CountingTree()
+        view = RowView(tree)
+        view.sync(base)
+        tree.calls = 0
+        t0 = time.perf_counter()
+        view.sync(new)
+        print(f"  {label:<24}{(time.perf_counter() - t0) * 1000:>13.1f} ms{tree.calls:>9,}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--rows", type=int, default=50000)
+    ap.add_argument("--headless", action="store_true", help="time the diff without Tk")
+    args = ap.parse_args()
+    if args.headless:
+        headless(args.rows)
+        return
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as exc:
+        raise SystemExit(f"needs a display: {exc}")
+    root.withdraw()
+    tree = ttk.Treeview(root, columns=COLUMNS, show="headings")
+    tree.pack()
+
+    random.seed(7)
+    base = make_rows(args.rows)
+    print(f"{args.rows:,} visible rows{'reload':>22}{'diff':>12}")
+    for label, new in changes(base):
+        reload(tree, base)
+        full = timed(root, lambda: reload(tree, new))
+
+        tree.delete(*tree.get_children())
+        view = RowView(tree)
+        view.sync(base)
+        diff = timed(root, lambda: view.sync(new))
+        print(f"  {label:<24}{full * 1000:>11.1f} ms{diff * 1000:>9.1f} ms")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
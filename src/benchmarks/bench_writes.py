@@ -0,0 +1,81 @@
+"""
+Insert throughput for the add-item path.
+
+    python -m benchmarks.bench_writes --items 1000
+
+Writes the same line items into a fresh on-disk database three ways:
+the old path (rollback journal, synchronous=FULL, commit per line),
+WAL + synchronous=NORMAL with a commit per line, and a DraftBill
+finalized in one transaction.
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+from billing import db
+from billing.entries import CALC_MODES, DraftBill, insert_entry, make_entry
+
+
+def make_rows(n):
+    return [
+        make_entry("2025-01-15", 1, "MH04AB1234", "Saki Naka", "Bran",
+                   100 + i, "22.50", "0.50", 0, CALC_MODES[0], f"slip {i}")
+        for i in range(n)
+    ]
+
+
+def fresh_db(journal_mode, synchronous):
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    conn = sqlite3.connect(path)
+    conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+    conn.execute(f"PRAGMA synchronous = {synchronous}")
+    db.migrate(conn)
+    return conn, path
+
+
+def per_line(conn, rows):
+    for row in rows:
+        insert_entry(conn, row)
+        conn.commit()
+
+
+def drafted(conn, rows):
+    draft = DraftBill()
+    for row in rows:
+        draft.add(row)
+    draft.finalize(conn)
+
+
+MODES = (
+    ("commit per line (DELETE journal, FULL)", "DELETE", "FULL", per_line),
+    ("commit per line (WAL, NORMAL)", "WAL", "NORMAL", per_line),
+    ("draft bill, one transaction (WAL, NORMAL)", "WAL", "NORMAL", drafted),
+)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--items", type=int, default=1000)
+    args = ap.parse_args()
+    rows = make_rows(args.items)
+
+    print(f"{args.items} line items")
+    for label, journal, sync, write in MODES:
+        conn, path = fresh_db(journal, sync)
+        try:
+            t0 = time.perf_counter()
+            write(conn, rows)
+            elapsed = time.perf_counter() - t0
+        finally:
+            conn.close()
+            for suffix in ("", "-wal", "-shm", "-journal"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+        print(f"  {label:<44}{elapsed * 1000:>9.1f} ms{args.items / elapsed:>11,.0f} items/s")
+
+
+if __name__ == "__main__":
+    main()
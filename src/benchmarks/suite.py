@@ -0,0 +1,389 @@
+"""
+Benchmark suite for the app's hot paths, headless, with JSON results.
+
+    python -m benchmarks.suite                              # 100k entries
+    python -m benchmarks.suite --entries 1000000 --out results.json
+    python -m benchmarks.suite --save-baseline baseline.json
+    python -m benchmarks.suite --baseline baseline.json --check
+
+Each case calls the same billing functions as the GUI action it is
+named after (add_item, load_all_entries, search_entries, daily_report,
+...). The cases run against a synthetic database from
+benchmarks.synth. It is generated once per spec into --data-dir and
+copied for every run, so cases that write never change the cached file.
+The spec has a fixed end date, so the same arguments give the same
+data on every machine.
+
+Every case runs once to warm up and then --repeat times. Results record
+the median, min and max time per run and per operation, together with
+the machine, Python and SQLite versions, the git commit and the spec.
+With --baseline each case is compared with the saved median. A case
+that is more than --threshold slower counts as a regression, and
+--check turns any regression into exit status 1.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+
+from benchmarks import synth
+from billing import db, entries, reports, search
+from billing.entries import CALC_MODES, DraftBill, make_entry
+
+SUITE_END = "2025-03-31"   # last day of the synthetic data; keeps runs comparable
+DATA_DIR = "bench_data"
+PAGE_SIZE = 200            # app.LEDGER_PAGE_SIZE
+RANKED_LIMIT = 500         # app.SEARCH_RANKED_LIMIT
+
+
+@dataclass
+class Case:
+    name: str
+    run: object            # run(ctx, state), timed
+    ops: int = 1           # operations per run, for ms/op
+    prepare: object = None  # prepare(ctx) -> state, untimed, before every run
+    doc: str = ""
+
+
+CASES = {}
+
+
+def case(name, ops=1, prepare=None):
+    def register(fn):
+        CASES[name] = Case(name, fn, ops, prepare, (fn.__doc__ or "").strip())
+        return fn
+    return register
+
+
+class Context:
+    """The open database copy and a few values the cases look up once."""
+
+    def __init__(self, conn, folder):
+        self.conn = conn
+        self.folder = folder   # scratch space (invoice PDFs)
+        self.busiest, = conn.execute(
+            "SELECT customer_id FROM summary_customer ORDER BY bills DESC LIMIT 1"
+        ).fetchone()
+        self.vehicle, = conn.execute(
+            "SELECT vehicle FROM entries WHERE customer_id = ? LIMIT 1", (self.busiest,)
+        ).fetchone()
+
+
+def _line(ctx, i):
+    return make_entry(SUITE_END, ctx.busiest, ctx.vehicle, "Kurla", "Bran",
+                      f"{100 + i}.50", "22.50", "0.50", 0, CALC_MODES[0], f"bench {i}")
+
+
+# ==========================================================
+#                 CASES (one per GUI action)
+# ==========================================================
+
+ADD_ITEMS = 50
+
+
+@case("add_item", ops=ADD_ITEMS)
+def add_item(ctx, _):
+    """Add Line outside a draft: one committed INSERT per line (app.write_line)."""
+    for i in range(ADD_ITEMS):
+        with ctx.conn:
+            entries.insert_entry(ctx.conn, _line(ctx, i))
+
+
+@case("add_item_draft", ops=ADD_ITEMS)
+def add_item_draft(ctx, _):
+    """Draft bill of ADD_ITEMS lines, finalized in one transaction."""
+    bill = DraftBill()
+    for i in range(ADD_ITEMS):
+        bill.add(_line(ctx, i))
+    bill.finalize(ctx.conn)
+
+
+@case("load_all_entries")
+def load_all_entries(ctx, _):
+    """Newest ledger page, as on startup and Show All."""
+    entries.ledger_page(ctx.conn, limit=PAGE_SIZE)
+
+
+@case("ledger_scroll", ops=10)
+def ledger_scroll(ctx, _):
+    """Ten keyset pages down the ledger, as when scrolling."""
+    key = None
+    for _ in range(10):
+        rows, _more = entries.ledger_page(ctx.conn, key=key, limit=PAGE_SIZE)
+        key = (rows[-1][1], rows[-1][0])
+
+
+@case("search_entries")
+def search_entries(ctx, _):
+    """Vehicle + branch filter fields: FTS substring match, first page."""
+    where, params = search.ledger_filter(ctx.conn, vehicle=ctx.vehicle[-6:], branch="Kurla")
+    entries.ledger_page(ctx.conn, where, params, limit=PAGE_SIZE)
+
+
+@case("search_ranked")
+def search_ranked(ctx, _):
+    """The Find box: ranked free-text search."""
+    search.search(ctx.conn, "kurla bran", RANKED_LIMIT)
+
+
+@case("daily_report")
+def daily_report(ctx, _):
+    """Daily Report for the last day of the data."""
+    reports.period_report(ctx.conn, "day", SUITE_END)
+
+
+@case("monthly_report")
+def monthly_report(ctx, _):
+    """Monthly Report (summary tables)."""
+    reports.period_report(ctx.conn, "month", SUITE_END)
+
+
+@case("fy_report")
+def fy_report(ctx, _):
+    """Financial Year Report: whole months plus partial edges."""
+    reports.period_report(ctx.conn, "fy", SUITE_END)
+
+
+@case("load_customer_entries")
+def load_customer_entries(ctx, _):
+    """Customer panel for the busiest customer: first page and totals."""
+    entries.ledger_page(ctx.conn, *entries.customer_filter(ctx.busiest), limit=PAGE_SIZE)
+    reports.customer_totals(ctx.conn, ctx.busiest)
+
+
+DELETE_ROWS = 100
+
+
+def _insert_for_delete(ctx):
+    return entries.insert_entries(ctx.conn, [_line(ctx, i) for i in range(DELETE_ROWS)])
+
+
+@case("delete_entries", ops=DELETE_ROWS, prepare=_insert_for_delete)
+def delete_entries(ctx, ids):
+    """Delete DELETE_ROWS selected rows in one transaction."""
+    entries.delete_entries(ctx.conn, ids)
+
+
+@case("generate_invoice")
+def generate_invoice(ctx, _):
+    """Twenty lines of the busiest customer: read, number in the register, render the PDF."""
+    from billing import invoices   # ReportLab
+
+    rows, _more = entries.ledger_page(ctx.conn, *entries.customer_filter(ctx.busiest), limit=20)
+    invoice = invoices.Invoice(customer_id=ctx.busiest, customer_name=rows[0][2],
+                               date=SUITE_END, entry_ids=[r[0] for r in rows],
+                               lines=invoices.invoice_lines(rows))
+    invoices.issue_invoices(ctx.conn, [invoice], ctx.folder)
+    invoices.write_invoice(invoice, ctx.folder)
+
+
+@case("trends_refresh")
+def trends_refresh(ctx, _):
+    """Reports → Trends with the columnar snapshot already loaded."""
+    from billing import analytics   # NumPy
+
+    analytics.trends(ctx.conn, "2024-04-01", SUITE_END)
+
+
+def _forget_snapshot(ctx):
+    from billing import analytics
+
+    analytics.forget(ctx.conn)
+
+
+@case("trends_cold", prepare=_forget_snapshot)
+def trends_cold(ctx, _):
+    """Reports → Trends the first time: loads the columnar snapshot."""
+    trends_refresh(ctx, _)
+
+
+# ==========================================================
+#                 RUNNING
+# ==========================================================
+
+def dataset(spec, data_dir=DATA_DIR):
+    """Path of the synthetic database for `spec`, generated on first use."""
+    name = (f"synthetic_{spec.entries}e_{spec.customers}c_{spec.days}d_"
+            f"{spec.branches}b_{spec.types}t_{spec.end}_s{spec.seed}.db")
+    path = os.path.join(data_dir, name)
+    if not os.path.exists(path):
+        os.makedirs(data_dir, exist_ok=True)
+        print(f"Generating {path} …", flush=True)
+        partial = path + ".partial"
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(partial + suffix):
+                os.remove(partial + suffix)
+        synth.generate(partial, spec)
+        os.replace(partial, path)
+    return path
+
+
+def _copy(src, dest):
+    with sqlite3.connect(src) as source, sqlite3.connect(dest) as target:
+        source.backup(target)
+    source.close()
+    target.close()
+
+
+def time_case(ctx, c, repeat):
+    runs = []
+    for i in range(repeat + 1):   # the first run warms caches and is not kept
+        state = c.prepare(ctx) if c.prepare else None
+        t0 = time.perf_counter()
+        c.run(ctx, state)
+        elapsed = (time.perf_counter() - t0) * 1000
+        if i:
+            runs.append(elapsed)
+    median = statistics.median(runs)
+    return {
+        "median_ms": round(median, 4),
+        "min_ms": round(min(runs), 4),
+        "max_ms": round(max(runs), 4),
+        "ms_per_op": round(median / c.ops, 4),
+        "ops": c.ops,
+        "repeat": repeat,
+    }
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                             text=True, timeout=10, cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "commit": _git_commit(),
+    }
+
+
+def run_suite(spec, names=None, repeat=5, data_dir=DATA_DIR, progress=print):
+    """Run the named cases (all by default) and return the result document."""
+    source = dataset(spec, data_dir)
+    names = names or list(CASES)
+    unknown = set(names) - CASES.keys()
+    if unknown:
+        raise ValueError(f"unknown case(s): {', '.join(sorted(unknown))}")
+
+    scratch = tempfile.mkdtemp(prefix="ms_bench_")
+    results, skipped = {}, {}
+    try:
+        path = os.path.join(scratch, "bench.db")
+        _copy(source, path)
+        conn = db.connect(path)
+        try:
+            ctx = Context(conn, scratch)
+            for name in names:
+                try:
+                    results[name] = time_case(ctx, CASES[name], repeat)
+                except ImportError as exc:   # ReportLab / NumPy not installed
+                    skipped[name] = str(exc)
+                    continue
+                progress(f"  {name:<24}{results[name]['median_ms']:>10.2f} ms")
+        finally:
+            conn.close()
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    return {
+        "suite": 1,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "environment": environment(),
+        "spec": asdict(spec),
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def compare(current, baseline, threshold=0.2):
+    """
+    [(case, baseline median, current median, ratio, verdict)] for the
+    cases in both. The verdict is "slower" / "faster" past `threshold`,
+    otherwise "same".
+    """
+    rows = []
+    for name, now in current["results"].items():
+        then = baseline.get("results", {}).get(name)
+        if then is None:
+            continue
+        ratio = now["median_ms"] / then["median_ms"] if then["median_ms"] else float("inf")
+        verdict = ("slower" if ratio > 1 + threshold
+                   else "faster" if ratio < 1 - threshold else "same")
+        rows.append((name, then["median_ms"], now["median_ms"], ratio, verdict))
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    defaults = synth.Spec(end=SUITE_END)
+    for name, value in asdict(defaults).items():
+        ap.add_argument(f"--{name}", type=type(value), default=value,
+                        help="synthetic data (see benchmarks.synth)")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--only", nargs="+", metavar="CASE", choices=list(CASES),
+                    help="run just these cases")
+    ap.add_argument("--data-dir", default=DATA_DIR, help="where generated databases are kept")
+    ap.add_argument("--out", help="write the results here (JSON)")
+    ap.add_argument("--save-baseline", metavar="PATH", help="write the results as the new baseline")
+    ap.add_argument("--baseline", metavar="PATH", help="compare with these saved results")
+    ap.add_argument("--threshold", type=float, default=0.2,
+                    help="relative change that counts (default 0.2 = 20%%)")
+    ap.add_argument("--check", action="store_true", help="exit with status 1 on a regression")
+    ap.add_argument("--list", action="store_true", help="list the cases and exit")
+    args = ap.parse_args()
+
+    if args.list:
+        for c in CASES.values():
+            print(f"{c.name:<24}{c.doc}")
+        return
+
+    spec = synth.Spec(**{k: getattr(args, k) for k in asdict(defaults)})
+    print(f"{spec.entries:,} entries, {spec.customers:,} customers, repeat {args.repeat}")
+    doc = run_suite(spec, args.only, args.repeat, args.data_dir)
+    for name, reason in doc["skipped"].items():
+        print(f"  {name:<24}skipped: {reason}")
+
+    for path in (args.out, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(doc, f, indent=2)
+            print(f"Wrote {path}")
+
+    if not args.baseline:
+        return
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("spec") != doc["spec"]:
+        print("Note: the baseline was measured on different synthetic data:",
+              baseline.get("spec"))
+    rows = compare(doc, baseline, args.threshold)
+    print(f"\n{'case':<24}{'baseline ms':>13}{'now ms':>11}{'change':>9}")
+    for name, then, now, ratio, verdict in rows:
+        flag = "" if verdict == "same" else f"  {verdict}"
+        print(f"{name:<24}{then:>13.2f}{now:>11.2f}{ratio - 1:>+9.0%}{flag}")
+    regressions = [r[0] for r in rows if r[4] == "slower"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
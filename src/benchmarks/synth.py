@@ -0,0 +1,143 @@
+"""
+Synthetic billing database at the current schema.
+
+    python -m benchmarks.synth synthetic.db --customers 5000 --entries 1000000 \
+        --days 1095 --branches 6 --seed 7
+
+Customers get a name, mobile and address, and their own one to three
+vehicles. Entries are spread over the `--days` days up to `--end`.
+Customer activity is skewed, so a few customers account for many
+bills. Each entry has a branch, a type, a qty of 100-5,000 kg and a
+rate of ₹10-40/kg. Labour and advances are occasional. Rows are built
+with entries.make_entry and written through insert_entries, so
+triggers keep the summaries current, just as the app would. The search
+index is built in one pass at the end (search.rebuild). Its per-row
+trigger makes FTS5 flush a segment for every INSERT, and at this volume
+the merges cost more than everything else put together. The same
+arguments and seed always produce the same database.
+"""
+import argparse
+import itertools
+import os
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import date, timedelta
+
+from billing import db, search
+from billing.entries import CALC_MODES, insert_entries, make_entry
+
+BRANCHES = ["Saki Naka", "Kurla", "Andheri", "Bhiwandi", "Thane", "Vashi"]
+TYPES = ["Bran", "Husk", "Cake", "Chuni", "Mixed"]
+NOTES = ["", "", "", "", "part load", "wet", "second trip", "urgent", "cash"]
+BATCH = 50_000   # entries per transaction
+FTS_TRIGGER = "trg_entries_fts_ins"
+
+
+@dataclass
+class Spec:
+    customers: int = 2_000
+    entries: int = 100_000
+    days: int = 3 * 365
+    end: str = field(default_factory=lambda: str(date.today()))
+    branches: int = len(BRANCHES)
+    types: int = len(TYPES)
+    seed: int = 7
+
+    def branch_names(self):
+        return (BRANCHES + [f"Branch {i}" for i in range(len(BRANCHES) + 1, self.branches + 1)]
+                )[:self.branches]
+
+    def type_names(self):
+        return (TYPES + [f"Type {i}" for i in range(len(TYPES) + 1, self.types + 1)])[:self.types]
+
+
+def _vehicle(rnd):
+    series = "".join(rnd.choices("ABCDEFGH", k=2))
+    return f"MH{rnd.randint(1, 48):02d}{series}{rnd.randint(1000, 9999)}"
+
+
+def generate(path, spec=None, progress=None):
+    """
+    Write a database described by `spec` (a Spec) to `path`. The file
+    must not exist yet. Returns the number of entries written.
+    """
+    spec = spec or Spec()
+    if os.path.exists(path):
+        raise FileExistsError(path)
+    rnd = random.Random(spec.seed)
+    branches, types = spec.branch_names(), spec.type_names()
+    end = date.fromisoformat(spec.end)
+    days = [str(end - timedelta(days=d)) for d in range(spec.days)]
+
+    conn = db.connect(path)
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT INTO customers (name, mobile, address) VALUES (?,?,?)",
+                ((f"Customer {i:05d} Traders", f"9{rnd.randrange(10**9):09d}",
+                  f"Shop {i}, {rnd.choice(branches)}") for i in range(1, spec.customers + 1)),
+            )
+        ids = [r[0] for r in conn.execute("SELECT id FROM customers ORDER BY id")]
+        vehicles = {cid: [_vehicle(rnd) for _ in range(rnd.randint(1, 3))] for cid in ids}
+        home = {cid: rnd.choice(branches) for cid in ids}
+        # Pareto-ish activity: a few regular customers, a long tail
+        weights = [1 / (rank + 1) ** 0.8 for rank in range(len(ids))]
+        rnd.shuffle(weights)
+        cum = list(itertools.accumulate(weights))
+
+        trigger_sql, = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?", (FTS_TRIGGER,)
+        ).fetchone()
+        with conn:
+            conn.execute(f"DROP TRIGGER {FTS_TRIGGER}")
+
+        written = 0
+        while written < spec.entries:
+            n = min(BATCH, spec.entries - written)
+            rows = []
+            for cid in rnd.choices(ids, cum_weights=cum, k=n):
+                branch = home[cid] if rnd.random() < 0.7 else rnd.choice(branches)
+                labour = rnd.choice(("0", "0", "0.50", "1"))
+                advance = rnd.choice((0, 0, 0, 0, 500, 1000, 2000)) if rnd.random() < 0.3 else 0
+                rows.append(make_entry(
+                    rnd.choice(days), cid, rnd.choice(vehicles[cid]), branch, rnd.choice(types),
+                    f"{rnd.uniform(100, 5000):.2f}", f"{rnd.uniform(10, 40):.2f}", labour, advance,
+                    CALC_MODES[0] if labour != "0" else CALC_MODES[1], rnd.choice(NOTES),
+                ))
+            insert_entries(conn, rows)
+            written += n
+            if progress:
+                progress(written)
+        search.rebuild(conn)
+        with conn:
+            conn.execute(trigger_sql)
+        conn.execute("ANALYZE")
+        return written
+    finally:
+        conn.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("database", nargs="?", default="synthetic.db")
+    defaults = Spec()
+    for name, value in asdict(defaults).items():
+        ap.add_argument(f"--{name}", type=type(value), default=value)
+    ap.add_argument("--force", action="store_true", help="overwrite an existing file")
+    args = ap.parse_args()
+
+    if args.force:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(args.database + suffix):
+                os.remove(args.database + suffix)
+    spec = Spec(**{k: getattr(args, k) for k in asdict(defaults)})
+    t0 = time.perf_counter()
+    n = generate(args.database, spec,
+                 progress=lambda done: print(f"  {done:,} / {spec.entries:,} entries", flush=True))
+    print(f"Wrote {n:,} entries for {spec.customers:,} customers to {args.database} "
+          f"in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
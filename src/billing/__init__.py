@@ -0,0 +1,25 @@
+"""
+MS Traders billing core.
+
+GUI-independent engine behind the Tkinter front end in app.py. Every
+function takes an sqlite3 connection (see db.connect) and plain values
+and returns plain data, so it can be scripted, run in a worker or
+benchmarked without a display:
+
+    db         connection, pragmas, schema migrations
+    money      Money (paise) / Qty (grams) fixed-point values
+    convert_money  offline conversion of an old database to integer money
+    customers  customer lookup / creation
+    entries    line-item math, inserts, draft bills, deletes, ledger pages
+    reports    day / week / month / quarter / FY / range reports
+    analytics  NumPy columnar snapshot: top customers, weekly trends, ratios
+    summaries  materialized report totals (rebuild command)
+    invoices   Invoice data + PDF rendering
+    batch_invoices  one invoice per customer, rendered in worker processes
+    importer / exporter  CSV / XLSX in, CSV / Parquet out
+    search     FTS5 ledger search; live_search runs it off the UI thread
+    viewmodel  diff-based Treeview rows keyed by entries.id
+    tasks      reader threads + single writer thread for the GUI
+    startup    launch phase timings (main.py --startup-times)
+    diagnostics  query / task / callback latency histograms, slow-operation log
+"""
@@ -0,0 +1,442 @@
+"""
+Trend analytics over the ledger, computed with NumPy.
+
+The summary tables answer "how much in this period". Trend questions
+slice the ledger several ways at once, so this module uses a columnar
+snapshot of `entries` held in NumPy arrays and groups it with
+bincount instead:
+
+    top_customers(conn, start, end)        biggest customers by amount
+                                           (entries with no customer are
+                                           totalled apart: no_customer)
+    weekly_branch_qty(conn, start, end)    qty per branch per week
+    rate_trend(conn, start, end, window)   qty-weighted rate per type per
+                                           week, plus a rolling mean
+    advance_ratios(conn, start, end, by)   advance / total per branch,
+                                           type, customer or month
+
+The snapshot is read in chunks of CHUNK rows by id and cached per
+database file. Each call brings it up to date first: new rows (ids above
+the last one loaded) are read and appended. When rows have been
+deleted, the ids still in the table are read and the missing rows are
+dropped. Money and qty stay in integer paise /
+grams. float64 adds integers exactly up to 2**53, so the group sums are
+exact, and they come back as Money / Qty. Rates and ratios are floats.
+"""
+import threading
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from billing.money import Money, Qty
+
+CHUNK = 50_000
+
+SNAPSHOT_SELECT = """
+    SELECT id, date, COALESCE(customer_id, 0), COALESCE(branch, ''), COALESCE(type, ''),
+           COALESCE(qty, 0), COALESCE(rate, 0), COALESCE(advance, 0), COALESCE(total, 0)
+    FROM entries WHERE id > ? ORDER BY id LIMIT ?
+"""
+
+GROUP_BY = ("branch", "type", "customer", "month")
+
+NO_CUSTOMER = 0   # snapshot value for entries.customer_id IS NULL; never ranked
+
+_FIRST_MONDAY = 4   # 1970-01-05, in days since the epoch
+
+
+# ==========================================================
+#                 COLUMNAR SNAPSHOT
+# ==========================================================
+
+def _days(dates):
+    """ISO date strings -> days since 1970-01-01; unreadable dates become -1."""
+    try:
+        d = np.array(dates, dtype="datetime64[D]")
+    except ValueError:
+        d = np.array([_one_day(s) for s in dates], dtype="datetime64[D]")
+    out = d.astype(np.int64)
+    out[np.isnat(d)] = -1
+    return out
+
+
+def _one_day(s):
+    try:
+        return np.datetime64(s, "D")
+    except ValueError:
+        return np.datetime64("NaT")
+
+
+def _day(value):
+    """A date, ISO string or None -> day number (None stays None)."""
+    if value is None or value == "":
+        return None
+    return int(np.datetime64(str(value), "D").astype(np.int64))
+
+
+def _iso(day):
+    return str(np.datetime64(int(day), "D"))
+
+
+class _Codes:
+    """Dictionary encoding for a text column: names[code] == value."""
+
+    def __init__(self):
+        self.names = []
+        self._index = {}
+
+    def encode(self, values):
+        index = self._index
+        for v in set(values) - index.keys():
+            index[v] = len(self.names)
+            self.names.append(v)
+        return np.fromiter((index[v] for v in values), np.int32, len(values))
+
+    def copy(self):
+        c = _Codes()
+        c.names = list(self.names)
+        c._index = dict(self._index)
+        return c
+
+
+@dataclass
+class Snapshot:
+    """The analytics columns of `entries`, one array per column, in id order."""
+    id: np.ndarray = field(default_factory=lambda: np.empty(0, np.int64))
+    day: np.ndarray = field(default_factory=lambda: np.empty(0, np.int64))
+    customer: np.ndarray = field(default_factory=lambda: np.empty(0, np.int64))
+    branch: np.ndarray = field(default_factory=lambda: np.empty(0, np.int32))
+    type: np.ndarray = field(default_factory=lambda: np.empty(0, np.int32))
+    qty: np.ndarray = field(default_factory=lambda: np.empty(0, np.int64))       # grams
+    rate: np.ndarray = field(default_factory=lambda: np.empty(0, np.int64))      # paise / kg
+    advance: np.ndarray = field(default_factory=lambda: np.empty(0, np.int64))   # paise
+    total: np.ndarray = field(default_factory=lambda: np.empty(0, np.int64))     # paise
+    branches: _Codes = field(default_factory=_Codes)
+    types: _Codes = field(default_factory=_Codes)
+
+    NUMERIC = ("id", "day", "customer", "branch", "type", "qty", "rate", "advance", "total")
+
+    def __len__(self):
+        return len(self.id)
+
+    @property
+    def last_id(self):
+        return int(self.id[-1]) if len(self.id) else 0
+
+    def extended(self, conn, chunk=CHUNK):
+        """
+        A new Snapshot with the rows whose id is above last_id appended,
+        read `chunk` rows at a time. Returns self if there are none.
+        This one is left untouched, so readers still holding it are safe.
+        """
+        branches, types = self.branches.copy(), self.types.copy()
+        parts = {name: [] for name in self.NUMERIC}
+        after = self.last_id
+        while True:
+            rows = conn.execute(SNAPSHOT_SELECT, (after, chunk)).fetchall()
+            if not rows:
+                break
+            ids, dates, cust, br, ty, qty, rate, adv, total = zip(*rows)
+            parts["id"].append(np.array(ids, np.int64))
+            parts["day"].append(_days(dates))
+            parts["customer"].append(np.array(cust, np.int64))
+            parts["branch"].append(branches.encode(br))
+            parts["type"].append(types.encode(ty))
+            parts["qty"].append(np.array(qty, np.int64))
+            parts["rate"].append(np.array(rate, np.int64))
+            parts["advance"].append(np.array(adv, np.int64))
+            parts["total"].append(np.array(total, np.int64))
+            after = ids[-1]
+            if len(rows) < chunk:
+                break
+        if not parts["id"]:
+            return self
+        columns = {
+            name: np.concatenate([getattr(self, name)] + parts[name])
+            for name in self.NUMERIC
+        }
+        return Snapshot(**columns, branches=branches, types=types)
+
+    def keeping(self, ids):
+        """A new Snapshot with only the rows whose id is in `ids` (sorted)."""
+        keep = np.isin(self.id, ids, assume_unique=True)
+        columns = {name: getattr(self, name)[keep] for name in self.NUMERIC}
+        return Snapshot(**columns, branches=self.branches, types=self.types)
+
+    def between(self, start=None, end=None):
+        """Boolean mask of rows dated start..end (inclusive ISO dates; None is open)."""
+        mask = self.day >= 0
+        lo, hi = _day(start), _day(end)
+        if lo is not None:
+            mask &= self.day >= lo
+        if hi is not None:
+            mask &= self.day <= hi
+        return mask
+
+
+_cache = {}   # database file -> Snapshot
+_lock = threading.Lock()
+
+
+def _db_file(conn):
+    return conn.execute("PRAGMA database_list").fetchone()[2] or ":memory:"
+
+
+def snapshot(conn, chunk=CHUNK):
+    """
+    The cached Snapshot for conn's database, brought up to date with
+    any rows added since it was taken. Safe to call from several reader
+    threads; they share one snapshot per file.
+    """
+    key = _db_file(conn)
+    own = not conn.in_transaction
+    with _lock:
+        if own:
+            conn.execute("BEGIN")   # the appended rows and the count agree
+        try:
+            snap = _cache.get(key, Snapshot()).extended(conn, chunk)
+            count, = conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+            if count != len(snap):   # rows were deleted: drop them
+                ids = np.fromiter((r[0] for r in conn.execute("SELECT id FROM entries ORDER BY id")),
+                                  np.int64, count)
+                snap = snap.keeping(ids)
+        finally:
+            if own:
+                conn.commit()
+        if key != ":memory:":
+            _cache[key] = snap
+        return snap
+
+
+def forget(conn=None):
+    """Drop the cached snapshot for conn's database (all of them if None)."""
+    with _lock:
+        if conn is None:
+            _cache.clear()
+        else:
+            _cache.pop(_db_file(conn), None)
+
+
+# ==========================================================
+#                 GROUP-BYS
+# ==========================================================
+
+def _sums(keys, size, *columns):
+    """Per-key sums of each integer column, as int64 (exact below 2**53)."""
+    return [np.bincount(keys, weights=c, minlength=size).round().astype(np.int64)
+            for c in columns]
+
+
+def _weeks(days):
+    """Week number of each day, weeks starting on Monday."""
+    return (days - _FIRST_MONDAY) // 7
+
+
+def _week_start(week):
+    return _iso(week * 7 + _FIRST_MONDAY)
+
+
+def _customer_names(conn, ids):
+    if not ids:
+        return {}
+    marks = ",".join("?" * len(ids))
+    return dict(conn.execute(
+        f"SELECT id, name FROM customers WHERE id IN ({marks})", [int(i) for i in ids]
+    ).fetchall())
+
+
+@dataclass
+class CustomerRank:
+    customer_id: int
+    name: str
+    bills: int
+    qty: Qty
+    amount: Money
+    share: float   # of the period's total amount
+
+
+def top_customers(conn, start=None, end=None, limit=10):
+    """
+    The `limit` customers with the largest total amount between start
+    and end. Entries without a customer are not ranked (see
+    no_customer()), but they count in the period total that `share` is
+    taken of.
+    """
+    snap = snapshot(conn)
+    period = snap.between(start, end)
+    grand = int(snap.total[period].sum())
+    mask = period & (snap.customer != NO_CUSTOMER)
+    cust = snap.customer[mask]
+    if not len(cust):
+        return []
+    uniq, keys = np.unique(cust, return_inverse=True)
+    bills = np.bincount(keys, minlength=len(uniq))
+    qty, amount = _sums(keys, len(uniq), snap.qty[mask], snap.total[mask])
+
+    order = np.argsort(-amount, kind="stable")[:limit]
+    names = _customer_names(conn, uniq[order].tolist())
+    return [
+        CustomerRank(int(uniq[i]), names.get(int(uniq[i]), "-"), int(bills[i]),
+                     Qty(int(qty[i])), Money(int(amount[i])),
+                     int(amount[i]) / grand if grand else 0.0)
+        for i in order
+    ]
+
+
+def no_customer(conn, start=None, end=None):
+    """Entries between start and end with no customer, as one CustomerRank (customer_id None)."""
+    snap = snapshot(conn)
+    period = snap.between(start, end)
+    grand = int(snap.total[period].sum())
+    mask = period & (snap.customer == NO_CUSTOMER)
+    amount = int(snap.total[mask].sum())
+    return CustomerRank(None, "(no customer)", int(mask.sum()), Qty(int(snap.qty[mask].sum())),
+                        Money(amount), amount / grand if grand else 0.0)
+
+
+@dataclass
+class Table:
+    """A grid of values: rows[i] x columns[j] -> values[i][j]."""
+    rows: list
+    columns: list
+    values: list
+    extra: dict = field(default_factory=dict)   # further grids with the same shape
+
+
+def weekly_branch_qty(conn, start=None, end=None):
+    """Qty (Qty) delivered per branch per week. Rows are week-start dates, columns branches."""
+    snap = snapshot(conn)
+    mask = snap.between(start, end)
+    if not mask.any():
+        return Table([], [], [])
+    week = _weeks(snap.day[mask])
+    first, weeks = int(week.min()), int(week.max() - week.min()) + 1
+    branch = snap.branch[mask]
+    used = np.unique(branch)
+    col = np.searchsorted(used, branch)
+    keys = (week - first) * len(used) + col
+    qty, = _sums(keys, weeks * len(used), snap.qty[mask])
+    grid = qty.reshape(weeks, len(used))
+    return Table(
+        rows=[_week_start(first + w) for w in range(weeks)],
+        columns=[snap.branches.names[b] or "-" for b in used],
+        values=[[Qty(int(v)) for v in row] for row in grid.tolist()],
+    )
+
+
+def _rolling_sum(grid, window):
+    """Trailing sums over `window` rows of a 2-D array (fewer at the start)."""
+    c = np.cumsum(grid, axis=0)
+    out = c.copy()
+    out[window:] -= c[:-window]
+    return out
+
+
+def rate_trend(conn, start=None, end=None, window=4):
+    """
+    Average rate (₹/kg, weighted by qty) per type per week, and the
+    same over a trailing `window` of weeks, which smooths out weeks with
+    few sales. Weeks with no sales of a type are None.
+    """
+    snap = snapshot(conn)
+    mask = snap.between(start, end) & (snap.qty > 0)
+    if not mask.any():
+        return Table([], [], [], {"rolling": []})
+    week = _weeks(snap.day[mask])
+    first, weeks = int(week.min()), int(week.max() - week.min()) + 1
+    typ = snap.type[mask]
+    used = np.unique(typ)
+    keys = (week - first) * len(used) + np.searchsorted(used, typ)
+    size = weeks * len(used)
+    qty = snap.qty[mask].astype(np.float64)
+    # paise/kg × grams -> rupees × kg; floats, as averages need not be exact
+    value = np.bincount(keys, weights=snap.rate[mask] * qty / (Money.SCALE * Qty.SCALE),
+                        minlength=size).reshape(weeks, len(used))
+    kg = np.bincount(keys, weights=qty / Qty.SCALE, minlength=size).reshape(weeks, len(used))
+
+    def averages(v, q):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avg = np.where(q > 0, v / q, np.nan)
+        return [[None if np.isnan(x) else round(float(x), 2) for x in row] for row in avg]
+
+    window = max(1, int(window))
+    return Table(
+        rows=[_week_start(first + w) for w in range(weeks)],
+        columns=[snap.types.names[t] or "-" for t in used],
+        values=averages(value, kg),
+        extra={"rolling": averages(_rolling_sum(value, window), _rolling_sum(kg, window))},
+    )
+
+
+@dataclass
+class AdvanceRatio:
+    key: str
+    bills: int
+    advance: Money
+    total: Money
+
+    @property
+    def ratio(self):
+        return int(self.advance) / int(self.total) if self.total else 0.0
+
+
+def advance_ratios(conn, start=None, end=None, by="branch"):
+    """
+    Advance taken against the billed total, per `by` (one of GROUP_BY),
+    largest ratio first. By customer, entries without one are left out.
+    """
+    if by not in GROUP_BY:
+        raise ValueError(f"group by one of {', '.join(GROUP_BY)}, not {by!r}")
+    snap = snapshot(conn)
+    mask = snap.between(start, end)
+    if not mask.any():
+        return []
+    if by == "branch":
+        raw, label = snap.branch[mask], lambda k: snap.branches.names[k] or "-"
+    elif by == "type":
+        raw, label = snap.type[mask], lambda k: snap.types.names[k] or "-"
+    elif by == "month":
+        months = snap.day[mask].astype("datetime64[D]").astype("datetime64[M]")
+        raw, label = months.astype(np.int64), lambda k: str(np.datetime64(int(k), "M"))
+    else:
+        mask &= snap.customer != NO_CUSTOMER
+        if not mask.any():
+            return []
+        raw = snap.customer[mask]
+        names = _customer_names(conn, np.unique(raw).tolist())
+        label = lambda k: names.get(int(k), "-")
+    uniq, keys = np.unique(raw, return_inverse=True)
+    bills = np.bincount(keys, minlength=len(uniq))
+    advance, total = _sums(keys, len(uniq), snap.advance[mask], snap.total[mask])
+    rows = [
+        AdvanceRatio(label(k), int(n), Money(int(a)), Money(int(t)))
+        for k, n, a, t in zip(uniq.tolist(), bills, advance, total)
+    ]
+    if by != "month":
+        rows.sort(key=lambda r: -r.ratio)
+    return rows
+
+
+@dataclass
+class Trends:
+    """Everything the Trends window shows, computed in one call."""
+    start: str
+    end: str
+    customers: list          # CustomerRank
+    no_customer: object      # CustomerRank for entries without a customer
+    branch_qty: Table        # weekly_branch_qty
+    rates: Table             # rate_trend
+    advances: list           # AdvanceRatio
+    rows: int                # entries in the snapshot
+
+
+def trends(conn, start=None, end=None, window=4, advance_by="branch", limit=20):
+    return Trends(
+        start, end,
+        customers=top_customers(conn, start, end, limit),
+        no_customer=no_customer(conn, start, end),
+        branch_qty=weekly_branch_qty(conn, start, end),
+        rates=rate_trend(conn, start, end, window),
+        advances=advance_ratios(conn, start, end, advance_by),
+        rows=len(snapshot(conn)),
+    )
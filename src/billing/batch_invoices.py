@@ -0,0 +1,172 @@
+"""
+Month-end batch invoicing.
+
+plan_invoices() groups a period's entries per customer into Invoice
+objects (one query, ordered by customer); issue_invoices() numbers
+them from the invoice register; render_batch() renders them
+in parallel across a ProcessPoolExecutor, because ReportLab is pure
+Python and would otherwise use one core.
+
+    python -m billing.batch_invoices --from 2025-03-01 --to 2025-03-31
+"""
+import argparse
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from itertools import groupby
+
+from billing.entries import fixed
+from billing.invoices import (
+    INVOICE_DIR, Invoice, default_template, invoice_path, issue_invoices, render_invoice,
+)
+
+
+@dataclass
+class BatchResult:
+    folder: str
+    files: list = field(default_factory=list)    # (invoice no, customer, path, total)
+    failed: list = field(default_factory=list)   # (invoice no, customer, error)
+    summary_path: str = None
+
+
+def _describe(values):
+    distinct = sorted({v for v in values if v})
+    if len(distinct) <= 1:
+        return distinct[0] if distinct else ""
+    return "Multiple"
+
+
+def plan_invoices(conn, start, end, customer_ids=None):
+    """
+    One unnumbered Invoice per customer with entries dated start..end
+    (inclusive) that are not on an invoice yet; issue_invoices() numbers
+    them. Running a period again only picks up entries added since.
+    """
+    q = """
+        SELECT e.customer_id, c.name, c.mobile, c.address, e.id,
+               e.date, e.vehicle, e.branch, e.type,
+               e.qty, e.rate, e.labour, e.advance, e.pre, e.total, e.note
+        FROM entries e
+        JOIN customers c ON c.id = e.customer_id
+        WHERE e.date >= ? AND e.date <= ?
+          AND NOT EXISTS (SELECT 1 FROM invoice_entries ie WHERE ie.entry_id = e.id)
+    """
+    params = [start, end]
+    if customer_ids:
+        ids = sorted(set(customer_ids))
+        q += f" AND e.customer_id IN ({','.join('?' * len(ids))})"
+        params += ids
+    q += " ORDER BY e.customer_id, e.date, e.id"
+
+    invoices = []
+    for cid, rows in groupby(conn.execute(q, params), key=lambda r: r[0]):
+        rows = list(rows)
+        _, name, mobile, address = rows[0][:4]
+        invoices.append(Invoice(
+            customer_id=cid,
+            customer_name=name or "",
+            customer_mobile=mobile or "",
+            customer_address=address or "",
+            date=f"{start} to {end}",
+            vehicle=_describe(r[6] for r in rows),
+            branch=_describe(r[7] for r in rows),
+            type=_describe(r[8] for r in rows),
+            lines=[fixed(r[9:15]) + r[15:] for r in rows],
+            entry_ids=[r[4] for r in rows],
+        ))
+    return invoices
+
+
+def issue_batch(conn, start, end, customer_ids=None, folder=None):
+    """
+    Plan and issue the period's invoices, recorded as filed in `folder`
+    (default: a new batch_folder()) - render them into the same one.
+    """
+    return issue_invoices(conn, plan_invoices(conn, start, end, customer_ids),
+                          folder or batch_folder(start, end))
+
+
+def _render(invoice, path):
+    render_invoice(invoice, path)
+    return path
+
+
+def render_batch(invoices, folder, workers=None, progress=None):
+    """
+    Render `invoices` into `folder` using `workers` processes
+    (default: one per CPU). `progress(done, total)` runs in this
+    process after each invoice.
+    """
+    os.makedirs(folder, exist_ok=True)
+    result = BatchResult(folder)
+    total = len(invoices)
+
+    # each worker builds its invoice template once, before its first invoice
+    with ProcessPoolExecutor(max_workers=workers, initializer=default_template) as pool:
+        futures = {
+            pool.submit(_render, inv, invoice_path(inv, folder)): inv
+            for inv in invoices
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            inv = futures[future]
+            try:
+                result.files.append((inv.number, inv.customer_name, future.result(), inv.total))
+            except Exception as exc:
+                result.failed.append((inv.number, inv.customer_name, str(exc)))
+            if progress:
+                progress(done, total)
+
+    result.files.sort()
+    result.summary_path = os.path.join(folder, "summary.csv")
+    with open(result.summary_path, "w", newline="", encoding="utf-8-sig") as f:
+        w = csv.writer(f)
+        w.writerow(["Invoice No", "Customer", "File", "Total"])
+        for number, customer, path, amount in result.files:
+            w.writerow([number, customer, os.path.basename(path), f"{amount:.2f}"])
+    return result
+
+
+def batch_folder(start, end, root=INVOICE_DIR):
+    """
+    invoices/batch_<start>_<end>, or the first free _2, _3, ... variant,
+    so a re-run never writes over an earlier batch's files or summary.csv.
+    """
+    base = os.path.join(root, f"batch_{start}_{end}")
+    folder, n = base, 1
+    while os.path.exists(folder):
+        n += 1
+        folder = f"{base}_{n}"
+    return folder
+
+
+def main():
+    from billing import db
+
+    ap = argparse.ArgumentParser(description="Render one invoice per customer for a period.")
+    ap.add_argument("--db", default=db.DB_NAME)
+    ap.add_argument("--from", dest="start", required=True)
+    ap.add_argument("--to", dest="end", required=True)
+    ap.add_argument("--customer", type=int, action="append", help="repeat to limit customers")
+    ap.add_argument("--workers", type=int)
+    args = ap.parse_args()
+
+    folder = batch_folder(args.start, args.end)
+    conn = db.connect(args.db)
+    invoices = issue_batch(conn, args.start, args.end, args.customer, folder)
+    conn.close()
+    if not invoices:
+        print("No entries in this period that are not already invoiced.")
+        return
+
+    result = render_batch(
+        invoices, folder, args.workers,
+        progress=lambda done, total: print(f"\r  {done}/{total}", end="", flush=True)
+    )
+    print(f"\n{len(result.files)} invoices in {result.folder}, {len(result.failed)} failed")
+    for number, customer, error in result.failed:
+        print(f"  {number} ({customer}): {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Convert an existing database to integer money, with a backup and a check.
+
+    python -m billing.convert_money ms_traders_billing.db [--backup PATH | --no-backup]
+
+Opening a database in the app converts it too (schema migration 7),
+but on a large file that is a long pause at startup. This tool does it
+offline. It copies the file aside first, converts it, and then checks
+each month three ways:
+
+- the new integer SUM of its entries,
+- its summary_monthly total,
+- the sum of its old REAL totals, each rounded to the paisa.
+
+All three must agree. It also reports how far each month's old REAL
+SUM had drifted from the exact total.
+"""
+import argparse
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, field
+
+from billing import db, money
+from billing.money import Money
+
+TARGET_VERSION = 7   # db._m007_fixed_point
+
+
+@dataclass
+class MonthCheck:
+    month: str
+    bills: int
+    old_sum: float      # SUM(total) of the REAL column, as the reports saw it
+    expected: Money     # the old totals rounded to paise one by one, then added
+    entries: Money      # SUM(total) after conversion
+    summary: Money      # summary_monthly after conversion
+
+    @property
+    def ok(self):
+        return self.expected == self.entries == self.summary
+
+    @property
+    def drift(self):
+        """How far the old REAL sum was from the exact one, in paise."""
+        return abs(round(self.old_sum * Money.SCALE) - int(self.entries))
+
+
+@dataclass
+class ConvertResult:
+    path: str
+    version_before: int
+    backup_path: str = None
+    seconds: float = 0.0
+    months: list = field(default_factory=list)   # MonthCheck
+
+    @property
+    def converted(self):
+        return self.version_before < TARGET_VERSION
+
+    @property
+    def failed(self):
+        return [m for m in self.months if not m.ok]
+
+
+def default_backup_path(path):
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.before-paise{ext or '.db'}"
+
+
+def convert(path, backup_path=None):
+    """
+    Migrate the database at `path` to integer money. The file is copied
+    to `backup_path` first (None skips the copy). Returns a
+    ConvertResult. Nothing happens to a database that is already
+    converted.
+    """
+    conn = sqlite3.connect(path)
+    try:
+        db.configure(conn)
+        result = ConvertResult(path, db.schema_version(conn))
+        if not result.converted:
+            return result
+
+        if backup_path:
+            with sqlite3.connect(backup_path) as dest:
+                conn.backup(dest)
+            dest.close()
+            result.backup_path = backup_path
+
+        # bring older files up to the last REAL schema, then read what
+        # the REAL totals were and what rounding each line should give
+        db.migrate(conn, TARGET_VERSION - 1)
+        conn.create_function("paise", 1, money.paise, deterministic=True)
+        # a NULL date is filed under '' - as summary_monthly and, from
+        # v8, the entries themselves do
+        before = {
+            month: (bills, old_sum or 0.0, expected or 0)
+            for month, bills, old_sum, expected in conn.execute("""
+                SELECT substr(COALESCE(date, ''), 1, 7), COUNT(*), SUM(total), SUM(paise(total))
+                FROM entries GROUP BY 1
+            """)
+        }
+
+        t0 = time.perf_counter()
+        db.migrate(conn, TARGET_VERSION)
+        result.seconds = time.perf_counter() - t0
+
+        after = dict(conn.execute(
+            "SELECT substr(COALESCE(date, ''), 1, 7), COALESCE(SUM(total), 0) "
+            "FROM entries GROUP BY 1"
+        ).fetchall())
+        summary = dict(conn.execute(
+            "SELECT month, SUM(amount) FROM summary_monthly GROUP BY month"
+        ).fetchall())
+        for month, (bills, old_sum, expected) in sorted(before.items()):
+            result.months.append(MonthCheck(
+                month, bills, old_sum, Money(expected),
+                Money(after.get(month, 0)), Money(summary.get(month, 0)),
+            ))
+        db.migrate(conn)   # later migrations, once the conversion is checked
+        return result
+    finally:
+        conn.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Convert a billing database to integer paise / grams.")
+    ap.add_argument("database", nargs="?", default=db.DB_NAME)
+    ap.add_argument("--backup", help="where to copy the database first "
+                                     "(default: <name>.before-paise.db)")
+    ap.add_argument("--no-backup", action="store_true")
+    args = ap.parse_args()
+
+    if not os.path.exists(args.database):
+        ap.error(f"{args.database} does not exist")
+    backup = None if args.no_backup else (args.backup or default_backup_path(args.database))
+
+    result = convert(args.database, backup)
+    if not result.converted:
+        print(f"{args.database} is already at schema v{result.version_before}; nothing to do.")
+        return
+
+    if result.backup_path:
+        print(f"Backup: {result.backup_path}")
+    bills = sum(m.bills for m in result.months)
+    print(f"Converted {bills:,} entries in {result.seconds:.1f} s")
+    print(f"{'Month':<9}{'Bills':>9}{'Old REAL sum':>20}{'Exact total':>20}{'Drift':>8}")
+    for m in result.months:
+        flag = "" if m.ok else "   MISMATCH"
+        print(f"{m.month:<9}{m.bills:>9,}{m.old_sum:>20,.4f}{m.entries:>20,.2f}"
+              f"{m.drift:>6} p{flag}")
+    if result.failed:
+        print(f"{len(result.failed)} month(s) do not add up - restore the backup and report this.")
+        raise SystemExit(1)
+    print("Every month's entries, summary and rounded old totals agree.")
+
+
+if __name__ == "__main__":
+    main()
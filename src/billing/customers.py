@@ -0,0 +1,192 @@
+"""Customer lookups and creation. Nothing here commits - callers own the transaction."""
+import bisect
+import difflib
+
+
+def all_customers(conn):
+    """(id, name, mobile, address) for every customer, by name."""
+    return conn.execute(
+        "SELECT id, name, mobile, address FROM customers ORDER BY name"
+    ).fetchall()
+
+
+def find_customer(conn, name, mobile):
+    """Id of the customer with exactly this name and mobile, or None."""
+    row = conn.execute(
+        "SELECT id FROM customers WHERE name = ? AND mobile = ?",
+        (name, mobile)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def create_customer(conn, name, mobile, address):
+    return conn.execute(
+        "INSERT INTO customers (name, mobile, address) VALUES (?,?,?)",
+        (name, mobile, address)
+    ).lastrowid
+
+
+def get_or_create_customer(conn, name, mobile, address=""):
+    """Returns (id, created)."""
+    cid = find_customer(conn, name, mobile)
+    if cid is not None:
+        return cid, False
+    return create_customer(conn, name, mobile, address), True
+
+
+SUGGEST_LIMIT = 10     # autocomplete suggestions
+FUZZY_CUTOFF = 0.6     # difflib ratio for "did you mean" matches
+
+
+def _words(name):
+    return name.casefold().split()
+
+
+class CustomerCache:
+    """
+    In-memory customer index loaded with one SELECT: by (name, mobile),
+    by id, by mobile and by the start of any word in the name, with
+    difflib fuzzy matching as a fallback. Bulk work uses it instead of
+    a lookup query per row; the GUI uses it for autocomplete and the
+    customer picker. Customers created through it are indexed at once;
+    call commit() or rollback() along with the transaction they were
+    created in, so a rolled back customer is not handed out again.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created = 0
+        self.uncommitted = []   # ids created since the last commit() / rollback()
+        self.reload()
+
+    def reload(self):
+        """Re-read the customers table (after writes that bypassed the cache)."""
+        self.ids = {}        # (name, mobile) -> id
+        self.by_id = {}      # id -> (id, name, mobile, address)
+        self.by_mobile = {}  # mobile -> [ids]
+        self._mobiles = []   # sorted (mobile, id), for prefix search
+        self._words = []     # sorted (name word, id), for prefix search
+        self._vocab = set()  # distinct name words, for spelling correction
+        rows = self.conn.execute("SELECT id, name, mobile, address FROM customers")
+        for cid, name, mobile, address in rows:
+            self._index(cid, name or "", mobile or "", address or "")
+        self._mobiles.sort()
+        self._words.sort()
+
+    def _index(self, cid, name, mobile, address, insort=None):
+        add = insort or list.append
+        self.ids[(name, mobile)] = cid
+        self.by_id[cid] = (cid, name, mobile, address)
+        if mobile:
+            self.by_mobile.setdefault(mobile, []).append(cid)
+            add(self._mobiles, (mobile, cid))
+        for word in _words(name):
+            add(self._words, (word, cid))
+            self._vocab.add(word)
+
+    def _unindex(self, cid):
+        _, name, mobile, _ = self.by_id.pop(cid)
+        if self.ids.get((name, mobile)) == cid:
+            del self.ids[(name, mobile)]
+        if mobile:
+            self.by_mobile[mobile].remove(cid)
+            if not self.by_mobile[mobile]:
+                del self.by_mobile[mobile]
+            self._mobiles.remove((mobile, cid))
+        for word in _words(name):
+            self._words.remove((word, cid))
+
+    def commit(self):
+        """The customers created so far have been committed."""
+        self.uncommitted.clear()
+
+    def rollback(self):
+        """Forget the customers created since the last commit(); their transaction rolled back."""
+        for cid in reversed(self.uncommitted):
+            self._unindex(cid)
+        self.created -= len(self.uncommitted)
+        self.uncommitted.clear()
+
+    def get(self, cid):
+        """(id, name, mobile, address) or None."""
+        return self.by_id.get(cid)
+
+    def find(self, name, mobile):
+        return self.ids.get((name, mobile))
+
+    def get_or_create(self, name, mobile, address=""):
+        """Returns (id, created); a new customer is not committed (see commit())."""
+        cid = self.ids.get((name, mobile))
+        if cid is not None:
+            return cid, False
+        cid = create_customer(self.conn, name, mobile, address)
+        self.add(cid, name, mobile, address)
+        self.created += 1
+        self.uncommitted.append(cid)
+        return cid, True
+
+    def add(self, cid, name, mobile, address=""):
+        """Index a customer created elsewhere (e.g. on another connection)."""
+        if cid not in self.by_id:
+            self._index(cid, name, mobile, address, insort=bisect.insort)
+
+    def resolve(self, name, mobile, address=""):
+        """Id for (name, mobile), creating the customer if needed (not committed)."""
+        return self.get_or_create(name, mobile, address)[0]
+
+    # ---- search ----
+    @staticmethod
+    def _prefixed(keys, prefix):
+        """Ids whose key in sorted `keys` starts with `prefix`."""
+        i = bisect.bisect_left(keys, (prefix,))
+        out = set()
+        while i < len(keys) and keys[i][0].startswith(prefix):
+            out.add(keys[i][1])
+            i += 1
+        return out
+
+    def _sorted(self, ids):
+        return sorted((self.by_id[i] for i in ids), key=lambda c: (c[1].casefold(), c[0]))
+
+    def search(self, text, limit=None):
+        """
+        Customers matching `text`, best first. Digits match the start of
+        the mobile number; words must each start a word of the name
+        ("ra ku" finds "Ravi Kumar"). Close spellings fill any remaining
+        places, so "Kumaar" still finds "Kumar".
+        """
+        text = text.strip()
+        if not text:
+            return self._sorted(self.by_id)[:limit]
+
+        if text.isdigit():
+            hits = self._sorted(self._prefixed(self._mobiles, text))
+        else:
+            words = _words(text)
+            ids = self._prefixed(self._words, words[0])
+            for word in words[1:]:
+                ids &= self._prefixed(self._words, word)
+            hits = self._sorted(ids)
+
+        if limit is not None and len(hits) >= limit:
+            return hits[:limit]
+        if not text.isdigit():
+            hits += self._fuzzy(text, limit, {c[0] for c in hits})
+        return hits[:limit]
+
+    def _fuzzy(self, text, limit, seen):
+        """
+        Customers matching `text` once each word is corrected to close
+        spellings from the name vocabulary ("kumaar" -> "kumar").
+        """
+        ids = None
+        for word in _words(text):
+            vocab = [w for w in self._vocab if abs(len(w) - len(word)) <= 2]
+            close = difflib.get_close_matches(word, vocab, n=3, cutoff=FUZZY_CUTOFF)
+            found = self._prefixed(self._words, word)
+            for w in close:
+                found |= self._prefixed(self._words, w)
+            ids = found if ids is None else ids & found
+            if not ids:
+                return []
+        return self._sorted(ids - seen)[:limit]
@@ -0,0 +1,578 @@
+"""
+SQLite connection and versioned schema migrations.
+
+The schema version lives in PRAGMA user_version. Each function in
+MIGRATIONS upgrades the database by exactly one version and runs in
+its own transaction together with the user_version bump, so an
+interrupted upgrade leaves the file at the previous version.
+Migrations only ever append - never edit one that has shipped.
+"""
+import sqlite3
+
+from billing import diagnostics, money
+
+DB_NAME = "ms_traders_billing.db"
+
+# Applied to every connection. WAL lets readers run alongside the writer
+# and turns each commit into an append to the -wal file; with
+# synchronous=NORMAL a commit no longer waits for an fsync, so a power
+# cut can lose the last few commits but cannot corrupt the database.
+PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("busy_timeout", 5000),
+)
+
+
+class SchemaError(Exception):
+    """Raised when the database was written by a newer version of the app."""
+
+
+def _columns(conn, table):
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+# ==========================================================
+#                 MIGRATIONS
+# ==========================================================
+
+def _m001_base_tables(conn):
+    """entries + customers, including databases created before customer_id."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS entries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT,
+            customer_id INTEGER,
+            vehicle TEXT,
+            branch TEXT,
+            type TEXT,
+            qty REAL,
+            rate REAL,
+            labour REAL,
+            advance REAL,
+            pre REAL,
+            total REAL,
+            note TEXT
+        )
+    """)
+    if "customer_id" not in _columns(conn, "entries"):
+        conn.execute("ALTER TABLE entries ADD COLUMN customer_id INTEGER")
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS customers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT,
+            mobile TEXT,
+            address TEXT
+        )
+    """)
+
+
+def _m002_lookup_indexes(conn):
+    """Indexes for every lookup the app does."""
+    # ledger keyset paging + date filter (rowid is the implicit 2nd key)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_date ON entries(date)")
+    # daily / monthly aggregates answered from the index alone
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_entries_date_totals "
+        "ON entries(date, qty, total)"
+    )
+    # customer panel: WHERE customer_id = ? ORDER BY date DESC, id DESC
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_entries_customer "
+        "ON entries(customer_id, date)"
+    )
+    # save_customer / add_item: WHERE name = ? AND mobile = ?
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_customers_name_mobile "
+        "ON customers(name, mobile)"
+    )
+    conn.execute("ANALYZE")
+
+
+def _m003_report_index(conn):
+    """Covering index for date-range reports with branch / type breakdowns."""
+    conn.execute("DROP INDEX IF EXISTS idx_entries_date_totals")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_entries_date_report "
+        "ON entries(date, branch, type, qty, total)"
+    )
+    conn.execute("ANALYZE")
+
+
+def _m004_summary_tables(conn):
+    """
+    Materialized per-day / per-month / per-customer totals.
+
+    Triggers on entries keep them current for every write path; the
+    existing rows are folded in once here (see billing/summaries.py
+    for the rebuild command).
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS summary_daily (
+            date TEXT NOT NULL,
+            branch TEXT NOT NULL,
+            type TEXT NOT NULL,
+            bills INTEGER NOT NULL,
+            qty REAL NOT NULL,
+            amount REAL NOT NULL,
+            PRIMARY KEY (date, branch, type)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS summary_monthly (
+            month TEXT NOT NULL,
+            branch TEXT NOT NULL,
+            type TEXT NOT NULL,
+            bills INTEGER NOT NULL,
+            qty REAL NOT NULL,
+            amount REAL NOT NULL,
+            PRIMARY KEY (month, branch, type)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS summary_customer (
+            customer_id INTEGER PRIMARY KEY,
+            bills INTEGER NOT NULL,
+            qty REAL NOT NULL,
+            amount REAL NOT NULL
+        )
+    """)
+
+    add = """
+        INSERT INTO summary_daily (date, branch, type, bills, qty, amount)
+        VALUES (COALESCE(NEW.date, ''), COALESCE(NEW.branch, ''), COALESCE(NEW.type, ''),
+                1, COALESCE(NEW.qty, 0), COALESCE(NEW.total, 0))
+        ON CONFLICT (date, branch, type) DO UPDATE SET
+            bills = bills + 1, qty = qty + excluded.qty, amount = amount + excluded.amount;
+
+        INSERT INTO summary_monthly (month, branch, type, bills, qty, amount)
+        VALUES (substr(COALESCE(NEW.date, ''), 1, 7), COALESCE(NEW.branch, ''), COALESCE(NEW.type, ''),
+                1, COALESCE(NEW.qty, 0), COALESCE(NEW.total, 0))
+        ON CONFLICT (month, branch, type) DO UPDATE SET
+            bills = bills + 1, qty = qty + excluded.qty, amount = amount + excluded.amount;
+
+        INSERT INTO summary_customer (customer_id, bills, qty, amount)
+        SELECT NEW.customer_id, 1, COALESCE(NEW.qty, 0), COALESCE(NEW.total, 0)
+        WHERE NEW.customer_id IS NOT NULL
+        ON CONFLICT (customer_id) DO UPDATE SET
+            bills = bills + 1, qty = qty + excluded.qty, amount = amount + excluded.amount;
+    """
+    remove = """
+        UPDATE summary_daily
+        SET bills = bills - 1, qty = qty - COALESCE(OLD.qty, 0), amount = amount - COALESCE(OLD.total, 0)
+        WHERE date = COALESCE(OLD.date, '') AND branch = COALESCE(OLD.branch, '')
+          AND type = COALESCE(OLD.type, '');
+        DELETE FROM summary_daily
+        WHERE date = COALESCE(OLD.date, '') AND branch = COALESCE(OLD.branch, '')
+          AND type = COALESCE(OLD.type, '') AND bills <= 0;
+
+        UPDATE summary_monthly
+        SET bills = bills - 1, qty = qty - COALESCE(OLD.qty, 0), amount = amount - COALESCE(OLD.total, 0)
+        WHERE month = substr(COALESCE(OLD.date, ''), 1, 7) AND branch = COALESCE(OLD.branch, '')
+          AND type = COALESCE(OLD.type, '');
+        DELETE FROM summary_monthly
+        WHERE month = substr(COALESCE(OLD.date, ''), 1, 7) AND branch = COALESCE(OLD.branch, '')
+          AND type = COALESCE(OLD.type, '') AND bills <= 0;
+
+        UPDATE summary_customer
+        SET bills = bills - 1, qty = qty - COALESCE(OLD.qty, 0), amount = amount - COALESCE(OLD.total, 0)
+        WHERE customer_id = OLD.customer_id;
+        DELETE FROM summary_customer WHERE customer_id = OLD.customer_id AND bills <= 0;
+    """
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_entries_summary_ins "
+                 f"AFTER INSERT ON entries BEGIN {add} END")
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_entries_summary_del "
+                 f"AFTER DELETE ON entries BEGIN {remove} END")
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_entries_summary_upd "
+                 f"AFTER UPDATE OF date, branch, type, qty, total, customer_id ON entries "
+                 f"BEGIN {remove} {add} END")
+
+    for table in ("summary_daily", "summary_monthly", "summary_customer"):
+        conn.execute(f"DELETE FROM {table}")
+    conn.execute("""
+        INSERT INTO summary_daily (date, branch, type, bills, qty, amount)
+        SELECT COALESCE(date, ''), COALESCE(branch, ''), COALESCE(type, ''),
+               COUNT(*), COALESCE(SUM(qty), 0), COALESCE(SUM(total), 0)
+        FROM entries GROUP BY 1, 2, 3
+    """)
+    conn.execute("""
+        INSERT INTO summary_monthly (month, branch, type, bills, qty, amount)
+        SELECT substr(date, 1, 7), branch, type, SUM(bills), SUM(qty), SUM(amount)
+        FROM summary_daily GROUP BY 1, 2, 3
+    """)
+    conn.execute("""
+        INSERT INTO summary_customer (customer_id, bills, qty, amount)
+        SELECT customer_id, COUNT(*), COALESCE(SUM(qty), 0), COALESCE(SUM(total), 0)
+        FROM entries WHERE customer_id IS NOT NULL GROUP BY customer_id
+    """)
+
+
+def _m005_search_index(conn):
+    """
+    FTS5 index over vehicle, branch, type, note and customer name.
+
+    The trigram tokenizer (SQLite 3.34+) gives indexed substring
+    matching; older SQLite builds fall back to word / prefix matching.
+    Triggers keep it in step with entries and customer renames.
+    """
+    try:
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+                vehicle, branch, type, note, customer,
+                tokenize = 'trigram'
+            )
+        """)
+    except sqlite3.OperationalError:
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+                vehicle, branch, type, note, customer,
+                prefix = '2 3 4'
+            )
+        """)
+
+    row = """(NEW.id, COALESCE(NEW.vehicle, ''), COALESCE(NEW.branch, ''),
+              COALESCE(NEW.type, ''), COALESCE(NEW.note, ''),
+              COALESCE((SELECT name FROM customers WHERE id = NEW.customer_id), ''))"""
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_entries_fts_ins AFTER INSERT ON entries BEGIN
+            INSERT INTO entries_fts (rowid, vehicle, branch, type, note, customer) VALUES {row};
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_entries_fts_del AFTER DELETE ON entries BEGIN
+            DELETE FROM entries_fts WHERE rowid = OLD.id;
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_entries_fts_upd
+        AFTER UPDATE OF vehicle, branch, type, note, customer_id ON entries BEGIN
+            DELETE FROM entries_fts WHERE rowid = OLD.id;
+            INSERT INTO entries_fts (rowid, vehicle, branch, type, note, customer) VALUES {row};
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_customers_fts_upd AFTER UPDATE OF name ON customers BEGIN
+            UPDATE entries_fts SET customer = COALESCE(NEW.name, '')
+            WHERE rowid IN (SELECT id FROM entries WHERE customer_id = NEW.id);
+        END
+    """)
+
+    conn.execute("DELETE FROM entries_fts")
+    conn.execute("""
+        INSERT INTO entries_fts (rowid, vehicle, branch, type, note, customer)
+        SELECT e.id, COALESCE(e.vehicle, ''), COALESCE(e.branch, ''), COALESCE(e.type, ''),
+               COALESCE(e.note, ''), COALESCE(c.name, '')
+        FROM entries e LEFT JOIN customers c ON c.id = e.customer_id
+    """)
+    conn.execute("INSERT INTO entries_fts (entries_fts) VALUES ('optimize')")
+
+
+def _m006_invoice_register(conn):
+    """
+    Issued invoices and the entries on each.
+
+    invoices.id is the invoice sequence. It is a plain INTEGER PRIMARY
+    KEY (no AUTOINCREMENT): SQLite hands out max(id) + 1 under the write
+    lock, so concurrent writers never get the same number and a rolled
+    back issue leaves no gap. The header is stored so an invoice can be
+    reprinted exactly; the lines are re-read through invoice_entries.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS invoices (
+            id INTEGER PRIMARY KEY,
+            customer_id INTEGER,
+            customer_name TEXT NOT NULL DEFAULT '',
+            customer_mobile TEXT NOT NULL DEFAULT '',
+            customer_address TEXT NOT NULL DEFAULT '',
+            date TEXT NOT NULL DEFAULT '',
+            vehicle TEXT NOT NULL DEFAULT '',
+            branch TEXT NOT NULL DEFAULT '',
+            type TEXT NOT NULL DEFAULT '',
+            total REAL NOT NULL DEFAULT 0,
+            folder TEXT NOT NULL,
+            issued TEXT NOT NULL DEFAULT (datetime('now', 'localtime'))
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS invoice_entries (
+            invoice_id INTEGER NOT NULL,
+            entry_id INTEGER NOT NULL,
+            PRIMARY KEY (invoice_id, entry_id)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_invoice_entries_entry ON invoice_entries(entry_id)")
+
+
+def _rebuild_table(conn, table, create, select):
+    """
+    Replace `table` with one made by `create` (a CREATE TABLE for
+    {table}), filled by `select` (a SELECT over the old table). Its
+    indexes, triggers and AUTOINCREMENT counter are carried over -
+    SQLite's recipe for changing column types.
+    """
+    saved = [sql for (sql,) in conn.execute(
+        "SELECT sql FROM sqlite_master WHERE tbl_name = ? AND type IN ('index', 'trigger') "
+        "AND sql IS NOT NULL", (table,)
+    )]
+    seq = None
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_sequence'").fetchone():
+        seq = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()
+
+    conn.execute(create.format(table=f"{table}_new"))
+    conn.execute(f"INSERT INTO {table}_new {select}")
+    conn.execute(f"DROP TABLE {table}")
+    # other tables' triggers name `table`; don't let RENAME re-check them
+    # while it is missing
+    conn.execute("PRAGMA legacy_alter_table = ON")
+    try:
+        conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+    finally:
+        conn.execute("PRAGMA legacy_alter_table = OFF")
+    for sql in saved:
+        conn.execute(sql)
+    if seq is not None and not conn.execute(
+        "UPDATE sqlite_sequence SET seq = max(seq, ?) WHERE name = ?", (seq[0], table)
+    ).rowcount:
+        conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (table, seq[0]))
+
+
+def _m007_fixed_point(conn):
+    """
+    Integer money and quantities: amounts in paise, qty in grams.
+
+    REAL sums drift by paise over a month of bills; integer SUMs are
+    exact. entries and invoices are rebuilt with INTEGER columns (the
+    conversion rounds half up, see billing.money) and the summary
+    tables are recreated and refilled from the converted entries.
+    """
+    conn.create_function("paise", 1, money.paise, deterministic=True)
+    conn.create_function("grams", 1, money.grams, deterministic=True)
+
+    _rebuild_table(conn, "entries", """
+        CREATE TABLE {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT,
+            customer_id INTEGER,
+            vehicle TEXT,
+            branch TEXT,
+            type TEXT,
+            qty INTEGER,       -- grams
+            rate INTEGER,      -- paise per kg
+            labour INTEGER,    -- paise per kg
+            advance INTEGER,   -- paise
+            pre INTEGER,       -- paise
+            total INTEGER,     -- paise
+            note TEXT
+        )
+    """, """
+        SELECT id, date, customer_id, vehicle, branch, type,
+               grams(qty), paise(rate), paise(labour), paise(advance), paise(pre), paise(total),
+               note
+        FROM entries
+    """)
+
+    _rebuild_table(conn, "invoices", """
+        CREATE TABLE {table} (
+            id INTEGER PRIMARY KEY,
+            customer_id INTEGER,
+            customer_name TEXT NOT NULL DEFAULT '',
+            customer_mobile TEXT NOT NULL DEFAULT '',
+            customer_address TEXT NOT NULL DEFAULT '',
+            date TEXT NOT NULL DEFAULT '',
+            vehicle TEXT NOT NULL DEFAULT '',
+            branch TEXT NOT NULL DEFAULT '',
+            type TEXT NOT NULL DEFAULT '',
+            total INTEGER NOT NULL DEFAULT 0,   -- paise
+            folder TEXT NOT NULL,
+            issued TEXT NOT NULL DEFAULT (datetime('now', 'localtime'))
+        )
+    """, """
+        SELECT id, customer_id, customer_name, customer_mobile, customer_address,
+               date, vehicle, branch, type, paise(total), folder, issued
+        FROM invoices
+    """)
+
+    # summaries: same keys, INTEGER totals, refilled from the exact entries
+    conn.execute("DROP TABLE summary_daily")
+    conn.execute("DROP TABLE summary_monthly")
+    conn.execute("DROP TABLE summary_customer")
+    conn.execute("""
+        CREATE TABLE summary_daily (
+            date TEXT NOT NULL,
+            branch TEXT NOT NULL,
+            type TEXT NOT NULL,
+            bills INTEGER NOT NULL,
+            qty INTEGER NOT NULL,
+            amount INTEGER NOT NULL,
+            PRIMARY KEY (date, branch, type)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TABLE summary_monthly (
+            month TEXT NOT NULL,
+            branch TEXT NOT NULL,
+            type TEXT NOT NULL,
+            bills INTEGER NOT NULL,
+            qty INTEGER NOT NULL,
+            amount INTEGER NOT NULL,
+            PRIMARY KEY (month, branch, type)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TABLE summary_customer (
+            customer_id INTEGER PRIMARY KEY,
+            bills INTEGER NOT NULL,
+            qty INTEGER NOT NULL,
+            amount INTEGER NOT NULL
+        )
+    """)
+    conn.execute("""
+        INSERT INTO summary_daily (date, branch, type, bills, qty, amount)
+        SELECT COALESCE(date, ''), COALESCE(branch, ''), COALESCE(type, ''),
+               COUNT(*), COALESCE(SUM(qty), 0), COALESCE(SUM(total), 0)
+        FROM entries GROUP BY 1, 2, 3
+    """)
+    conn.execute("""
+        INSERT INTO summary_monthly (month, branch, type, bills, qty, amount)
+        SELECT substr(date, 1, 7), branch, type, SUM(bills), SUM(qty), SUM(amount)
+        FROM summary_daily GROUP BY 1, 2, 3
+    """)
+    conn.execute("""
+        INSERT INTO summary_customer (customer_id, bills, qty, amount)
+        SELECT customer_id, COUNT(*), COALESCE(SUM(qty), 0), COALESCE(SUM(total), 0)
+        FROM entries WHERE customer_id IS NOT NULL GROUP BY customer_id
+    """)
+    conn.execute("ANALYZE")
+
+
+def _m008_blank_dates(conn):
+    """
+    Entries without a date get '' instead of NULL, and triggers keep it so.
+
+    Ledger paging compares (date, id) row values, which are NULL for a
+    NULL date, so such rows could never be paged to. '' sorts where NULL
+    did (below every date) and is what the summary tables already file
+    them under.
+    """
+    conn.execute("UPDATE entries SET date = '' WHERE date IS NULL")
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_entries_date_ins
+        AFTER INSERT ON entries WHEN NEW.date IS NULL BEGIN
+            UPDATE entries SET date = '' WHERE id = NEW.id;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_entries_date_upd
+        AFTER UPDATE OF date ON entries WHEN NEW.date IS NULL BEGIN
+            UPDATE entries SET date = '' WHERE id = NEW.id;
+        END
+    """)
+
+
+def _m009_invoice_sequence(conn):
+    """
+    invoices.id becomes AUTOINCREMENT, so an invoice number is never reused.
+
+    With a plain INTEGER PRIMARY KEY, deleting the newest invoice gave its
+    number to the next one. sqlite_sequence now remembers the highest
+    number issued. Numbers still come from the write transaction, so a
+    rolled back issue leaves no gap. The counter starts at the highest id
+    in invoices or invoice_entries, so a newest invoice deleted before
+    this migration is not reissued either. Ids are copied as they are,
+    so invoice_entries still points at the same invoices.
+    """
+    _rebuild_table(conn, "invoices", """
+        CREATE TABLE {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            customer_id INTEGER,
+            customer_name TEXT NOT NULL DEFAULT '',
+            customer_mobile TEXT NOT NULL DEFAULT '',
+            customer_address TEXT NOT NULL DEFAULT '',
+            date TEXT NOT NULL DEFAULT '',
+            vehicle TEXT NOT NULL DEFAULT '',
+            branch TEXT NOT NULL DEFAULT '',
+            type TEXT NOT NULL DEFAULT '',
+            total INTEGER NOT NULL DEFAULT 0,   -- paise
+            folder TEXT NOT NULL,
+            issued TEXT NOT NULL DEFAULT (datetime('now', 'localtime'))
+        )
+    """, """
+        SELECT id, customer_id, customer_name, customer_mobile, customer_address,
+               date, vehicle, branch, type, total, folder, issued
+        FROM invoices
+    """)
+    last, = conn.execute("""
+        SELECT max(COALESCE((SELECT max(id) FROM invoices), 0),
+                   COALESCE((SELECT max(invoice_id) FROM invoice_entries), 0))
+    """).fetchone()
+    if not conn.execute("UPDATE sqlite_sequence SET seq = max(seq, ?) WHERE name = 'invoices'",
+                        (last,)).rowcount:
+        conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('invoices', ?)", (last,))
+
+
+MIGRATIONS = [
+    _m001_base_tables,
+    _m002_lookup_indexes,
+    _m003_report_index,
+    _m004_summary_tables,
+    _m005_search_index,
+    _m006_invoice_register,
+    _m007_fixed_point,
+    _m008_blank_dates,
+    _m009_invoice_sequence,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+# ==========================================================
+#                 PUBLIC API
+# ==========================================================
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn, target=SCHEMA_VERSION):
+    """
+    Bring `conn` up to schema version `target`.
+
+    Returns the version the database was at before migrating.
+    """
+    current = schema_version(conn)
+    if current > SCHEMA_VERSION:
+        raise SchemaError(
+            f"Database schema v{current} is newer than this app (v{SCHEMA_VERSION})."
+        )
+
+    if conn.in_transaction:
+        conn.commit()
+
+    for version in range(current, target):
+        conn.execute("BEGIN")
+        try:
+            MIGRATIONS[version](conn)
+            conn.execute(f"PRAGMA user_version = {version + 1}")
+        except Exception:
+            conn.rollback()
+            raise
+        conn.commit()
+
+    return current
+
+
+def configure(conn):
+    for name, value in PRAGMAS:
+        conn.execute(f"PRAGMA {name} = {value}")
+
+
+def connect(path=DB_NAME):
+    """
+    Open the billing database, apply PRAGMAS and migrate the schema.
+    With diagnostics enabled every statement on it is timed.
+    """
+    conn = sqlite3.connect(path, factory=diagnostics.connection_factory())
+    configure(conn)
+    migrate(conn)
+    return conn
@@ -0,0 +1,365 @@
+"""
+Operation timings: latency histograms and a slow-operation log.
+
+Once enable() has been called (app.py does), every timed operation is
+recorded under a (kind, name) pair:
+
+    sql    one statement run through a connection from db.connect(),
+           named by its normalized text. The time is what execute()
+           and the fetches took, summed until the last row is fetched
+           (not the caller's work in between); the row count goes with it
+    ui     a Tk callback (button, menu, key binding, after()), named by
+           its function; app.py routes them through wrap()
+    task   a TaskRunner job on a worker thread, named by its function
+
+Each pair keeps a histogram with logarithmic buckets, so p50 / p95 /
+p99 are estimates within one bucket (about 20%). The memory used is
+fixed however many operations run. stats() returns the table the
+Diagnostics window shows.
+
+An operation that takes at least SLOW_MS is also written to
+slow_operations.log, a rotating file (LOG_BYTES × LOG_BACKUPS). Slow
+queries are logged with their parameters and EXPLAIN QUERY PLAN,
+captured on the same connection once the statement has finished, at
+most once per query per PLAN_EVERY seconds.
+"""
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from logging.handlers import RotatingFileHandler
+
+SLOW_MS = 250          # log operations slower than this
+LOG_FILE = "slow_operations.log"
+LOG_BYTES = 1_000_000
+LOG_BACKUPS = 3
+PLAN_EVERY = 60        # seconds between plans for the same slow query
+MAX_NAMES = 1000       # distinct (kind, name) pairs before the rest share one
+
+# bucket i covers (BASE_MS * GROWTH**(i-1), BASE_MS * GROWTH**i] ms
+BASE_MS = 0.01
+GROWTH = 1.2
+BUCKETS = 100          # up to about 10 minutes
+
+_enabled = False
+_lock = threading.Lock()
+_stats = {}            # (kind, name) -> Histogram
+_planned = {}          # normalized sql -> time of the last EXPLAIN QUERY PLAN
+_log = None
+
+
+def enable(on=True):
+    """Time connections opened by db.connect() from now on (the app turns this on)."""
+    global _enabled
+    _enabled = on
+
+
+def enabled():
+    return _enabled
+
+
+def connection_factory():
+    return TimedConnection if _enabled else sqlite3.Connection
+
+
+# ==========================================================
+#                 HISTOGRAMS
+# ==========================================================
+
+def _bucket(ms):
+    if ms <= BASE_MS:
+        return 0
+    return min(BUCKETS - 1, math.ceil(math.log(ms / BASE_MS, GROWTH)))
+
+
+def _bound(i):
+    return BASE_MS * GROWTH ** i
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "total_ms", "max_ms", "rows")
+
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+
+    def add(self, ms, rows=0):
+        self.counts[_bucket(ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.rows += rows
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile (ms), capped at max."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(p / 100 * self.count))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(_bound(i), self.max_ms)
+        return self.max_ms
+
+
+def record(kind, name, ms, rows=0):
+    key = (kind, name)
+    with _lock:
+        h = _stats.get(key)
+        if h is None:
+            if len(_stats) >= MAX_NAMES:
+                key = (kind, "(other)")
+                h = _stats.get(key)
+            if h is None:
+                h = _stats[key] = Histogram()
+        h.add(ms, rows)
+
+
+def stats():
+    """[(kind, name, count, p50, p95, p99, max, mean rows)] - times in ms, slowest p99 first."""
+    with _lock:
+        rows = [
+            (kind, name, h.count, h.percentile(50), h.percentile(95), h.percentile(99),
+             h.max_ms, h.rows / h.count if h.count else 0)
+            for (kind, name), h in _stats.items()
+        ]
+    rows.sort(key=lambda r: -r[5])
+    return rows
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+        _planned.clear()
+
+
+# ==========================================================
+#                 SLOW-OPERATION LOG
+# ==========================================================
+
+def _logger():
+    global _log
+    if _log is None:
+        log = logging.getLogger("billing.slow")
+        log.propagate = False
+        if not log.handlers:
+            handler = RotatingFileHandler(LOG_FILE, maxBytes=LOG_BYTES,
+                                          backupCount=LOG_BACKUPS, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            log.addHandler(handler)
+        log.setLevel(logging.INFO)
+        _log = log
+    return _log
+
+
+def slow(kind, name, ms, rows=0, detail=""):
+    text = f"{kind} {ms:.1f} ms rows={rows} [{threading.current_thread().name}] {name}"
+    try:
+        _logger().info(text + (("\n" + detail) if detail else ""))
+    except OSError:
+        pass   # a read-only folder must not break the operation being timed
+
+
+def observe(kind, name, ms, rows=0, detail=""):
+    """Record one operation, and log it if it was slow. Does nothing until enable()."""
+    if not _enabled:
+        return
+    record(kind, name, ms, rows)
+    if ms >= SLOW_MS:
+        slow(kind, name, ms, rows, detail() if callable(detail) else detail)
+
+
+@contextmanager
+def timed(kind, name):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(kind, name, (time.perf_counter() - t0) * 1000)
+
+
+def callback_name(fn):
+    """A readable name for a callback: its qualified name, or file:line for a lambda."""
+    fn = getattr(fn, "func", fn)            # functools.partial
+    fn = getattr(fn, "__func__", fn)        # bound method
+    code = getattr(fn, "__code__", None)
+    name = getattr(fn, "__qualname__", None) or repr(fn)
+    if name.endswith("after.<locals>.callit"):   # tkinter's after() keeps only the __name__
+        return f"after: {fn.__name__}"
+    if "<lambda>" in name and code is not None:
+        return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return name
+
+
+def wrap(fn, kind="ui"):
+    """fn, timed under callback_name(fn)."""
+    name = callback_name(fn)
+
+    def timed_call(*args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            observe(kind, name, (time.perf_counter() - t0) * 1000)
+
+    return timed_call
+
+
+# ==========================================================
+#                 SQL
+# ==========================================================
+
+_SPACE = re.compile(r"\s+")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+@lru_cache(maxsize=1024)   # the app runs the same few hundred statements over and over
+def normalize(sql):
+    """One line per query shape: whitespace collapsed, IN (?,?,...) and literals folded."""
+    sql = _SPACE.sub(" ", sql).strip()
+    sql = _IN_LIST.sub("(?…)", sql)
+    return _LITERAL.sub("?", sql)
+
+
+def _explain(conn, sql, params):
+    key = normalize(sql)
+    now = time.monotonic()
+    with _lock:
+        if now - _planned.get(key, -PLAN_EVERY) < PLAN_EVERY:
+            return "  (plan logged recently)"
+        _planned[key] = now
+    try:
+        cur = sqlite3.Connection.cursor(conn)   # plain cursor: not timed itself
+        plan = cur.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    except sqlite3.Error as exc:
+        return f"  (no plan: {exc})"
+    return "\n".join(f"  {'  ' * _depth(plan, row)}{row[-1]}" for row in plan)
+
+
+def _depth(plan, row):
+    parents = {r[0]: r[1] for r in plan}
+    depth, parent = 0, row[1]
+    while parent in parents and depth < 20:
+        depth, parent = depth + 1, parents[parent]
+    return depth
+
+
+class TimedCursor(sqlite3.Cursor):
+    """
+    A cursor that records each statement with its row count. The time is
+    spent inside execute() and the fetch calls, added up until the last
+    row is fetched (or the next execute / close). The caller's work
+    between fetches - writing a batch of an export, say - is not SQL
+    time and is left out.
+    """
+
+    _sql = None
+
+    def _begin(self, sql, params, ms):
+        self._sql, self._params = sql, params
+        self._ms, self._rows = ms, 0
+        if self.description is None:   # no result rows: done already
+            self._end(max(self.rowcount, 0))
+
+    def _end(self, rows=0):
+        sql, self._sql = self._sql, None
+        if sql is None:
+            return
+        rows += self._rows
+        params = self._params
+        observe("sql", normalize(sql), self._ms, rows,
+                lambda: f"  params: {params!r}\n" + _explain(self.connection, sql, params))
+
+    def _fetched(self, t0, rows):
+        if self._sql is not None:
+            self._ms += (time.perf_counter() - t0) * 1000
+            self._rows += rows
+
+    def execute(self, sql, params=()):
+        self._end()
+        t0 = time.perf_counter()
+        try:
+            super().execute(sql, params)
+        except BaseException:
+            observe("sql", normalize(sql), (time.perf_counter() - t0) * 1000)
+            raise
+        self._begin(sql, params, (time.perf_counter() - t0) * 1000)
+        return self
+
+    def executemany(self, sql, seq):
+        self._end()
+        t0 = time.perf_counter()
+        try:
+            super().executemany(sql, seq)
+        finally:
+            observe("sql", normalize(sql) + "  [many]", (time.perf_counter() - t0) * 1000,
+                    max(self.rowcount, 0))
+        return self
+
+    def fetchone(self):
+        t0 = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(t0, row is not None)
+        if row is None:
+            self._end()
+        return row
+
+    def fetchmany(self, size=None):
+        t0 = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(t0, len(rows))
+        if not rows:
+            self._end()
+        return rows
+
+    def fetchall(self):
+        t0 = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(t0, len(rows))
+        self._end()
+        return rows
+
+    def __next__(self):
+        t0 = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(t0, 0)
+            self._end()
+            raise
+        self._fetched(t0, 1)
+        return row
+
+    def close(self):
+        self._end()
+        super().close()
+
+    def __del__(self):
+        # conn.execute(...).fetchone() drops the cursor with rows left
+        try:
+            self._end()
+        except Exception:
+            pass
+
+
+class TimedConnection(sqlite3.Connection):
+    """sqlite3.Connection whose execute() and cursor() give TimedCursors."""
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, params=()):
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql, seq):
+        return self.cursor().executemany(sql, seq)
@@ -0,0 +1,226 @@
+"""
+Line-item math, entry writes and ledger queries.
+
+insert_entry() only executes the INSERT - the caller decides when to
+commit. DraftBill keeps the line items of one bill in memory and writes
+them all in a single transaction when the bill is finalized, so a
+truck's worth of items costs one commit instead of one per line.
+
+Ledger rows (LEDGER_SELECT) are (id, date, customer name, vehicle,
+branch, type, qty, rate, labour, advance, pre, total, note) and are
+paged by keyset on (date, id), newest first. qty is stored in grams
+and the amounts in paise (see billing.money); rows returned from here
+carry them as Qty / Money.
+"""
+from billing.money import Money, Qty
+
+ENTRY_FIELDS = (
+    "date", "customer_id", "vehicle", "branch", "type",
+    "qty", "rate", "labour", "advance", "pre", "total", "note",
+)
+
+INSERT_ENTRY = (
+    f"INSERT INTO entries ({', '.join(ENTRY_FIELDS)}) "
+    f"VALUES ({','.join('?' * len(ENTRY_FIELDS))})"
+)
+
+TOTAL = ENTRY_FIELDS.index("total")
+
+CALC_MODES = (
+    "Rate × Qty + Labour × Qty",
+    "Rate × Qty Only",
+    "Labour × Qty Only",
+)
+
+LEDGER_SELECT = """
+    SELECT e.id,
+           e.date,
+           COALESCE(c.name, ''),
+           e.vehicle,
+           e.branch,
+           e.type,
+           e.qty,
+           e.rate,
+           e.labour,
+           e.advance,
+           e.pre,
+           e.total,
+           e.note
+    FROM entries e
+    LEFT JOIN customers c ON e.customer_id = c.id
+"""
+
+# qty, rate, labour, advance, pre, total - the fixed-point columns, in order
+LINE_TYPES = (Qty, Money, Money, Money, Money, Money)
+
+LEDGER_NUMBERS = ("qty", "pre", "advance", "total")
+
+
+def fixed(values):
+    """Stored qty..total integers as Qty / Money (NULL stays None)."""
+    return tuple(None if v is None else t(v) for t, v in zip(LINE_TYPES, values))
+
+
+def ledger_row(row):
+    """A LEDGER_SELECT row as fetched, with its fixed-point columns typed."""
+    return row[:6] + fixed(row[6:12]) + row[12:]
+
+
+def ledger_numbers(row):
+    """The LEDGER_NUMBERS columns of a ledger row (NULL counts as 0)."""
+    return (row[6] or Qty(), row[10] or Money(), row[9] or Money(), row[11] or Money())
+
+
+# ids per DELETE / SELECT ... IN (...) statement, under SQLite's variable limit
+ID_CHUNK = 500
+
+
+# ==========================================================
+#                 LINE-ITEM MATH
+# ==========================================================
+
+def calculate_pre_total(rate, qty, labour, mode):
+    """
+    Money for `qty` (Qty) at `rate` and `labour` (Money per kg), rounded
+    half up to the paisa once per line.
+    """
+    if mode == "Rate × Qty + Labour × Qty":
+        return (rate + labour) * qty
+    elif mode == "Rate × Qty Only":
+        return rate * qty
+    elif mode == "Labour × Qty Only":
+        return labour * qty
+    else:
+        return (rate + labour) * qty
+
+
+def make_entry(date, customer_id, vehicle, branch, type_, qty, rate, labour,
+               advance, mode, note=""):
+    """
+    An entry row in ENTRY_FIELDS order, with pre / total computed.
+    qty is in kg and rate / labour / advance in rupees - Qty / Money,
+    or anything their parse() accepts.
+    """
+    qty = Qty.parse(qty)
+    rate, labour, advance = Money.parse(rate), Money.parse(labour), Money.parse(advance)
+    pre = calculate_pre_total(rate, qty, labour, mode)
+    return (
+        date, customer_id, vehicle, branch, type_,
+        qty, rate, labour, advance, pre, pre - advance, note
+    )
+
+
+# ==========================================================
+#                 WRITES
+# ==========================================================
+
+
+def insert_entry(conn, row):
+    """INSERT one entry row (ENTRY_FIELDS order); returns its id."""
+    return conn.execute(INSERT_ENTRY, row).lastrowid
+
+
+class DraftBill:
+    """Line items accumulated in memory until the bill is finalized."""
+
+    def __init__(self):
+        self.items = []
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def total(self):
+        return sum(row[TOTAL] for row in self.items)
+
+    def add(self, row):
+        self.items.append(tuple(row))
+
+    def discard(self):
+        self.items.clear()
+
+    def finalize(self, conn):
+        """Write every item in one transaction; returns the new entry ids."""
+        ids = insert_entries(conn, self.items)
+        self.items.clear()
+        return ids
+
+    def take(self):
+        """Remove and return every item, for a write made elsewhere (see restore())."""
+        items, self.items = self.items, []
+        return items
+
+    def restore(self, rows):
+        """Put back items from take() whose write failed, ahead of any added since."""
+        self.items[:0] = rows
+
+
+def insert_entries(conn, rows):
+    """Insert `rows` in one transaction (committed); returns the new ids."""
+    with conn:
+        return [insert_entry(conn, row) for row in rows]
+
+
+def delete_entries(conn, ids):
+    """Delete entries by id in one transaction; returns the number removed."""
+    ids = list(ids)
+    removed = 0
+    with conn:
+        for i in range(0, len(ids), ID_CHUNK):
+            chunk = ids[i:i + ID_CHUNK]
+            removed += conn.execute(
+                f"DELETE FROM entries WHERE id IN ({','.join('?' * len(chunk))})",
+                chunk
+            ).rowcount
+    return removed
+
+
+# ==========================================================
+#                 QUERIES
+# ==========================================================
+
+def ledger_page(conn, where="", params=(), key=None, older=True, limit=200):
+    """
+    One keyset page of ledger rows, always returned newest first.
+
+    `key` is the (date, id) of the row to continue from; `older` pages
+    go down the ledger from it, otherwise up. Returns (rows, more).
+    """
+    conds = [f"({where})"] if where else []
+    params = list(params)
+    if key is not None:
+        conds.append("(e.date, e.id) < (?, ?)" if older else "(e.date, e.id) > (?, ?)")
+        params.extend(key)
+
+    order = "DESC" if older else "ASC"
+    q = LEDGER_SELECT
+    if conds:
+        q += " WHERE " + " AND ".join(conds)
+    q += f" ORDER BY e.date {order}, e.id {order} LIMIT ?"
+    params.append(limit + 1)   # one extra row tells us if more exist
+
+    rows = [ledger_row(r) for r in conn.execute(q, params)]
+    more = len(rows) > limit
+    rows = rows[:limit]
+    if not older:
+        rows.reverse()
+    return rows, more
+
+
+def customer_filter(customer_id):
+    """ledger_page() filter for one customer's history (idx_entries_customer)."""
+    return "e.customer_id = ?", [customer_id]
+
+
+def get_entries(conn, ids, where="", params=()):
+    """Ledger rows for `ids` that also match `where`, in the order given."""
+    ids = [int(i) for i in ids]
+    found = {}
+    for i in range(0, len(ids), ID_CHUNK):
+        chunk = ids[i:i + ID_CHUNK]
+        q = LEDGER_SELECT + f" WHERE e.id IN ({','.join('?' * len(chunk))})"
+        if where:
+            q += f" AND ({where})"
+        for row in conn.execute(q, chunk + list(params)):
+            found[row[0]] = ledger_row(row)
+    return [found[i] for i in ids if i in found]
@@ -0,0 +1,184 @@
+"""
+Streaming export of the ledger and daily summaries.
+
+Rows are pulled from one cursor with fetchmany() and written batch by
+batch, so memory use stays constant however large the database is.
+The entries export uses the ledger columns in chronological order.
+Qty is exported in kg and amounts in rupees. They are converted from
+the stored grams / paise in SQL, and the resulting double is the
+nearest one to the exact value, so CSV shows it exactly.
+
+    .csv       plain CSV, UTF-8 with BOM so Excel opens it correctly
+    .parquet   columnar, one row group per batch (needs pyarrow)
+
+    python -m billing.exporter ledger.parquet --from 2025-04-01 --to 2026-03-31
+"""
+import argparse
+import csv
+import importlib.util
+import os
+
+from billing.money import Money, Qty
+
+BATCH_SIZE = 10000
+
+ENTRY_HEADER = (
+    "ID", "Date", "Customer", "Vehicle", "Branch", "Type",
+    "Qty", "Rate", "Labour", "Advance", "PreTotal", "Total", "Note",
+)
+ENTRY_TYPES = ("int", "str", "str", "str", "str", "str",
+               "float", "float", "float", "float", "float", "float", "str")
+
+KG = f"{Qty.SCALE}.0"
+RUPEE = f"{Money.SCALE}.0"
+
+ENTRY_SELECT = f"""
+    SELECT e.id, e.date, COALESCE(c.name, ''), e.vehicle, e.branch, e.type,
+           e.qty / {KG}, e.rate / {RUPEE}, e.labour / {RUPEE},
+           e.advance / {RUPEE}, e.pre / {RUPEE}, e.total / {RUPEE},
+           e.note
+    FROM entries e
+    LEFT JOIN customers c ON e.customer_id = c.id
+"""
+
+SUMMARY_SELECT = f"""
+    SELECT date, branch, type, bills, qty / {KG}, amount / {RUPEE}
+    FROM summary_daily
+"""
+SUMMARY_HEADER = ("Date", "Branch", "Type", "Bills", "Qty", "Amount")
+SUMMARY_TYPES = ("str", "str", "str", "int", "float", "float")
+
+
+def export_filter(start=None, end=None, branch=None, customer_id=None, prefix="e."):
+    """(where, params) for an inclusive date range, exact branch and customer."""
+    conds = []
+    params = []
+    if start:
+        conds.append(f"{prefix}date >= ?")
+        params.append(start)
+    if end:
+        conds.append(f"{prefix}date <= ?")
+        params.append(end)
+    if branch:
+        conds.append(f"{prefix}branch = ?")
+        params.append(branch)
+    if customer_id is not None:
+        conds.append(f"{prefix}customer_id = ?")
+        params.append(customer_id)
+    return " AND ".join(conds), params
+
+
+def iter_batches(conn, select, where="", params=(), order="", batch_size=BATCH_SIZE):
+    q = select + (f" WHERE {where}" if where else "") + (f" ORDER BY {order}" if order else "")
+    cur = conn.execute(q, list(params))
+    while True:
+        rows = cur.fetchmany(batch_size)
+        if not rows:
+            return
+        yield rows
+
+
+# ==========================================================
+#                 WRITERS
+# ==========================================================
+
+def write_csv(path, header, batches, progress=None):
+    written = 0
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        for rows in batches:
+            w.writerows(rows)
+            written += len(rows)
+            if progress:
+                progress(written)
+    return written
+
+
+def parquet_available():
+    """True if pyarrow can be imported (it is an optional dependency)."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def file_types():
+    """Save-dialog file types: CSV, plus Parquet when pyarrow is installed."""
+    types = [("CSV", "*.csv")]
+    if parquet_available():
+        types.append(("Parquet (columnar)", "*.parquet"))
+    return types
+
+
+def write_parquet(path, header, types, batches, progress=None):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow).")
+
+    arrow = {"int": pa.int64(), "float": pa.float64(), "str": pa.string()}
+    schema = pa.schema([(name, arrow[t]) for name, t in zip(header, types)])
+
+    written = 0
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        for rows in batches:
+            columns = list(zip(*rows))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(col, type=schema.field(i).type) for i, col in enumerate(columns)],
+                schema=schema
+            ))
+            written += len(rows)
+            if progress:
+                progress(written)
+    return written
+
+
+def _write(path, header, types, batches, progress):
+    if os.path.splitext(path)[1].lower() == ".parquet":
+        return write_parquet(path, header, types, batches, progress)
+    return write_csv(path, header, batches, progress)
+
+
+# ==========================================================
+#                 EXPORTS
+# ==========================================================
+
+def export_entries(conn, path, start=None, end=None, branch=None, customer_id=None,
+                   batch_size=BATCH_SIZE, progress=None):
+    """Write the filtered ledger to `path` (.csv / .parquet); returns rows written."""
+    where, params = export_filter(start, end, branch, customer_id)
+    batches = iter_batches(conn, ENTRY_SELECT, where, params, "e.date, e.id", batch_size)
+    return _write(path, ENTRY_HEADER, ENTRY_TYPES, batches, progress)
+
+
+def export_daily_summary(conn, path, start=None, end=None, branch=None,
+                         batch_size=BATCH_SIZE, progress=None):
+    """Per-day / branch / type totals for the range; returns rows written."""
+    where, params = export_filter(start, end, branch, prefix="")
+    batches = iter_batches(conn, SUMMARY_SELECT, where, params, "date, branch, type", batch_size)
+    return _write(path, SUMMARY_HEADER, SUMMARY_TYPES, batches, progress)
+
+
+def main():
+    from billing import db
+
+    ap = argparse.ArgumentParser(description="Export entries or daily summaries.")
+    ap.add_argument("file", help="output .csv or .parquet")
+    ap.add_argument("--db", default=db.DB_NAME)
+    ap.add_argument("--from", dest="start")
+    ap.add_argument("--to", dest="end")
+    ap.add_argument("--branch")
+    ap.add_argument("--customer", type=int)
+    ap.add_argument("--summary", action="store_true", help="export daily summary rows")
+    args = ap.parse_args()
+
+    conn = db.connect(args.db)
+    if args.summary:
+        n = export_daily_summary(conn, args.file, args.start, args.end, args.branch)
+    else:
+        n = export_entries(conn, args.file, args.start, args.end, args.branch, args.customer)
+    print(f"Wrote {n:,} rows to {args.file}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
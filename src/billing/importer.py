@@ -0,0 +1,261 @@
+"""
+Bulk import of historical entries from CSV or XLSX.
+
+Rows are streamed from the file and written in chunks: each chunk is
+one executemany() in one transaction. Customers are resolved by
+(name, mobile) through a CustomerCache instead of a query per row, and
+pre / total are computed with entries.calculate_pre_total exactly like
+add_item(). Rows that cannot be imported are written, with the reason,
+to a "<file>_rejected.csv" next to the input.
+
+    python -m billing.importer slips.xlsx [--db ms_traders_billing.db]
+
+Columns are matched by header name (case-insensitive, see COLUMNS);
+date, qty and rate are required.
+"""
+import argparse
+import csv
+import os
+from dataclasses import dataclass
+from datetime import date, datetime
+
+from billing.customers import CustomerCache
+from billing.entries import CALC_MODES, INSERT_ENTRY, make_entry
+from billing.money import Money, Qty
+
+CHUNK_SIZE = 5000
+
+# field -> accepted header names (lower-case)
+COLUMNS = {
+    "date": ("date", "bill date"),
+    "name": ("customer", "name", "customer name"),
+    "mobile": ("mobile", "phone", "mobile no"),
+    "address": ("address",),
+    "vehicle": ("vehicle", "vehicle no", "truck"),
+    "branch": ("branch",),
+    "type": ("type", "item"),
+    "qty": ("qty", "quantity", "quantity (kg)"),
+    "rate": ("rate",),
+    "labour": ("labour", "labour / kg", "labor"),
+    "advance": ("advance",),
+    "note": ("note", "notes", "remarks"),
+    "mode": ("mode", "calc mode"),
+}
+REQUIRED = ("date", "qty", "rate")
+
+DATE_FORMATS = ("%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y", "%d.%m.%Y", "%Y/%m/%d")
+
+
+@dataclass
+class ImportResult:
+    read: int = 0
+    imported: int = 0
+    rejected: int = 0
+    customers_created: int = 0
+    rejects_path: str = None
+
+
+# ==========================================================
+#                 READERS (streaming)
+# ==========================================================
+
+def _csv_rows(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        yield from csv.reader(f)
+
+
+def _xlsx_rows(path):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise RuntimeError("Reading .xlsx files needs openpyxl (pip install openpyxl).")
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for row in wb.active.iter_rows(values_only=True):
+            yield ["" if v is None else v for v in row]
+    finally:
+        wb.close()
+
+
+def read_rows(path):
+    """Header row followed by data rows, read lazily."""
+    if os.path.splitext(path)[1].lower() in (".xlsx", ".xlsm"):
+        return _xlsx_rows(path)
+    return _csv_rows(path)
+
+
+# ==========================================================
+#                 PARSING
+# ==========================================================
+
+def map_columns(header):
+    """field -> column index for the recognised headers."""
+    names = [str(h).strip().lower() for h in header]
+    mapping = {}
+    for field_name, aliases in COLUMNS.items():
+        for i, name in enumerate(names):
+            if name in aliases:
+                mapping[field_name] = i
+                break
+    missing = [f for f in REQUIRED if f not in mapping]
+    if missing:
+        raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+    return mapping
+
+
+def parse_date(value):
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    text = str(value).strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            pass
+    raise ValueError(f"bad date {text!r}")
+
+
+def parse_number(value, name, kind=Money, default=None):
+    """`value` (kg / rupees, text or a spreadsheet number) as a `kind`."""
+    if not isinstance(value, (int, float)):
+        value = str(value).strip()
+        if not value:
+            if default is None:
+                raise ValueError(f"{name} is empty")
+            return default
+    try:
+        return kind.parse(value)
+    except ValueError:
+        raise ValueError(f"bad {name} {value!r}")
+
+
+def parse_row(raw, mapping, cache, default_mode=CALC_MODES[0]):
+    """An entry row (ENTRY_FIELDS order) or ValueError with the reason."""
+    def get(field_name):
+        i = mapping.get(field_name)
+        if i is None or i >= len(raw):
+            return ""
+        return raw[i]
+
+    def text(field_name):
+        return str(get(field_name)).strip()
+
+    day = parse_date(get("date"))
+    qty = parse_number(get("qty"), "qty", Qty)
+    rate = parse_number(get("rate"), "rate")
+    if qty <= 0 or rate <= 0:
+        raise ValueError("qty and rate must be greater than 0")
+    labour = parse_number(get("labour"), "labour", default=Money())
+    advance = parse_number(get("advance"), "advance", default=Money())
+
+    mode = text("mode") or default_mode
+    if mode not in CALC_MODES:
+        raise ValueError(f"unknown calc mode {mode!r}")
+
+    # resolved last, so a rejected row never creates a customer
+    name = text("name")
+    cid = cache.resolve(name, text("mobile"), text("address")) if name else None
+
+    return make_entry(
+        day, cid, text("vehicle"), text("branch"), text("type"),
+        qty, rate, labour, advance, mode, text("note")
+    )
+
+
+# ==========================================================
+#                 IMPORT
+# ==========================================================
+
+def default_rejects_path(path):
+    stem, _ = os.path.splitext(path)
+    return f"{stem}_rejected.csv"
+
+
+def import_file(conn, path, chunk_size=CHUNK_SIZE, rejects_path=None,
+                progress=None, default_mode=CALC_MODES[0]):
+    """
+    Import every row of `path` into entries.
+
+    `progress(result)` is called after each committed chunk.
+    """
+    rows = read_rows(path)
+    header = next(rows, None)
+    if header is None:
+        raise ValueError("The file is empty.")
+    mapping = map_columns(header)
+
+    rejects_path = rejects_path or default_rejects_path(path)
+    result = ImportResult()
+    cache = CustomerCache(conn)
+    batch = []
+    rejects_file = rejects = None
+
+    def flush():
+        with conn:   # customers created for this chunk commit with it
+            conn.executemany(INSERT_ENTRY, batch)
+        cache.commit()
+        result.imported += len(batch)
+        result.customers_created = cache.created
+        batch.clear()
+        if progress:
+            progress(result)
+
+    try:
+        for raw in rows:
+            if not any(str(v).strip() for v in raw):
+                continue
+            result.read += 1
+            try:
+                batch.append(parse_row(raw, mapping, cache, default_mode))
+            except ValueError as exc:
+                if rejects is None:
+                    rejects_file = open(rejects_path, "w", newline="", encoding="utf-8")
+                    rejects = csv.writer(rejects_file)
+                    rejects.writerow(list(header) + ["error"])
+                rejects.writerow(list(raw) + [str(exc)])
+                result.rejected += 1
+                continue
+            if len(batch) >= chunk_size:
+                flush()
+        if batch:
+            flush()
+    except BaseException:
+        # the chunk in progress is rolled back, customers included: drop
+        # them from the cache too, or a retry would point entries at them
+        conn.rollback()
+        cache.rollback()
+        raise
+    finally:
+        if rejects_file is not None:
+            rejects_file.close()
+            result.rejects_path = rejects_path
+
+    return result
+
+
+def main():
+    from billing import db
+
+    ap = argparse.ArgumentParser(description="Import entries from CSV / XLSX.")
+    ap.add_argument("file")
+    ap.add_argument("--db", default=db.DB_NAME)
+    ap.add_argument("--chunk", type=int, default=CHUNK_SIZE)
+    ap.add_argument("--rejects")
+    args = ap.parse_args()
+
+    conn = db.connect(args.db)
+    result = import_file(
+        conn, args.file, args.chunk, args.rejects,
+        progress=lambda r: print(f"  {r.read:,} read · {r.imported:,} imported · {r.rejected:,} rejected")
+    )
+    print(f"Imported {result.imported:,} of {result.read:,} rows "
+          f"({result.customers_created} new customers).")
+    if result.rejects_path:
+        print(f"Rejected rows: {result.rejects_path}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
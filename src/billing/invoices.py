@@ -0,0 +1,470 @@
+"""
+PDF invoices (C2 – thin gold header).
+
+An Invoice is plain data - header fields plus line tuples - so invoices
+can be rendered without the GUI, e.g. from a script or a worker.
+
+Line items flow over as many pages as they need. Rows are produced one
+at a time from the invoice lines and only the current page is held as a
+Table; every page repeats the column header, pages after the first
+start with the running total brought forward and all but the last end
+with it carried forward. The grand total and footer go on the last page.
+
+Everything that is the same on every invoice - the decoded logo,
+colours, table styles and the static header - lives in an
+InvoiceTemplate built once per process and reused; the static header is
+drawn once per PDF as a form XObject and stamped onto each page.
+
+Invoice numbers come from the invoices table (see db migration 6):
+issue_invoices() records the header and the entry ids of each invoice
+in one transaction and numbers it from the table's sequence, so numbers
+never collide and never skip. find_invoice() / reprint() rebuild an
+issued invoice from its number.
+"""
+import os
+from dataclasses import dataclass, field
+
+from reportlab import rl_config
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import ImageReader, simpleSplit
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Table, TableStyle
+
+from billing.entries import fixed
+from billing.money import Money
+
+# Write image streams as binary instead of ASCII85 text: without ReportLab's
+# optional C accelerator the ASCII85 pass over the logo dominated the cost
+# of every invoice, and binary streams are a quarter smaller.
+rl_config.useA85 = 0
+
+INVOICE_DIR = "invoices"
+LOGO_FILE = "logo.jpeg"
+NUMBER_PREFIX = "MS"
+
+COMPANY_NAME = "A.B ENTERPRISES"
+COMPANY_TAGLINE = "Cattle Feed Supplies"
+COMPANY_PHONE = "Ph 95948473 / 9172319000 / 9076313413"
+COMPANY_ADDRESS = (
+    "Gala No.34-C , Rashid compound, Survey No.4 , C.T.S No.161,",
+    "Saki Naka , Mumbai-400072",
+)
+
+GOLD = "#FFC107"
+HEADER_BLUE = "#2E86C1"
+
+LINE_HEADER = ["Qty", "Rate", "Labour", "Advance", "PreTotal", "Total", "Note"]
+LINE_WIDTHS = [60, 60, 60, 60, 75, 75, 170]
+
+# ---- multi-page layout (points) ----
+FONT_SIZE = 9
+LEADING = 11           # per line of a wrapped note
+ROW_PAD = 3            # above and below each row's text
+HEADER_ROW_H = 18
+CARRY_ROW_H = 18
+FIRST_TABLE_TOP = 260  # below the page top, after the customer / bill blocks
+NEXT_TABLE_TOP = 90    # below the page top on continuation pages
+TABLE_BOTTOM = 50      # lowest a table may reach (page number below)
+TOTAL_BLOCK = 95       # grand total box + footer under the last table
+
+
+@dataclass
+class Invoice:
+    number: str = ""                              # set by issue_invoices()
+    customer_id: int = None
+    customer_name: str = ""
+    customer_mobile: str = ""
+    customer_address: str = ""
+    date: str = ""
+    vehicle: str = ""
+    branch: str = ""
+    type: str = ""
+    lines: list = field(default_factory=list)   # (qty, rate, labour, advance, pre, total, note)
+    entry_ids: list = field(default_factory=list)
+
+    @property
+    def total(self):
+        return sum((_amount(line) for line in self.lines), Money())
+
+
+def ensure_invoice_folder(folder=INVOICE_DIR):
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+
+
+def invoice_lines(ledger_rows):
+    """Invoice line tuples from billing.entries ledger rows."""
+    return [tuple(r[6:13]) for r in ledger_rows]
+
+
+def _amount(line):
+    # Money from the ledger; rupees are accepted from scripts
+    return Money.parse(line[5] or 0)
+
+
+def _num(value):
+    if value is None:
+        return ""
+    try:
+        return f"{value:.2f}"
+    except (TypeError, ValueError):
+        return str(value)
+
+
+class InvoiceTemplate:
+    """
+    The parts of the invoice layout shared by every invoice, prepared
+    once: the logo (a JPEG is embedded as-is, other formats are decoded
+    here), colours and the four table styles a page can need. start()
+    puts the static headers into a new PDF as form XObjects, which each
+    page then reuses. The standard PDF fonts used here need no loading
+    or embedding.
+    """
+
+    def __init__(self, logo_file=LOGO_FILE):
+        self.logo = None             # no logo: header without it
+        if os.path.exists(logo_file):
+            if logo_file.lower().endswith((".jpg", ".jpeg")):
+                self.logo = logo_file    # embedded as-is (DCT), never decoded
+            else:
+                try:
+                    self.logo = ImageReader(logo_file)
+                    self.logo.getRGBData()   # decode now, not once per invoice
+                except Exception:
+                    self.logo = None
+        self.gold = colors.HexColor(GOLD)
+        self.header_blue = colors.HexColor(HEADER_BLUE)
+        self.carry_bg = colors.HexColor("#F5F5F5")
+        self.styles = {
+            (brought, carried): self._table_style(brought, carried)
+            for brought in (False, True) for carried in (False, True)
+        }
+
+    def _table_style(self, brought, carried):
+        style = [
+            ('BACKGROUND', (0, 0), (-1, 0), self.header_blue),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('GRID', (0, 0), (-1, -1), 0.7, colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('FONTSIZE', (0, 0), (-1, -1), FONT_SIZE),
+            ('LEADING', (0, 0), (-1, -1), LEADING),
+            ('TOPPADDING', (0, 0), (-1, -1), 0),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
+        ]
+        # "brought fwd" is always row 1, "carried fwd" always the last row
+        for row, present in ((1, brought), (-1, carried)):
+            if present:
+                style += [
+                    ('BACKGROUND', (0, row), (-1, row), self.carry_bg),
+                    ('FONTNAME', (0, row), (-1, row), "Helvetica-Bold"),
+                ]
+        return TableStyle(style)
+
+    def start(self, c, w, h):
+        """Define the static headers as forms in the new canvas `c`."""
+        c.beginForm("first_header")
+        self._draw_first_static(c, w, h)
+        c.endForm()
+        c.beginForm("next_header")
+        self._draw_next_static(c, w, h)
+        c.endForm()
+
+    def _draw_first_static(self, c, w, h):
+        # ===== HEADER (SPACING FIXED) =====
+        if self.logo is not None:
+            c.drawImage(self.logo, 30, h-95, width=140, height=80, preserveAspectRatio=True)
+
+        # Company Title ↓ moved slightly higher
+        c.setFont("Helvetica-Bold", 28)
+        c.drawCentredString(w/2, h-65, COMPANY_NAME)
+
+        c.setFont("Helvetica", 12)
+        c.drawCentredString(w/2, h-88, COMPANY_TAGLINE)
+
+        # Golden strip ↓ lowered for breathing space
+        c.setFillColor(self.gold)
+        c.rect(0, h-105, w, 5, fill=1)
+
+        # Phone & Address moved down safely
+        y_info = h-130
+        c.setFont("Helvetica-Bold", 10)
+        c.setFillColor(colors.black)
+        c.drawString(30, y_info, COMPANY_PHONE)
+
+        c.setFont("Helvetica", 9)
+        c.drawString(30, y_info-15, COMPANY_ADDRESS[0])
+        c.drawString(30, y_info-30, COMPANY_ADDRESS[1])
+
+    def _draw_next_static(self, c, w, h):
+        """Slim header for continuation pages."""
+        c.setFont("Helvetica-Bold", 14)
+        c.setFillColor(colors.black)
+        c.drawString(30, h-45, COMPANY_NAME)
+        c.setFillColor(self.gold)
+        c.rect(0, h-60, w, 3, fill=1)
+
+
+_template = None
+
+
+def default_template():
+    """The process-wide InvoiceTemplate, built on first use."""
+    global _template
+    if _template is None:
+        _template = InvoiceTemplate()
+    return _template
+
+
+def _draw_first_header(c, invoice, w, h):
+    c.doForm("first_header")
+
+    # Invoice No (right side)
+    c.setFont("Helvetica", 10)
+    c.setFillColor(colors.black)
+    c.drawRightString(w-20, h-65, f"Invoice No : {invoice.number}")
+
+    # ===== CUSTOMER BLOCK LEFT =====
+    y = h-180
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(40, y, "Customer:")
+    c.setFont("Helvetica", 10)
+    c.drawString(120, y, invoice.customer_name)
+    y -= 15
+    c.drawString(120, y, f"Mobile: {invoice.customer_mobile}")
+    y -= 15
+    c.drawString(120, y, f"Address: {invoice.customer_address}")
+
+    # ===== BILL DETAILS RIGHT =====
+    y2 = h-180
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(w-220, y2, "Bill Details")
+    c.setFont("Helvetica", 10)
+    c.drawString(w-220, y2-15, f"Date: {invoice.date}")
+    c.drawString(w-220, y2-30, f"Vehicle: {invoice.vehicle}")
+    c.drawString(w-220, y2-45, f"Branch: {invoice.branch}")
+    c.drawString(w-220, y2-60, f"Type: {invoice.type}")
+
+
+def _draw_next_header(c, invoice, w, h):
+    c.doForm("next_header")
+    c.setFont("Helvetica", 10)
+    c.setFillColor(colors.black)
+    c.drawRightString(w-20, h-45, f"Invoice No : {invoice.number} (continued)")
+
+
+def _draw_page_number(c, page, w):
+    c.setFont("Helvetica", 8)
+    c.setFillColor(colors.black)
+    c.drawRightString(w-20, 25, f"Page {page}")
+
+
+def _line_rows(lines):
+    """
+    (cells, height, amount) for each invoice line, produced lazily.
+    Notes are wrapped here, so the row height is known before layout.
+    """
+    note_width = LINE_WIDTHS[-1] - 2 * ROW_PAD
+    for line in lines:
+        note = simpleSplit(str(line[6] or ""), "Helvetica", FONT_SIZE, note_width) or [""]
+        cells = [_num(v) for v in line[:6]] + ["\n".join(note)]
+        yield cells, len(note) * LEADING + 2 * ROW_PAD, _amount(line)
+
+
+def _carry_row(label, amount):
+    return ["", "", "", "", label, f"{amount:,.2f}", ""]
+
+
+def _draw_table(c, data, heights, style, x, top):
+    """Draw one page of the line table from `top` down; returns its bottom y."""
+    table = Table(data, colWidths=LINE_WIDTHS, rowHeights=heights)
+    table.setStyle(style)
+    bottom = top - sum(heights)
+    table.wrapOn(c, 0, 0)
+    table.drawOn(c, x, bottom)
+    return bottom
+
+
+def _draw_totals(c, total, bottom, w):
+    # ===== GRAND TOTAL =====
+    c.setFont("Helvetica-Bold", 12)
+    c.setFillColor(colors.black)
+    c.rect(w-230, bottom-50, 180, 28, stroke=1, fill=0)
+    c.drawString(w-220, bottom-42, "Grand Total : ₹")
+    c.drawRightString(w-60, bottom-42, f"{total:,.2f}")
+
+    # ===== FOOTER (AUTO POSITION NEAR TABLE) =====
+    FOOTER_Y = bottom - 70
+
+    c.setFont("Helvetica-Bold", 10)
+    c.setFillColor(colors.red)
+    c.drawCentredString(w/2, FOOTER_Y, "This is a computer generated invoice – no signature required.")
+
+    c.setFont("Helvetica", 9)
+    c.setFillColor(colors.black)
+    c.drawCentredString(w/2, FOOTER_Y-15, "Thank you for your business!")
+
+
+def render_invoice(invoice, filename, template=None):
+    """Draw `invoice` to the PDF at `filename`, over as many pages as needed."""
+    template = template or default_template()
+    c = canvas.Canvas(filename, pagesize=A4)
+    w, h = A4
+    x = (w - sum(LINE_WIDTHS)) / 2
+
+    template.start(c, w, h)
+    _draw_first_header(c, invoice, w, h)
+    page = 1
+    top = h - FIRST_TABLE_TOP
+    running = Money()
+    brought = None   # running total at the top of a continuation page
+
+    rows = _line_rows(invoice.lines)
+    pending = next(rows, None)
+    while True:
+        data, heights = [LINE_HEADER], [HEADER_ROW_H]
+        if brought is not None:
+            data.append(_carry_row("Brought fwd", brought))
+            heights.append(CARRY_ROW_H)
+
+        # keep room for a "carried forward" row; always place at least one line
+        room = top - TABLE_BOTTOM - CARRY_ROW_H - sum(heights)
+        placed = 0
+        while pending is not None and (pending[1] <= room or not placed):
+            cells, height, amount = pending
+            data.append(cells)
+            heights.append(height)
+            room -= height
+            running += amount
+            placed += 1
+            pending = next(rows, None)
+
+        if pending is not None:
+            data.append(_carry_row("Carried fwd", running))
+            heights.append(CARRY_ROW_H)
+        style = template.styles[(brought is not None, pending is not None)]
+        bottom = _draw_table(c, data, heights, style, x, top)
+        if pending is None:
+            break
+
+        _draw_page_number(c, page, w)
+        c.showPage()
+        page += 1
+        _draw_next_header(c, invoice, w, h)
+        top = h - NEXT_TABLE_TOP
+        brought = running
+
+    if bottom - TOTAL_BLOCK < TABLE_BOTTOM:   # totals do not fit under the last rows
+        _draw_page_number(c, page, w)
+        c.showPage()
+        page += 1
+        _draw_next_header(c, invoice, w, h)
+        bottom = h - NEXT_TABLE_TOP
+    _draw_totals(c, running, bottom, w)
+    _draw_page_number(c, page, w)
+    c.save()
+
+
+def invoice_path(invoice, folder=INVOICE_DIR):
+    return os.path.join(folder, f"{invoice.number}.pdf")
+
+
+def write_invoice(invoice, folder=INVOICE_DIR):
+    """Render `invoice` into `folder`; returns the PDF path."""
+    ensure_invoice_folder(folder)
+    filename = invoice_path(invoice, folder)
+    render_invoice(invoice, filename)
+    return filename
+
+
+# ---------------- register ----------------
+
+INSERT_INVOICE = """
+    INSERT INTO invoices (customer_id, customer_name, customer_mobile, customer_address,
+                          date, vehicle, branch, type, total, folder)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INVOICE_LINES = """
+    SELECT e.qty, e.rate, e.labour, e.advance, e.pre, e.total, e.note
+    FROM invoice_entries ie
+    JOIN entries e ON e.id = ie.entry_id
+    WHERE ie.invoice_id = ?
+    ORDER BY e.date, e.id
+"""
+
+
+def format_number(seq):
+    return f"{NUMBER_PREFIX}{seq:06d}"
+
+
+def parse_number(number):
+    """Sequence number of an invoice number ("MS000042" or "42"), or None."""
+    text = str(number).strip().upper()
+    if text.startswith(NUMBER_PREFIX):
+        text = text[len(NUMBER_PREFIX):]
+    return int(text) if text.isdigit() else None
+
+
+def issue_invoices(conn, invoices, folder=INVOICE_DIR):
+    """
+    Number `invoices` and record them, with their entry ids, in one
+    transaction; sets each invoice's number and returns the invoices.
+
+    The number is the invoices row id, which SQLite assigns from the
+    AUTOINCREMENT counter while holding the write lock: concurrent issuers
+    queue on the lock instead of sharing a number, a deleted invoice's
+    number is never given out again, and a failed issue rolls back
+    without leaving a hole in the sequence.
+    """
+    with conn:
+        for inv in invoices:
+            cur = conn.execute(INSERT_INVOICE, (
+                inv.customer_id, inv.customer_name, inv.customer_mobile,
+                inv.customer_address, inv.date, inv.vehicle, inv.branch,
+                inv.type, inv.total, folder,
+            ))
+            seq = cur.lastrowid
+            conn.executemany(
+                "INSERT OR IGNORE INTO invoice_entries (invoice_id, entry_id) VALUES (?, ?)",
+                [(seq, int(i)) for i in inv.entry_ids],
+            )
+            inv.number = format_number(seq)
+    return invoices
+
+
+def find_invoice(conn, number):
+    """
+    The issued invoice `number` as (Invoice, folder), or None. Lines are
+    re-read from its entries; entries deleted since are left out.
+    """
+    seq = parse_number(number)
+    if seq is None:
+        return None
+    row = conn.execute(
+        "SELECT customer_id, customer_name, customer_mobile, customer_address,"
+        " date, vehicle, branch, type, folder FROM invoices WHERE id = ?", (seq,)
+    ).fetchone()
+    if row is None:
+        return None
+    inv = Invoice(format_number(seq), *row[:8])
+    inv.entry_ids = [r[0] for r in conn.execute(
+        "SELECT entry_id FROM invoice_entries WHERE invoice_id = ?", (seq,))]
+    inv.lines = [fixed(r[:6]) + r[6:] for r in conn.execute(INVOICE_LINES, (seq,))]
+    return inv, row[8]
+
+
+def reprint(conn, number):
+    """
+    Path of issued invoice `number`, rendering it again if the PDF is
+    gone; None if no such invoice was issued.
+    """
+    found = find_invoice(conn, number)
+    if found is None:
+        return None
+    inv, folder = found
+    path = invoice_path(inv, folder)
+    if not os.path.exists(path):
+        write_invoice(inv, folder)
+    return path
@@ -0,0 +1,104 @@
+"""
+Latest-wins background search for search-as-you-type.
+
+LiveSearch runs ledger queries on a daemon thread with its own SQLite
+connection (WAL lets it read while the GUI connection writes). Every
+submit() supersedes the previous query: a statement still running is
+interrupted, pages it has not produced yet are never fetched, and every
+message carries its generation so the caller can drop stale ones.
+
+Messages on `results` are tuples:
+
+    ("page",  generation, rows, more)
+    ("done",  generation, None, None)
+    ("error", generation, exception, None)
+"""
+import queue
+import sqlite3
+import threading
+
+from billing import db, entries, search
+
+
+def ledger_pages(where, params, page_size, max_pages):
+    """Keyset pages of the filtered ledger, newest first."""
+    def pages(conn):
+        key = None
+        for _ in range(max_pages):
+            rows, more = entries.ledger_page(conn, where, params, key, True, page_size)
+            yield rows, more
+            if not rows or not more:
+                return
+            key = (rows[-1][1], rows[-1][0])
+    return pages
+
+
+def ranked_pages(text, where, params, limit, page_size):
+    """Ranked search results, handed over `page_size` rows at a time."""
+    def pages(conn):
+        rows = search.search(conn, text, limit, where=where, params=params)
+        for i in range(0, len(rows), page_size):
+            yield rows[i:i + page_size], False
+    return pages
+
+
+class LiveSearch:
+
+    def __init__(self, path=db.DB_NAME):
+        self.path = path
+        self.results = queue.Queue()
+        self._requests = queue.Queue()
+        self._generation = 0
+        self._conn = None
+        self._ready = threading.Event()
+        threading.Thread(target=self._run, name="live-search", daemon=True).start()
+
+    def submit(self, pages):
+        """
+        Queue `pages(conn)` - a generator of (rows, more) - and return
+        its generation. Anything submitted earlier becomes stale.
+        """
+        self._generation += 1
+        generation = self._generation
+        if self._ready.is_set():
+            self._conn.interrupt()   # thread-safe; stops a superseded statement
+        self._requests.put((generation, pages))
+        return generation
+
+    def is_current(self, generation):
+        return generation == self._generation
+
+    def drain(self):
+        """Messages waiting on `results`, stale ones removed."""
+        out = []
+        while True:
+            try:
+                msg = self.results.get_nowait()
+            except queue.Empty:
+                return out
+            if self.is_current(msg[1]):
+                out.append(msg)
+
+    def _run(self):
+        self._conn = db.connect(self.path)
+        self._ready.set()
+        while True:
+            generation, pages = self._requests.get()
+            for attempt in range(2):
+                if not self.is_current(generation):
+                    break
+                try:
+                    for rows, more in pages(self._conn):
+                        if not self.is_current(generation):
+                            break
+                        self.results.put(("page", generation, rows, more))
+                    else:
+                        self.results.put(("done", generation, None, None))
+                    break
+                except sqlite3.OperationalError as exc:
+                    # an interrupt aimed at the previous query can land on
+                    # this one; retry once if it is still the latest
+                    if "interrupt" in str(exc) and attempt == 0:
+                        continue
+                    self.results.put(("error", generation, exc, None))
+                    break
@@ -0,0 +1,160 @@
+"""
+Fixed-point money and quantities.
+
+Amounts are stored as integer paise and quantities as integer grams
+(milli-kg), so SQLite adds them up with integer SUMs and a month of
+bills totals to the paisa, however it is grouped. Money and Qty are
+int subclasses holding those units:
+
+    Money.parse("1,234.5") -> Money('1234.50')     int value 123450
+    Qty.parse(1200)        -> Qty('1200.000')      int value 1200000
+    Money.parse("22.50") * Qty.parse("1.25")       ₹/kg × kg, rounded
+                                                   half up to the paisa
+
+They bind to SQLite as plain integers and str() / format() show whole
+rupees / kg, so f"{amount:,.2f}" keeps working. Money + Money and
+Money × int stay Money and are exact. float() gives whole units, for
+display or charts only. Never mix them with floats in arithmetic.
+"""
+import math
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+
+def _div_half_up(n, d):
+    q, r = divmod(abs(n), d)
+    q += 2 * r >= d
+    return q if n >= 0 else -q
+
+
+def _float_units(value, scale):
+    # float inputs (spreadsheet cells, REAL columns) carry binary noise:
+    # 22.725 may be 22.724999999999998. Rounding to a thousandth of a
+    # unit first removes it, so halves round up as written.
+    y = round(value * scale, 3)
+    if y != y or y in (math.inf, -math.inf):
+        raise ValueError(f"not a number: {value!r}")
+    return math.floor(y + 0.5) if y >= 0 else -math.floor(0.5 - y)
+
+
+class Fixed(int):
+    """An integer count of 1/SCALE units; subclasses set SCALE and PLACES."""
+
+    SCALE = 1
+    PLACES = 0
+    __slots__ = ()
+
+    def __new__(cls, units=0):
+        if not isinstance(units, int):
+            raise TypeError(
+                f"{cls.__name__}() takes integer units; use {cls.__name__}.parse() "
+                f"for {units!r}"
+            )
+        return super().__new__(cls, units)
+
+    @classmethod
+    def parse(cls, value):
+        """
+        From whole units - "1,234.50", 22.5, Decimal("3"), 7 - rounded
+        half up to the nearest unit. ValueError if it isn't a number.
+        """
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, float):
+            return cls(_float_units(value, cls.SCALE))
+        if isinstance(value, int):
+            return cls(int(value) * cls.SCALE)
+        try:
+            d = Decimal(str(value).strip().replace(",", ""))
+        except InvalidOperation:
+            raise ValueError(f"not a number: {value!r}") from None
+        if not d.is_finite():
+            raise ValueError(f"not a number: {value!r}")
+        return cls(int((d * cls.SCALE).to_integral_value(ROUND_HALF_UP)))
+
+    @property
+    def decimal(self):
+        return Decimal(int(self)).scaleb(-self.PLACES)
+
+    def __str__(self):
+        return f"{self.decimal:.{self.PLACES}f}"
+
+    def __repr__(self):
+        return f"{type(self).__name__}('{self}')"
+
+    def __format__(self, spec):
+        return format(self.decimal, spec) if spec else str(self)
+
+    def __float__(self):
+        return int(self) / self.SCALE
+
+    # ---- exact arithmetic; plain ints (e.g. sum()'s 0) count as units ----
+    def _same(self, other):
+        return type(other) is type(self) or type(other) is int
+
+    def __add__(self, other):
+        if self._same(other):
+            return type(self)(int(self) + int(other))
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if self._same(other):
+            return type(self)(int(self) - int(other))
+        return NotImplemented
+
+    def __rsub__(self, other):
+        if self._same(other):
+            return type(self)(int(other) - int(self))
+        return NotImplemented
+
+    def __neg__(self):
+        return type(self)(-int(self))
+
+    def __abs__(self):
+        return type(self)(abs(int(self)))
+
+    def __mul__(self, other):
+        if type(other) is int:
+            return type(self)(int(self) * other)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+
+class Qty(Fixed):
+    """Kilograms, held as grams."""
+
+    SCALE = 1000
+    PLACES = 3
+    __slots__ = ()
+
+
+class Money(Fixed):
+    """Rupees, held as paise."""
+
+    SCALE = 100
+    PLACES = 2
+    __slots__ = ()
+
+    def __mul__(self, other):
+        # a rate (₹ per kg) times a quantity: one rounding, half up
+        if isinstance(other, Qty):
+            return Money(_div_half_up(int(self) * int(other), Qty.SCALE))
+        return super().__mul__(other)
+
+    __rmul__ = __mul__
+
+
+def paise(value):
+    """Money.parse() as a plain int (None stays None), for bulk conversion in SQL."""
+    if type(value) is float:   # the common case, without the parse() dispatch
+        return _float_units(value, Money.SCALE)
+    return None if value is None else int(Money.parse(value))
+
+
+def grams(value):
+    """Qty.parse() as a plain int (None stays None)."""
+    if type(value) is float:
+        return _float_units(value, Qty.SCALE)
+    return None if value is None else int(Qty.parse(value))
@@ -0,0 +1,165 @@
+"""
+Date-range reporting over the billing ledger.
+
+Every period - day, week, month, quarter, financial year or an
+arbitrary range - is reduced to a half-open ISO date range and queried
+as `date >= ? AND date < ?`. Reports read the materialized summary
+tables (see billing/summaries.py): whole months come from
+summary_monthly and the partial months at either edge from
+summary_daily, so a report costs O(periods) rather than O(entries).
+Totals and the per-branch / per-type breakdowns come from one query.
+The summaries hold grams and paise, so every total is an exact integer
+sum, returned as Qty / Money.
+"""
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from billing.money import Money, Qty
+
+FY_START_MONTH = 4   # Indian financial year: 1 April – 31 March
+
+PERIOD_KINDS = ("day", "week", "month", "quarter", "fy", "range")
+
+
+@dataclass
+class Period:
+    kind: str
+    start: date   # inclusive
+    end: date     # exclusive
+    label: str
+
+    @property
+    def last_day(self):
+        return self.end - timedelta(days=1)
+
+
+@dataclass
+class Totals:
+    count: int = 0
+    qty: Qty = Qty()
+    amount: Money = Money()
+
+    def add(self, count, qty, amount):
+        """Add a summary row (grams / paise as stored)."""
+        self.count += count
+        self.qty += Qty(qty)
+        self.amount += Money(amount)
+
+
+@dataclass
+class Report:
+    period: Period
+    totals: Totals = field(default_factory=Totals)
+    by_branch: dict = field(default_factory=dict)   # branch -> Totals
+    by_type: dict = field(default_factory=dict)     # type -> Totals
+
+
+# ==========================================================
+#                 PERIODS
+# ==========================================================
+
+def _as_date(value):
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value).strip())   # ValueError on bad input
+
+
+def _add_months(d, months):
+    m = d.month - 1 + months
+    return date(d.year + m // 12, m % 12 + 1, 1)
+
+
+def _fy_label(start_year):
+    return f"FY {start_year}-{(start_year + 1) % 100:02d}"
+
+
+def period(kind, on, until=None):
+    """
+    The `kind` period containing date `on`.
+
+    For kind="range", `on` and `until` are both inclusive.
+    """
+    d = _as_date(on)
+
+    if kind == "day":
+        return Period(kind, d, d + timedelta(days=1), f"Date: {d}")
+
+    if kind == "week":   # Monday-based
+        start = d - timedelta(days=d.weekday())
+        end = start + timedelta(days=7)
+        return Period(kind, start, end, f"Week: {start} to {end - timedelta(days=1)}")
+
+    if kind == "month":
+        start = d.replace(day=1)
+        return Period(kind, start, _add_months(start, 1), f"Month: {start:%Y-%m}")
+
+    if kind == "quarter":
+        start = date(d.year, (d.month - 1) // 3 * 3 + 1, 1)
+        q = (start.month - 1) // 3 + 1
+        return Period(kind, start, _add_months(start, 3), f"Quarter: Q{q} {d.year}")
+
+    if kind == "fy":
+        year = d.year if d.month >= FY_START_MONTH else d.year - 1
+        start = date(year, FY_START_MONTH, 1)
+        return Period(kind, start, _add_months(start, 12), _fy_label(year))
+
+    if kind == "range":
+        last = _as_date(until if until is not None else on)
+        if last < d:
+            d, last = last, d
+        return Period(kind, d, last + timedelta(days=1), f"Range: {d} to {last}")
+
+    raise ValueError(f"Unknown period kind: {kind!r}")
+
+
+# ==========================================================
+#                 QUERIES
+# ==========================================================
+
+def _month_ceil(d):
+    return d if d.day == 1 else _add_months(d, 1)
+
+
+def range_report(conn, p):
+    """Totals and branch / type breakdowns for Period `p`."""
+    start, end = p.start, p.end
+    full_start, full_end = _month_ceil(start), end.replace(day=1)
+
+    daily = """
+        SELECT branch, type, bills, qty, amount FROM summary_daily
+        WHERE date >= ? AND date < ?
+    """
+    if full_start < full_end:
+        sql = daily + """
+            UNION ALL
+            SELECT branch, type, bills, qty, amount FROM summary_monthly
+            WHERE month >= ? AND month < ?
+            UNION ALL
+        """ + daily
+        params = (
+            start.isoformat(), full_start.isoformat(),
+            f"{full_start:%Y-%m}", f"{full_end:%Y-%m}",
+            full_end.isoformat(), end.isoformat(),
+        )
+    else:
+        sql, params = daily, (start.isoformat(), end.isoformat())
+
+    report = Report(p)
+    for branch, typ, count, qty, amount in conn.execute(sql, params):
+        report.totals.add(count, qty, amount)
+        report.by_branch.setdefault(branch, Totals()).add(count, qty, amount)
+        report.by_type.setdefault(typ, Totals()).add(count, qty, amount)
+    return report
+
+
+def period_report(conn, kind, on, until=None):
+    return range_report(conn, period(kind, on, until))
+
+
+def customer_totals(conn, customer_id):
+    """Bills / qty / amount for one customer from summary_customer."""
+    row = conn.execute(
+        "SELECT bills, qty, amount FROM summary_customer WHERE customer_id = ?",
+        (customer_id,)
+    ).fetchone()
+    return Totals(row[0], Qty(row[1]), Money(row[2])) if row else Totals()
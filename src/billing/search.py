@@ -0,0 +1,187 @@
+"""
+Full-text search over entries.
+
+entries_fts (schema migration 5) indexes vehicle, branch, type, note
+and the customer's name, and triggers keep it in step with every write.
+With the trigram tokenizer any term of three or more characters is a
+substring match answered from the index ("AB12" finds "MH04AB1234");
+shorter terms cannot use trigrams and fall back to LIKE on the entry
+columns. On SQLite builds without trigram support, terms are matched
+as word prefixes instead.
+
+    python -m billing.search "ravi kurla"
+"""
+import argparse
+
+from billing.entries import LEDGER_SELECT, ledger_row
+
+FTS_COLUMNS = ("vehicle", "branch", "type", "note", "customer")
+# bm25 column weights, FTS_COLUMNS order
+WEIGHTS = (4.0, 1.0, 1.0, 0.5, 2.0)
+
+MIN_TRIGRAM = 3
+
+# ranking looks at the newest CANDIDATES matches only, so a term that
+# hits most of the ledger ("Kurla") still answers in milliseconds
+CANDIDATES = 5000
+
+
+def uses_trigram(conn):
+    sql = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'entries_fts'"
+    ).fetchone()
+    return bool(sql) and "trigram" in sql[0]
+
+
+def _quote(term):
+    return '"' + term.replace('"', '""') + '"'
+
+
+# where each FTS column lives in the ledger query (entries e, customers c)
+LEDGER_COLUMNS = {
+    "vehicle": "e.vehicle",
+    "branch": "e.branch",
+    "type": "e.type",
+    "note": "e.note",
+    "customer": "c.name",
+}
+
+
+def parse_query(conn, text, column=None):
+    """
+    Split `text` into an FTS5 MATCH expression (every term ANDed) and
+    the terms too short for trigrams, which callers match with LIKE.
+    """
+    if column is not None and column not in FTS_COLUMNS:
+        raise ValueError(f"Unknown search column: {column!r}")
+
+    trigram = uses_trigram(conn)
+    scope = f"{column} : " if column else ""
+    matched, short = [], []
+    for term in text.split():
+        if trigram and len(term) < MIN_TRIGRAM:
+            short.append(term)
+        elif trigram:
+            matched.append(scope + _quote(term))
+        else:
+            matched.append(scope + _quote(term) + "*")
+    return " AND ".join(matched), short
+
+
+def _like_filter(short, column):
+    """LIKE conditions on the ledger aliases for short terms."""
+    conds, params = [], []
+    cols = [LEDGER_COLUMNS[column]] if column else list(LEDGER_COLUMNS.values())
+    for term in short:
+        conds.append("(" + " OR ".join(f"{c} LIKE ? ESCAPE '\\'" for c in cols) + ")")
+        params.extend([f"%{_like_escape(term)}%"] * len(cols))
+    return conds, params
+
+
+def _like_escape(term):
+    """`term` with LIKE's wildcards (and the escape character) taken literally."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def entry_filter(conn, text, column=None):
+    """(where, params) on the ledger's e / c aliases, e.g. for entries.ledger_page."""
+    match, short = parse_query(conn, text, column)
+    conds, params = _like_filter(short, column)
+    if match:
+        conds.insert(0, "e.id IN (SELECT rowid FROM entries_fts WHERE entries_fts MATCH ?)")
+        params.insert(0, match)
+    return " AND ".join(conds), params
+
+
+def ledger_filter(conn, date=None, vehicle=None, branch=None):
+    """(where, params) for the ledger search fields; blanks are ignored."""
+    conds, params = [], []
+    if date:
+        conds.append("e.date = ?")
+        params.append(date)
+    for column, text in (("vehicle", vehicle), ("branch", branch)):
+        where, p = entry_filter(conn, text or "", column)
+        if where:
+            conds.append(where)
+            params += p
+    return " AND ".join(conds), params
+
+
+def search(conn, text, limit=100, column=None, where="", params=()):
+    """
+    Ledger rows matching `text`, best match first (bm25), optionally
+    narrowed by a ledger (e / c) `where` clause.
+
+    Only the newest CANDIDATES matches are ranked; FTS5 walks its
+    doclists in rowid order and stops there. Text made only of short
+    terms has nothing to rank and comes back newest first.
+    """
+    match, short = parse_query(conn, text, column)
+    conds, cond_params = _like_filter(short, column)
+    if where:
+        conds.append(f"({where})")
+        cond_params += list(params)
+    if not match and not short:
+        return []
+    filters = (" WHERE " + " AND ".join(conds)) if conds else ""
+
+    if not match:
+        q = LEDGER_SELECT + filters + " ORDER BY e.date DESC, e.id DESC LIMIT ?"
+        return [ledger_row(r) for r in conn.execute(q, cond_params + [limit])]
+
+    weights = ", ".join(str(w) for w in WEIGHTS)
+    q = f"""
+        WITH hits AS (
+            SELECT rowid AS id, bm25(entries_fts, {weights}) AS score
+            FROM entries_fts
+            WHERE entries_fts MATCH ?
+            ORDER BY rowid DESC
+            LIMIT {CANDIDATES}
+        )
+    """ + LEDGER_SELECT.replace(
+        "FROM entries e",
+        "FROM hits JOIN entries e ON e.id = hits.id",
+    ) + filters + """
+        ORDER BY hits.score, e.date DESC, e.id DESC
+        LIMIT ?
+    """
+    return [ledger_row(r) for r in conn.execute(q, [match] + cond_params + [limit])]
+
+
+def rebuild(conn):
+    """Re-index every entry (only needed if the triggers were bypassed)."""
+    if conn.in_transaction:
+        conn.commit()
+    with conn:
+        conn.execute("DELETE FROM entries_fts")
+        conn.execute("""
+            INSERT INTO entries_fts (rowid, vehicle, branch, type, note, customer)
+            SELECT e.id, COALESCE(e.vehicle, ''), COALESCE(e.branch, ''), COALESCE(e.type, ''),
+                   COALESCE(e.note, ''), COALESCE(c.name, '')
+            FROM entries e LEFT JOIN customers c ON c.id = e.customer_id
+        """)
+    conn.execute("INSERT INTO entries_fts (entries_fts) VALUES ('optimize')")
+    conn.commit()
+
+
+def main():
+    from billing import db
+
+    ap = argparse.ArgumentParser(description="Search entries.")
+    ap.add_argument("text")
+    ap.add_argument("--db", default=db.DB_NAME)
+    ap.add_argument("--column", choices=FTS_COLUMNS)
+    ap.add_argument("--limit", type=int, default=20)
+    ap.add_argument("--rebuild", action="store_true", help="re-index before searching")
+    args = ap.parse_args()
+
+    conn = db.connect(args.db)
+    if args.rebuild:
+        rebuild(conn)
+    for row in search(conn, args.text, args.limit, args.column):
+        print(" | ".join("" if v is None else str(v) for v in row))
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
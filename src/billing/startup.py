@@ -0,0 +1,89 @@
+"""
+Startup timing.
+
+    python main.py --startup-times      (or set MS_STARTUP_TIMES=1)
+
+records how long each import and initialisation phase of a launch takes,
+from process start until the window is up and the first page of the
+ledger is on screen, and writes the breakdown to stdout (when there is
+one) and to startup_times.log. Phases nest; each line shows when the
+phase started and how long it took. Without the flag phase() and mark()
+cost next to nothing, so app.py leaves them in place.
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+LOG_FILE = "startup_times.log"
+FLAG = "--startup-times"
+ENV_VAR = "MS_STARTUP_TIMES"
+
+_t0 = time.perf_counter()
+_enabled = False
+_depth = 0
+_phases = []   # [name, depth, start, end]; end is None for a mark
+
+
+def enable(argv=None, t0=None):
+    """
+    Turn timing on if FLAG is in `argv` (default sys.argv) or ENV_VAR is
+    set. `t0` is the perf_counter() the report counts from; main.py
+    passes its own, taken before anything else is imported.
+    """
+    global _enabled, _t0
+    argv = sys.argv if argv is None else argv
+    if FLAG in argv or os.environ.get(ENV_VAR):
+        _enabled = True
+        if t0 is not None:
+            _t0 = t0
+    return _enabled
+
+
+def enabled():
+    return _enabled
+
+
+@contextmanager
+def phase(name):
+    global _depth
+    if not _enabled:
+        yield
+        return
+    record = [name, _depth, time.perf_counter(), None]
+    _phases.append(record)
+    _depth += 1
+    try:
+        yield
+    finally:
+        _depth -= 1
+        record[3] = time.perf_counter()
+
+
+def mark(name):
+    """A point in time (window mapped, ledger shown) rather than a span."""
+    if _enabled:
+        _phases.append([name, _depth, time.perf_counter(), None])
+
+
+def report():
+    lines = [f"startup {time.strftime('%Y-%m-%d %H:%M:%S')}"]
+    for name, depth, start, end in _phases:
+        at = f"{(start - _t0) * 1000:8.1f} ms"
+        took = f"{(end - start) * 1000:8.1f} ms" if end is not None else " " * 11
+        lines.append(f"{at}  {took}  {'  ' * depth}{name}")
+    return "\n".join(lines)
+
+
+def finish(name="ready"):
+    """Mark the end of startup and write the report; later calls do nothing."""
+    global _enabled
+    if not _enabled:
+        return
+    mark(name)
+    _enabled = False
+    text = report()
+    if sys.stdout is not None:   # no console in the windowed build
+        print(text, flush=True)
+    with open(LOG_FILE, "a", encoding="utf-8") as f:
+        f.write(text + "\n\n")
@@ -0,0 +1,57 @@
+"""
+Materialized report totals.
+
+summary_daily, summary_monthly and summary_customer are created by
+schema migration 4 and kept current by triggers on entries, so every
+write path - add, delete, import - updates them in the same
+transaction. A rebuild is only needed if the triggers were bypassed
+(e.g. the file was edited with an external tool):
+
+    python -m billing.summaries [path/to/ms_traders_billing.db]
+"""
+import argparse
+
+SUMMARY_TABLES = ("summary_daily", "summary_monthly", "summary_customer")
+
+
+def rebuild(conn):
+    """Recompute every summary table from entries in one transaction."""
+    if conn.in_transaction:
+        conn.commit()
+    with conn:
+        for table in SUMMARY_TABLES:
+            conn.execute(f"DELETE FROM {table}")
+        conn.execute("""
+            INSERT INTO summary_daily (date, branch, type, bills, qty, amount)
+            SELECT COALESCE(date, ''), COALESCE(branch, ''), COALESCE(type, ''),
+                   COUNT(*), COALESCE(SUM(qty), 0), COALESCE(SUM(total), 0)
+            FROM entries GROUP BY 1, 2, 3
+        """)
+        conn.execute("""
+            INSERT INTO summary_monthly (month, branch, type, bills, qty, amount)
+            SELECT substr(date, 1, 7), branch, type, SUM(bills), SUM(qty), SUM(amount)
+            FROM summary_daily GROUP BY 1, 2, 3
+        """)
+        conn.execute("""
+            INSERT INTO summary_customer (customer_id, bills, qty, amount)
+            SELECT customer_id, COUNT(*), COALESCE(SUM(qty), 0), COALESCE(SUM(total), 0)
+            FROM entries WHERE customer_id IS NOT NULL GROUP BY customer_id
+        """)
+    return {t: conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in SUMMARY_TABLES}
+
+
+def main():
+    from billing import db
+
+    ap = argparse.ArgumentParser(description="Rebuild the report summary tables.")
+    ap.add_argument("database", nargs="?", default=db.DB_NAME)
+    args = ap.parse_args()
+
+    conn = db.connect(args.database)
+    for table, rows in rebuild(conn).items():
+        print(f"{table}: {rows} rows")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Background execution for the GUI.
+
+TaskRunner keeps database and PDF work off the Tk thread and hands the
+results back to it:
+
+    read(fn, *args)   fn(conn, *args) on a reader thread; every reader
+                      has its own connection (WAL lets them read while
+                      the writer writes)
+    write(fn, *args)  fn(conn, *args) on the one writer thread. Its
+                      connection is the only one the app writes through,
+                      so writes run one at a time in submission order
+    run(fn, *args)    fn(*args) on a reader thread, for work that needs
+                      no database (PDF rendering)
+
+Keyword arguments are passed on to fn, apart from the on_done(result)
+and on_error(exception) callbacks. Those are queued and run by poll(),
+which the GUI calls from root.after, so they are free to touch widgets.
+in_ui(fn) wraps a progress callback the same way. A write that raises
+is rolled back before on_error runs. Jobs and their callbacks are timed
+by billing.diagnostics.
+"""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from billing import db, diagnostics
+
+READERS = 2
+
+
+class TaskRunner:
+
+    def __init__(self, path=db.DB_NAME, readers=READERS):
+        self.path = path
+        self.pending = 0   # submitted, callbacks not yet run (UI thread only)
+        self._local = threading.local()
+        self._done = queue.Queue()
+        self._readers = ThreadPoolExecutor(readers, "db-read", initializer=self._open)
+        self._writer = ThreadPoolExecutor(1, "db-write", initializer=self._open)
+
+    def _open(self):
+        self._local.conn = db.connect(self.path)
+
+    def _submit(self, pool, fn, args, kwargs, on_done, on_error, with_conn):
+        def call():
+            with diagnostics.timed("task", name):
+                if not with_conn:
+                    return fn(*args, **kwargs)
+                conn = self._local.conn
+                try:
+                    return fn(conn, *args, **kwargs)
+                except BaseException:
+                    if conn.in_transaction:
+                        conn.rollback()
+                    raise
+
+        name = diagnostics.callback_name(fn)
+
+        self.pending += 1
+        future = pool.submit(call)
+        future.add_done_callback(lambda f: self._done.put((f, on_done, on_error)))
+        return future
+
+    def read(self, fn, *args, on_done=None, on_error=None, **kwargs):
+        return self._submit(self._readers, fn, args, kwargs, on_done, on_error, True)
+
+    def write(self, fn, *args, on_done=None, on_error=None, **kwargs):
+        return self._submit(self._writer, fn, args, kwargs, on_done, on_error, True)
+
+    def run(self, fn, *args, on_done=None, on_error=None, **kwargs):
+        return self._submit(self._readers, fn, args, kwargs, on_done, on_error, False)
+
+    def in_ui(self, fn):
+        """A thread-safe stand-in for `fn` that runs it during the next poll()."""
+        def proxy(*args):
+            self._done.put((None, lambda _: fn(*args), None))
+        return proxy
+
+    def poll(self):
+        """Run queued callbacks on the calling thread; returns tasks still pending."""
+        while True:
+            try:
+                future, on_done, on_error = self._done.get_nowait()
+            except queue.Empty:
+                return self.pending
+            if future is None:   # in_ui() call
+                on_done(None)
+                continue
+            self.pending -= 1
+            exc = future.exception()
+            if exc is None:
+                if on_done:
+                    with diagnostics.timed("ui", diagnostics.callback_name(on_done)):
+                        on_done(future.result())
+            elif on_error:
+                with diagnostics.timed("ui", diagnostics.callback_name(on_error)):
+                    on_error(exc)
+            else:
+                raise exc
+
+    def shutdown(self, wait=True):
+        """Stop taking work; with `wait`, let queued writes finish first."""
+        self._writer.shutdown(wait)
+        self._readers.shutdown(wait)
@@ -0,0 +1,42 @@
+"""Customer rankings against the same sums done in SQL."""
+from billing import analytics, db
+from billing.entries import CALC_MODES, insert_entries, make_entry
+
+
+def _database(tmp_path):
+    conn = db.connect(str(tmp_path / "t.db"))
+    with conn:
+        conn.executemany("INSERT INTO customers (name, mobile) VALUES (?, ?)",
+                         [("Asha Traders", "9000000001"), ("Bala & Sons", "9000000002")])
+    rows = []
+    for i in range(60):
+        customer = (1, 2, None)[i % 3]
+        qty = "5000" if customer is None else f"{100 + i}"   # unassigned carries the most
+        rows.append(make_entry(f"2024-01-{1 + i % 28:02d}", customer, "MH01AB1234", "Kurla",
+                               "Bran", qty, "20", "0", 500 if i % 4 == 0 else 0, CALC_MODES[1]))
+    insert_entries(conn, rows)
+    return conn
+
+
+def test_top_customers_match_sql(tmp_path):
+    conn = _database(tmp_path)
+    try:
+        analytics.forget(conn)
+        ranked = analytics.top_customers(conn, "2024-01-01", "2024-01-31")
+        expected = dict(conn.execute(
+            "SELECT customer_id, SUM(total) FROM entries WHERE customer_id IS NOT NULL "
+            "AND date BETWEEN ? AND ? GROUP BY customer_id", ("2024-01-01", "2024-01-31")))
+        assert {c.customer_id: c.amount for c in ranked} == expected
+        assert [c.amount for c in ranked] == sorted(expected.values(), reverse=True)
+
+        rest = analytics.no_customer(conn, "2024-01-01", "2024-01-31")
+        unassigned, = conn.execute("SELECT SUM(total) FROM entries WHERE customer_id IS NULL"
+                                   ).fetchone()
+        assert rest.customer_id is None and rest.amount == unassigned
+        assert abs(sum(c.share for c in ranked) + rest.share - 1) < 1e-9
+
+        keys = {a.key for a in analytics.advance_ratios(conn, by="customer")}
+        assert keys == {"Asha Traders", "Bala & Sons"}
+    finally:
+        analytics.forget(conn)
+        conn.close()
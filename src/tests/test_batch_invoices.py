@@ -0,0 +1,34 @@
+"""Month-end batches: a re-run does not invoice the same entries again."""
+from billing import db
+from billing.batch_invoices import batch_folder, issue_batch, plan_invoices
+from billing.entries import CALC_MODES, insert_entries, make_entry
+
+
+def test_rerun_skips_invoiced_entries(tmp_path):
+    conn = db.connect(str(tmp_path / "t.db"))
+    try:
+        with conn:
+            conn.execute("INSERT INTO customers (name, mobile) VALUES ('Asha Traders', '1')")
+
+        def add(day):
+            insert_entries(conn, [make_entry(day, 1, "MH01AB1234", "Kurla", "Bran", "100", "20",
+                                             "0", 0, CALC_MODES[1])])
+
+        add("2025-03-01")
+        add("2025-03-02")
+        first, = issue_batch(conn, "2025-03-01", "2025-03-31", folder=str(tmp_path / "b1"))
+        assert len(first.entry_ids) == 2
+        assert plan_invoices(conn, "2025-03-01", "2025-03-31") == []
+
+        add("2025-03-20")
+        second, = issue_batch(conn, "2025-03-01", "2025-03-31", folder=str(tmp_path / "b2"))
+        assert len(second.entry_ids) == 1 and second.number != first.number
+    finally:
+        conn.close()
+
+
+def test_batch_folder_is_never_reused(tmp_path):
+    first = batch_folder("2025-03-01", "2025-03-31", root=str(tmp_path))
+    (tmp_path / "batch_2025-03-01_2025-03-31").mkdir()
+    second = batch_folder("2025-03-01", "2025-03-31", root=str(tmp_path))
+    assert first != second and second.endswith("_2")
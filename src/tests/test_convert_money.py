@@ -0,0 +1,29 @@
+"""Offline conversion of a REAL-money database to paise / grams."""
+import sqlite3
+
+from billing import db
+from billing.convert_money import convert
+
+
+def test_entries_without_a_date_pass_the_check(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    db.migrate(conn, target=1)   # the original schema, REAL columns
+    with conn:
+        conn.executemany(
+            "INSERT INTO entries (date, qty, rate, labour, advance, pre, total) "
+            "VALUES (?, 100.5, 20.1, 0, 0, 2020.05, 2020.05)",
+            [("2024-01-05",), ("2024-02-07",), (None,)],
+        )
+    conn.close()
+
+    result = convert(path)
+    assert result.converted and not result.failed
+    assert [m.month for m in result.months] == ["", "2024-01", "2024-02"]
+
+    conn = sqlite3.connect(path)
+    try:
+        assert db.schema_version(conn) == db.SCHEMA_VERSION
+        assert conn.execute("SELECT COUNT(*) FROM entries WHERE date = ''").fetchone() == (1,)
+    finally:
+        conn.close()
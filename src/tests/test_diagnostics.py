@@ -0,0 +1,24 @@
+"""SQL timings count the statement's work, not the caller's."""
+import sqlite3
+import time
+
+from billing import diagnostics
+
+
+def test_time_between_fetches_is_not_sql_time():
+    diagnostics.enable()
+    diagnostics.reset()
+    conn = sqlite3.connect(":memory:", factory=diagnostics.TimedConnection)
+    try:
+        cur = conn.execute("WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n "
+                           "WHERE i < 300) SELECT i FROM n")
+        while cur.fetchmany(100):
+            time.sleep(0.1)   # the caller writing a batch somewhere
+        (kind, name, count, *_, max_ms, rows), = [
+            s for s in diagnostics.stats() if "RECURSIVE" in s[1]]
+        assert (kind, count, rows) == ("sql", 1, 300)
+        assert max_ms < 100
+    finally:
+        conn.close()
+        diagnostics.reset()
+        diagnostics.enable(False)
@@ -0,0 +1,31 @@
+"""Keyset paging over the whole ledger."""
+from billing import db
+from billing.entries import CALC_MODES, insert_entries, ledger_page, make_entry
+
+
+def test_pages_reach_entries_without_a_date(tmp_path):
+    conn = db.connect(str(tmp_path / "t.db"))
+    try:
+        insert_entries(conn, [make_entry(None if i % 5 == 0 else f"2024-02-{1 + i % 28:02d}",
+                                         None, "MH01AB1234", "Kurla", "Bran", "100", "20",
+                                         "0", 0, CALC_MODES[1]) for i in range(50)])
+        with conn:
+            conn.execute("UPDATE entries SET date = NULL WHERE id = 2")
+        assert conn.execute("SELECT COUNT(*) FROM entries WHERE date IS NULL").fetchone() == (0,)
+
+        seen, key, more = [], None, True
+        while more:
+            rows, more = ledger_page(conn, key=key, limit=7)
+            seen += [r[0] for r in rows]
+            key = (rows[-1][1], rows[-1][0])
+        assert sorted(seen) == list(range(1, 51)) and len(seen) == 50
+
+        back, more = [], True
+        key = (rows[-1][1], rows[-1][0])
+        while more:
+            rows, more = ledger_page(conn, key=key, older=False, limit=7)
+            back = [r[0] for r in rows] + back
+            key = (rows[0][1], rows[0][0])
+        assert back + [seen[-1]] == seen
+    finally:
+        conn.close()
@@ -0,0 +1,50 @@
+"""Bulk import: a chunk that fails takes its new customers with it."""
+import sqlite3
+
+import pytest
+
+from billing import db
+from billing.customers import CustomerCache
+from billing.importer import import_file
+
+
+def test_rolled_back_customers_leave_the_cache(tmp_path):
+    conn = db.connect(str(tmp_path / "t.db"))
+    try:
+        cache = CustomerCache(conn)
+        kept = cache.resolve("Asha Traders", "9000000001")
+        conn.commit()
+        cache.commit()
+        lost = cache.resolve("Bala & Sons", "9000000002")
+        conn.rollback()
+        cache.rollback()
+
+        assert cache.get(lost) is None and cache.search("bala") == []
+        assert cache.created == 1
+        again = cache.resolve("Bala & Sons", "9000000002")
+        conn.commit()
+        assert conn.execute("SELECT name FROM customers WHERE id = ?", (again,)).fetchone() \
+            == ("Bala & Sons",)
+        assert cache.get(kept)[1] == "Asha Traders"
+    finally:
+        conn.close()
+
+
+def test_failed_chunk_leaves_no_dangling_customer(tmp_path):
+    path = tmp_path / "slips.csv"
+    path.write_text("date,customer,mobile,qty,rate,note\n"
+                    "2024-03-01,Asha Traders,9000000001,100,20,\n"
+                    "2024-03-02,Asha Traders,9000000001,100,20,\n"
+                    "2024-03-03,Bala & Sons,9000000002,100,20,\n"
+                    "2024-03-04,Bala & Sons,9000000002,100,20,boom\n", encoding="utf-8")
+    conn = db.connect(str(tmp_path / "t.db"))
+    try:
+        conn.execute("CREATE TEMP TRIGGER boom BEFORE INSERT ON entries WHEN NEW.note = 'boom' "
+                     "BEGIN SELECT RAISE(ABORT, 'boom'); END")
+        with pytest.raises(sqlite3.IntegrityError):
+            import_file(conn, str(path), chunk_size=2)
+        assert conn.execute("SELECT name FROM customers").fetchall() == [("Asha Traders",)]
+        assert conn.execute("SELECT COUNT(*) FROM entries e LEFT JOIN customers c "
+                            "ON c.id = e.customer_id WHERE c.id IS NULL").fetchone() == (0,)
+    finally:
+        conn.close()
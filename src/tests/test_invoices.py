@@ -0,0 +1,50 @@
+"""Invoice numbers from the register."""
+import sqlite3
+
+from billing import db
+from billing.invoices import Invoice, issue_invoices, parse_number
+
+
+def _issue(conn, n, entry_ids=()):
+    invoices = [Invoice(customer_name="Asha Traders", entry_ids=list(entry_ids)) for _ in range(n)]
+    return [parse_number(inv.number) for inv in issue_invoices(conn, invoices, "invoices")]
+
+
+def test_deleted_newest_number_is_not_reissued(tmp_path):
+    conn = db.connect(str(tmp_path / "t.db"))
+    try:
+        assert _issue(conn, 3) == [1, 2, 3]
+        with conn:
+            conn.execute("DELETE FROM invoices WHERE id = 3")
+        assert _issue(conn, 1) == [4]
+    finally:
+        conn.close()
+
+
+def test_migration_continues_after_the_highest_number(tmp_path):
+    path = str(tmp_path / "t.db")
+    db.connect(path).close()
+
+    # put back a v8 register: plain INTEGER PRIMARY KEY, newest invoice deleted
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("PRAGMA user_version = 8")
+        conn.execute("DROP TABLE invoices")
+        conn.execute("CREATE TABLE invoices (id INTEGER PRIMARY KEY, customer_id INTEGER, "
+                     "customer_name TEXT NOT NULL DEFAULT '', customer_mobile TEXT NOT NULL "
+                     "DEFAULT '', customer_address TEXT NOT NULL DEFAULT '', date TEXT NOT NULL "
+                     "DEFAULT '', vehicle TEXT NOT NULL DEFAULT '', branch TEXT NOT NULL "
+                     "DEFAULT '', type TEXT NOT NULL DEFAULT '', total INTEGER NOT NULL DEFAULT 0, "
+                     "folder TEXT NOT NULL, issued TEXT NOT NULL DEFAULT (datetime('now', "
+                     "'localtime')))")
+        conn.executemany("INSERT INTO invoices (id, folder) VALUES (?, 'invoices')",
+                         [(1,), (2,), (3,)])
+        conn.executemany("INSERT INTO invoice_entries VALUES (?, ?)", [(2, 10), (5, 11)])
+    conn.close()
+
+    conn = db.connect(path)   # migrates it again
+    try:
+        assert conn.execute("SELECT id FROM invoices ORDER BY id").fetchall() == [(1,), (2,), (3,)]
+        assert _issue(conn, 1) == [6]
+    finally:
+        conn.close()
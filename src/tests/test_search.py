@@ -0,0 +1,19 @@
+"""Short search terms matched with LIKE take % and _ literally."""
+from billing import db, search
+from billing.entries import CALC_MODES, insert_entries, ledger_page, make_entry
+
+
+def test_wildcards_in_short_terms_are_literal(tmp_path):
+    conn = db.connect(str(tmp_path / "t.db"))
+    try:
+        insert_entries(conn, [
+            make_entry("2025-01-01", None, "MH01AB1234", "Kurla", "Bran", "100", "20", "0", 0,
+                       CALC_MODES[1], note)
+            for note in ("5% wet", "50 wet", "a_b", "axb")
+        ])
+        for term, notes in (("5%", ["5% wet"]), ("a_", ["a_b"]), ("x", ["axb"])):
+            where, params = search.entry_filter(conn, term, column="note")
+            rows, _ = ledger_page(conn, where, params)
+            assert [r[12] for r in rows] == notes, term
+    finally:
+        conn.close()
@@ -0,0 +1,81 @@
+"""RowView.sync against a stand-in Treeview that counts widget calls."""
+import random
+
+from billing.viewmodel import RowView, _increasing_run
+
+
+class FakeTree:
+    """The Treeview calls RowView makes, with ttk's index semantics."""
+
+    def __init__(self):
+        self.children = []
+        self.values = {}
+        self.calls = {"insert": 0, "delete": 0, "item": 0, "move": 0}
+
+    def get_children(self):
+        return tuple(self.children)
+
+    def insert(self, parent, index, iid, values):
+        self.calls["insert"] += 1
+        self.children.insert(index, iid)
+        self.values[iid] = values
+
+    def delete(self, *iids):
+        self.calls["delete"] += 1
+        self.children = [i for i in self.children if i not in iids]
+
+    def item(self, iid, values):
+        self.calls["item"] += 1
+        self.values[iid] = values
+
+    def move(self, iid, parent, index):
+        # ttk counts `index` among the other children
+        self.calls["move"] += 1
+        self.children.remove(iid)
+        self.children.insert(index, iid)
+
+
+def _rows(ids):
+    return [(i, f"row {i}") for i in ids]
+
+
+def _view(ids):
+    tree = FakeTree()
+    view = RowView(tree)
+    view.sync(_rows(ids))
+    tree.calls = dict.fromkeys(tree.calls, 0)
+    return tree, view
+
+
+def test_swap_first_and_last_is_two_moves():
+    tree, view = _view(range(1000))
+    ids = list(range(1000))
+    ids[0], ids[-1] = ids[-1], ids[0]
+    view.sync(_rows(ids))
+    assert tree.calls == {"insert": 0, "delete": 0, "item": 0, "move": 2}
+    assert tree.children == [str(i) for i in ids]
+
+
+def test_one_row_moved_up_is_one_move():
+    tree, view = _view(range(200))
+    ids = list(range(200))
+    ids.insert(10, ids.pop(150))
+    view.sync(_rows(ids))
+    assert tree.calls["move"] == 1
+    assert tree.children == [str(i) for i in ids]
+
+
+def test_shuffles_with_adds_and_deletes_end_in_order():
+    rnd = random.Random(3)
+    for _ in range(200):
+        before = rnd.sample(range(60), rnd.randint(0, 40))
+        tree, view = _view(before)
+        ids = rnd.sample(range(60), rnd.randint(0, 40))
+        rows = [(i, f"row {i}" if rnd.random() < 0.8 else "changed") for i in ids]
+        view.sync(rows)
+        assert tree.children == [str(i) for i in ids] == view.order
+        assert all(tree.values[str(i)] == (v,) for i, v in rows)
+        position = {i: n for n, i in enumerate(ids)}
+        survivors = [position[i] for i in before if i in position]
+        assert tree.calls["move"] == len(survivors) - len(_increasing_run(survivors))
+